@@ -6,6 +6,7 @@ class PLAN_CMDS(object):  # noqa: N801
 class TENSOR_SERIALIZATION(object):  # noqa: N801
     TORCH = "torch"
     NUMPY = "numpy"
+    RAW = "raw"
     TF = "tf"
     ALL = "all"
 
@@ -21,3 +21,7 @@ tfe_available = tfe_spec is not None
 
 torch_spec = util.find_spec("torch")
 torch_available = torch_spec is not None
+
+
+zstd_spec = util.find_spec("zstandard")
+zstd_available = zstd_spec is not None
@@ -0,0 +1,277 @@
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import torch
+
+from syft.execution.placeholder import PlaceHolder
+from syft.execution.role import Role
+from syft.generic.frameworks.types import FrameworkTensor
+
+# Operations applied elementwise, with broadcasting: a leading batch dimension of their
+# operands is kept in their results
+ELEMENTWISE_OPERATIONS = {
+    "__abs__",
+    "__add__",
+    "__eq__",
+    "__ge__",
+    "__gt__",
+    "__le__",
+    "__lt__",
+    "__mod__",
+    "__mul__",
+    "__ne__",
+    "__neg__",
+    "__pow__",
+    "__radd__",
+    "__rmul__",
+    "__rpow__",
+    "__rsub__",
+    "__rtruediv__",
+    "__sub__",
+    "__truediv__",
+    "abs",
+    "add",
+    "bool",
+    "ceil",
+    "clamp",
+    "clone",
+    "contiguous",
+    "cos",
+    "detach",
+    "div",
+    "double",
+    "elu",
+    "eq",
+    "erf",
+    "exp",
+    "float",
+    "floor",
+    "fmod",
+    "ge",
+    "gt",
+    "half",
+    "hardtanh",
+    "int",
+    "le",
+    "leaky_relu",
+    "log",
+    "log1p",
+    "long",
+    "lt",
+    "mul",
+    "ne",
+    "neg",
+    "pow",
+    "reciprocal",
+    "relu",
+    "relu6",
+    "remainder",
+    "round",
+    "rsqrt",
+    "sigmoid",
+    "sign",
+    "sin",
+    "softplus",
+    "sqrt",
+    "square",
+    "sub",
+    "tanh",
+    "true_divide",
+    "where",
+}
+
+# Operations applied on the last dimensions of their first operand, the other operands
+# being matrices or vectors
+LAST_DIMS_OPERATIONS = {"__matmul__", "linear", "matmul"}
+
+
+class Batch:
+    """Values of a placeholder for each call of a batch, stacked along a new leading dimension
+    when they are tensors of the same shape.
+    """
+
+    def __init__(self, items: List = None, stacked: torch.Tensor = None):
+        self._items = items
+        self._stacked = stacked
+        self._stackable = True
+
+    def items(self) -> List:
+        if self._items is None:
+            self._items = list(self._stacked.unbind(0))
+        return self._items
+
+    def stacked(self) -> torch.Tensor:
+        """Returns the stacked values, or None if they can't be stacked."""
+        if self._stacked is None and self._stackable:
+            self._stackable = all(
+                isinstance(item, torch.Tensor) and not item.has_child() for item in self._items
+            )
+            if self._stackable:
+                try:
+                    self._stacked = torch.stack(self._items)
+                except RuntimeError:
+                    self._stackable = False
+        return self._stacked
+
+
+def execute_batch(role: Role, args_list: List[tuple]) -> List[tuple]:
+    """Runs the actions of a role once for a list of calls.
+
+    The input tensors which differ between the calls are stacked along a new leading
+    dimension. The batch polymorphic actions, ie. applied elementwise or on the last
+    dimensions of their operand, run once on the stacked values while the other actions
+    run once per call.
+
+    Args:
+        role: The role to execute, whose actions should not modify their operands.
+        args_list: The arguments of each call.
+
+    Returns:
+        The outputs of each call.
+    """
+    if not role._is_compiled():
+        role.compile()
+
+    n_calls = len(args_list)
+    batches = _instantiate_inputs(role, args_list)
+
+    for action, instruction in zip(role.actions, role._program):
+        function, target, name, args_, kwargs_, return_placeholders, dead = instruction
+        operand_ids = Role._placeholder_ids((action.target, action.args, action.kwargs))
+
+        if any(id_ in batches for id_ in operand_ids):
+            results = _execute_batched(function, target, name, args_, kwargs_, batches, n_calls)
+            for placeholder, result in zip(return_placeholders, results):
+                batches[placeholder.id.value] = result
+        else:
+            if target is None:
+                response = function(*args_, **kwargs_)
+            else:
+                response = getattr(target, name)(*args_, **kwargs_)
+
+            if not isinstance(response, (tuple, list)):
+                response = (response,)
+
+            PlaceHolder.instantiate_placeholders(return_placeholders, response)
+            for placeholder in return_placeholders:
+                batches.pop(placeholder.id.value, None)
+
+        for placeholder in dead:
+            placeholder.child = None
+            batches.pop(placeholder.id.value, None)
+
+    outputs = []
+    for output_id in role.output_placeholder_ids:
+        if output_id in batches:
+            outputs.append(batches[output_id].items())
+        else:
+            outputs.append([role.placeholders[output_id].child] * n_calls)
+    return list(zip(*outputs))
+
+
+def _instantiate_inputs(role: Role, args_list: List[tuple]) -> Dict:
+    """Instantiates the input placeholders whose tensor is the same for all the calls, and
+    returns the batches of the other ones by placeholder id."""
+    call_tensors = []
+    for args_ in args_list:
+        tensors = []
+        Role.nested_object_traversal(args_, tensors.append, FrameworkTensor)
+        call_tensors.append(tensors)
+
+    batches = {}
+    for i, input_id in enumerate(role.input_placeholder_ids):
+        items = [tensors[i] for tensors in call_tensors]
+        if all(item is items[0] for item in items):
+            role.placeholders[input_id].instantiate(items[0])
+        else:
+            batches[input_id] = Batch(items)
+    return batches
+
+
+def _execute_batched(function, target, name, args_, kwargs_, batches, n_calls) -> List[Batch]:
+    """Runs an instruction with batched operands, once if it is batch polymorphic and once
+    per call otherwise."""
+    if _is_batch_polymorphic(name.split(".")[-1], target, args_, kwargs_, batches):
+
+        def stacked_value(placeholder):
+            batch = batches.get(placeholder.id.value)
+            return placeholder.child if batch is None else batch.stacked()
+
+        try:
+            response = _call(function, target, name, args_, kwargs_, stacked_value)
+        except RuntimeError:
+            # e.g. broadcasting failed, the calls are run separately below
+            response = ()
+
+        if response and all(
+            isinstance(value, torch.Tensor) and value.dim() > 0 and value.shape[0] == n_calls
+            for value in response
+        ):
+            return [Batch(stacked=value) for value in response]
+
+    responses = []
+    for i in range(n_calls):
+
+        def item_value(placeholder):
+            batch = batches.get(placeholder.id.value)
+            return placeholder.child if batch is None else batch.items()[i]
+
+        responses.append(_call(function, target, name, args_, kwargs_, item_value))
+
+    return [Batch(items=list(values)) for values in zip(*responses)]
+
+
+def _call(function, target, name, args_, kwargs_, value: Callable) -> tuple:
+    """Runs an instruction on the values given by value for each placeholder."""
+    target, args_, kwargs_ = Role.nested_object_traversal(
+        (target, args_, kwargs_), value, PlaceHolder
+    )
+    if target is None:
+        response = function(*args_, **kwargs_)
+    else:
+        response = getattr(target, name)(*args_, **kwargs_)
+
+    if not isinstance(response, (tuple, list)):
+        response = (response,)
+    return response
+
+
+def _is_batch_polymorphic(name, target, args_, kwargs_, batches) -> bool:
+    """Checks if running an operation on the stacked operands gives the stacked results."""
+    placeholders = []
+    Role.nested_object_traversal((target, args_, kwargs_), placeholders.append, PlaceHolder)
+
+    stacked = []
+    unbatched = []
+    for placeholder in placeholders:
+        batch = batches.get(placeholder.id.value)
+        if batch is None:
+            unbatched.append(placeholder.child)
+        elif batch.stacked() is None:
+            return False
+        else:
+            stacked.append(batch.stacked())
+
+    # The batch dimension must be aligned in all the broadcasted operands
+    item_dim = stacked[0].dim() - 1
+    if any(value.dim() - 1 != item_dim for value in stacked):
+        return False
+
+    if name in ELEMENTWISE_OPERATIONS:
+        max_dim = item_dim
+    elif name in LAST_DIMS_OPERATIONS:
+        # Only the first operand can be batched, eg. the input of a linear layer
+        first_operand = target if target is not None else (args_[0] if args_ else None)
+        if (
+            len(stacked) > 1
+            or item_dim < 1
+            or not isinstance(first_operand, PlaceHolder)
+            or first_operand.id.value not in batches
+        ):
+            return False
+        max_dim = 2
+    else:
+        return False
+
+    return all(not isinstance(value, torch.Tensor) or value.dim() <= max_dim for value in unbatched)
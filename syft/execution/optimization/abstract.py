@@ -0,0 +1,149 @@
+from abc import ABC
+
+from syft.execution.computation import ComputationAction
+from syft.execution.placeholder_id import PlaceholderId
+from syft.execution.role import Role
+
+# In-place operators, the other dunder methods compute new values
+INPLACE_OPERATORS = {
+    "__iadd__",
+    "__isub__",
+    "__imul__",
+    "__imatmul__",
+    "__itruediv__",
+    "__ifloordiv__",
+    "__imod__",
+    "__ipow__",
+    "__iand__",
+    "__ior__",
+    "__ixor__",
+    "__ilshift__",
+    "__irshift__",
+    "__setitem__",
+}
+
+# Methods with effects on other objects than their results
+SIDE_EFFECT_METHODS = {"backward", "register_hook", "retain_grad", "send", "get", "move", "share"}
+
+# Functions whose results are not determined by their operands
+RANDOM_PREFIXES = (
+    "rand",
+    "normal",
+    "bernoulli",
+    "multinomial",
+    "poisson",
+    "dropout",
+    "alpha_dropout",
+    "feature_alpha_dropout",
+    "rrelu",
+    "uniform",
+    "exponential",
+    "geometric",
+    "cauchy",
+    "log_normal",
+    "empty",
+)
+
+
+def is_pure(action) -> bool:
+    """Checks if an action only computes its results from its operands, so that it can be
+    removed if its results are not used, merged with an identical action or run in advance.
+    """
+    if mutates_operands(action) or not action.return_ids:
+        return False
+
+    name = action.name.split(".")[-1]
+    return name.startswith("__") or not name.startswith(RANDOM_PREFIXES)
+
+
+def mutates_operands(action) -> bool:
+    """Checks if an action may modify its operands, or have other effects on them."""
+    if not isinstance(action, ComputationAction):
+        return True
+
+    name = action.name.split(".")[-1]
+    if "out" in action.kwargs:
+        return True
+    elif name.startswith("__"):
+        return name in INPLACE_OPERATORS
+    return name.endswith("_") or name in SIDE_EFFECT_METHODS
+
+
+def mutated_ids(actions: list) -> set:
+    """Lists the values of the placeholder ids which may be modified by an action: the
+    operands of the actions modifying their operands, and the placeholders these operands
+    are computed from, as they can be views of them.
+    """
+    mutated = set()
+    for action in reversed(actions):
+        if mutates_operands(action) or not mutated.isdisjoint(placeholder_ids(action.return_ids)):
+            mutated.update(operand_ids(action))
+    return mutated
+
+
+def placeholder_ids(obj) -> list:
+    """Lists the values of the placeholder ids found in an object."""
+    return Role._placeholder_ids(obj)
+
+
+def operand_ids(action) -> list:
+    """Lists the values of the placeholder ids read by an action."""
+    return Role._placeholder_ids((action.target, action.args, action.kwargs))
+
+
+def rename_placeholder_ids(action, new_ids: dict):
+    """Returns the action with its placeholder ids replaced according to new_ids."""
+    if not new_ids:
+        return action
+
+    def rename(obj):
+        return Role.nested_object_traversal(
+            obj, lambda x: PlaceholderId(new_ids.get(x.value, x.value)), PlaceholderId
+        )
+
+    return type(action)(
+        action.name,
+        rename(action.target),
+        rename(action.args),
+        rename(action.kwargs),
+        rename(action.return_ids),
+    )
+
+
+class AbstractPlanOptimizer(ABC):
+    """
+    Optimizer class takes a Plan and rewrites the actions of its role into fewer
+    actions computing the same outputs
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    def optimize(self) -> int:
+        """Runs the optimization.
+
+        Returns:
+            The number of removed actions.
+        """
+        return 0
+
+    def replace_actions(self, actions: list) -> int:
+        """Replaces the actions of the role and drops the placeholders not used anymore.
+
+        Returns:
+            The number of removed actions.
+        """
+        role = self.plan.role
+        n_removed = len(role.actions) - len(actions)
+        role.actions = actions
+
+        used_ids = set(role.input_placeholder_ids) | set(role.output_placeholder_ids)
+        used_ids.update(ph.id.value for ph in role.state.state_placeholders)
+        for action in actions:
+            used_ids.update(operand_ids(action))
+            used_ids.update(placeholder_ids(action.return_ids))
+        role.placeholders = {
+            id_: placeholder for id_, placeholder in role.placeholders.items() if id_ in used_ids
+        }
+
+        return n_removed
@@ -0,0 +1,56 @@
+from syft.execution.optimization.abstract import AbstractPlanOptimizer
+from syft.execution.optimization.abstract import is_pure
+from syft.execution.optimization.abstract import mutated_ids
+from syft.execution.optimization.abstract import operand_ids
+from syft.execution.optimization.abstract import placeholder_ids
+from syft.generic.frameworks.types import FrameworkTensor
+
+
+def _is_constant(tensor) -> bool:
+    """Tensors requiring gradients are kept out of folding, to let autograd reach them."""
+    return isinstance(tensor, FrameworkTensor) and not getattr(tensor, "requires_grad", False)
+
+
+class PlanOptimizerConstantFolding(AbstractPlanOptimizer):
+    """Runs in advance the pure actions whose operands are all constants: literals, state
+    tensors and results of other folded actions, which are never modified in place. The
+    folded results which are still used are added to the state of the Plan.
+
+    This binds the Plan to the current values of its state: it should be run on Plans whose
+    state is not updated anymore, like Plans used for inference.
+    """
+
+    def optimize(self) -> int:
+        role = self.plan.role
+        # The tensors modified in place, or computed from one, change between executions
+        mutated = mutated_ids(role.actions)
+        constant_ids = {
+            ph.id.value
+            for ph in role.state.state_placeholders
+            if _is_constant(ph.child) and ph.id.value not in mutated
+        }
+
+        folded_ids = set()
+        actions = []
+        for action in role.actions:
+            return_ids = placeholder_ids(action.return_ids)
+            if (
+                is_pure(action)
+                and mutated.isdisjoint(return_ids)
+                and all(id_ in constant_ids for id_ in operand_ids(action))
+            ):
+                role.execute_action(action)
+                if all(_is_constant(role.placeholders[id_].child) for id_ in return_ids):
+                    constant_ids.update(return_ids)
+                    folded_ids.update(return_ids)
+                    continue
+            actions.append(action)
+
+        # Only keep the folded results read by the remaining actions or returned
+        used_ids = set(role.output_placeholder_ids)
+        for action in actions:
+            used_ids.update(operand_ids(action))
+        for id_ in sorted(folded_ids & used_ids, key=str):
+            role.state.state_placeholders.append(role.placeholders[id_])
+
+        return self.replace_actions(actions)
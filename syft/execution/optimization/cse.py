@@ -0,0 +1,70 @@
+from syft.execution.optimization.abstract import AbstractPlanOptimizer
+from syft.execution.optimization.abstract import is_pure
+from syft.execution.optimization.abstract import mutated_ids
+from syft.execution.optimization.abstract import placeholder_ids
+from syft.execution.optimization.abstract import rename_placeholder_ids
+from syft.execution.placeholder_id import PlaceholderId
+
+
+def _freeze(obj):
+    """Builds a hashable key of the operands of an action, or raises a TypeError if they
+    contain values which cannot be compared, like tensors."""
+    if isinstance(obj, PlaceholderId):
+        return ("id", obj.value)
+    elif isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, tuple(_freeze(elem) for elem in obj))
+    elif isinstance(obj, dict):
+        return ("dict", tuple((k, _freeze(v)) for k, v in sorted(obj.items())))
+    elif obj is None or isinstance(obj, (bool, int, float, str)):
+        return (type(obj).__name__, obj)
+    else:
+        raise TypeError(f"Cannot compare {type(obj)} operands")
+
+
+class PlanOptimizerCSE(AbstractPlanOptimizer):
+    """Common subexpression elimination: removes the pure actions identical to a previous
+    one, their results being replaced by the results of the previous action. Results which
+    are modified in place later are not merged, as the modification would affect both."""
+
+    def optimize(self) -> int:
+        role = self.plan.role
+        mutated = mutated_ids(role.actions)
+        new_ids = {}
+        computed = {}
+
+        actions = []
+        for action in role.actions:
+            action = rename_placeholder_ids(action, new_ids)
+            if not is_pure(action):
+                # The operands of the previous actions may have been modified
+                computed.clear()
+                actions.append(action)
+                continue
+
+            try:
+                key = (
+                    type(action).__name__,
+                    action.name,
+                    _freeze((action.target, action.args, action.kwargs)),
+                )
+            except TypeError:
+                actions.append(action)
+                continue
+
+            previous = computed.get(key)
+            return_ids = placeholder_ids(action.return_ids)
+            if (
+                previous is not None
+                and len(previous) == len(return_ids)
+                and mutated.isdisjoint(previous + return_ids)
+            ):
+                new_ids.update(zip(return_ids, previous))
+                continue
+
+            computed[key] = return_ids
+            actions.append(action)
+
+        role.output_placeholder_ids = tuple(
+            new_ids.get(id_, id_) for id_ in role.output_placeholder_ids
+        )
+        return self.replace_actions(actions)
@@ -0,0 +1,24 @@
+from syft.execution.optimization.abstract import AbstractPlanOptimizer
+from syft.execution.optimization.abstract import is_pure
+from syft.execution.optimization.abstract import operand_ids
+from syft.execution.optimization.abstract import placeholder_ids
+
+
+class PlanOptimizerDeadCode(AbstractPlanOptimizer):
+    """Removes the pure actions whose results do not reach the outputs of the Plan"""
+
+    def optimize(self) -> int:
+        role = self.plan.role
+        live_ids = set(role.output_placeholder_ids)
+
+        # Walk the actions backwards, an action being kept if one of its results is used
+        # later or if it has other effects
+        actions = []
+        for action in reversed(role.actions):
+            if is_pure(action) and live_ids.isdisjoint(placeholder_ids(action.return_ids)):
+                continue
+            live_ids.update(operand_ids(action))
+            actions.append(action)
+        actions.reverse()
+
+        return self.replace_actions(actions)
@@ -10,10 +10,16 @@ import torch
 import warnings
 
 import syft as sy
+from syft.execution.batching import execute_batch
+from syft.execution.optimization.abstract import is_pure
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.role import Role
 from syft.execution.tracing import FrameworkWrapper
 from syft.execution.type_wrapper import NestedTypeWrapper
+from syft.execution.optimization.abstract import AbstractPlanOptimizer
+from syft.execution.optimization.constant_folding import PlanOptimizerConstantFolding
+from syft.execution.optimization.cse import PlanOptimizerCSE
+from syft.execution.optimization.dead_code import PlanOptimizerDeadCode
 from syft.execution.translation.abstract import AbstractPlanTranslator
 from syft.execution.translation.default import PlanTranslatorDefault
 from syft.execution.translation.torchscript import PlanTranslatorTorchscript
@@ -106,6 +112,7 @@ class Plan(AbstractSendable):
     """
 
     _build_translators = []
+    _build_optimizers = []
     _wrapped_frameworks = {}
 
     def __init__(
@@ -141,6 +148,8 @@ class Plan(AbstractSendable):
         self.state_attributes = {}
         self.is_built = is_built
         self.torchscript = None
+        # Run the plan with its TorchScript translation, or let the owner decide if None
+        self.use_torchscript = None
         self.input_types = input_types
         self.validate_input_types = True
         self.tracing = False
@@ -212,6 +221,11 @@ class Plan(AbstractSendable):
         # Reset previous build
         self.role.reset()
 
+        # TorchScript can only replace plans on tensors without Syft tensor chains
+        self.use_torchscript = not trace_autograd and self._are_native_tensors(
+            (args, self.parameters())
+        )
+
         def build_nested_arg(arg, leaf_function):
             if isinstance(arg, list):
                 return [build_nested_arg(obj, leaf_function) for obj in arg]
@@ -282,6 +296,13 @@ class Plan(AbstractSendable):
         self.is_building = False
         self.is_built = True
 
+        # Run registered optimizations
+        if Plan._build_optimizers:
+            self.optimize(*Plan._build_optimizers)
+
+        # Lower the actions once, so that the executions skip their interpretation
+        self.role.compile()
+
         # Build registered translations
         for translator in Plan._build_translators:
             try:
@@ -357,27 +378,95 @@ class Plan(AbstractSendable):
         """
         Calls a plan execution with some arguments.
 
-        When possible, run the original function to improve efficiency. When
-        it's not, for example if you fetched the plan from a remote worker,
-        then run it from the tape of actions:
+        When the plan has a TorchScript translation and is called with native tensors, run
+        the TorchScript module, see _torchscript_enabled. Otherwise, when possible, run the
+        original function to improve efficiency. When it's not, for example if you fetched
+        the plan from a remote worker, then run it from the tape of actions:
         - Instantiate input placeholders
         - for each recorded action, run the action on the placeholders
           and use the result(s) to instantiate to appropriate placeholder.
         - Return the instantiation of all the output placeholders.
         """
+        if self.forward is None and self.validate_input_types:
+            self.input_types.input_check(self, args)
+
+        if self._torchscript_enabled(args):
+            try:
+                return self._call_torchscript(*args)
+            except (RuntimeError, TypeError):
+                # The traced module does not support these arguments, e.g. their dtype
+                warnings.warn(f"Failed to run Plan {self.name} with TorchScript")
+
         if self.forward is not None:
             if self.include_state:
                 args = (*args, self.state)
             return self.forward(*args)
         else:
-            if self.validate_input_types:
-                self.input_types.input_check(self, args)
             self.role.instantiate_inputs(args)
             result = self.role.execute()
             if len(result) == 1:
                 return result[0]
             return result
 
+    def map(self, batches: List) -> List:
+        """Calls the plan on each input of a list, running its actions once for all of them.
+
+        The inputs are stacked along a new leading dimension and each action runs once on
+        the stacked tensors when it is batch polymorphic, see execute_batch. Plans whose
+        actions modify their operands, like training plans, are called once per input.
+
+        Args:
+            batches: The inputs, each being the tuple of arguments of a call, or its only
+                argument.
+
+        Returns:
+            The list of the results of each call.
+        """
+        args_list = [args_ if isinstance(args_, tuple) else (args_,) for args_ in batches]
+        if not args_list:
+            return []
+
+        if not self.is_built or not all(is_pure(action) for action in self.role.actions):
+            return [self(*args_) for args_ in args_list]
+
+        if self.validate_input_types:
+            for args_ in args_list:
+                self.input_types.input_check(self, args_)
+
+        results = execute_batch(self.role, args_list)
+        return [result[0] if len(result) == 1 else result for result in results]
+
+    def _torchscript_enabled(self, args: Tuple) -> bool:
+        """Checks if the plan can be called on its TorchScript translation with these arguments.
+
+        Plans built with native tensors use it by default, while plans fetched or received by a
+        worker use it if the worker opted in with `torchscript_plans`.
+        """
+        if self.torchscript is None:
+            return False
+
+        use_torchscript = self.use_torchscript
+        if use_torchscript is None:
+            use_torchscript = getattr(self.owner, "torchscript_plans", False)
+
+        return use_torchscript and self._are_native_tensors((args, self.parameters()))
+
+    def _call_torchscript(self, *args):
+        # The state is given as last argument, see PlanTranslatorTorchscript
+        params = self.parameters()
+        if len(params) > 0:
+            return self.torchscript(*args, params)
+        return self.torchscript(*args)
+
+    @staticmethod
+    def _are_native_tensors(obj) -> bool:
+        """Checks if all the leaves of a nested structure are torch tensors without child."""
+        if isinstance(obj, (list, tuple)):
+            return all(Plan._are_native_tensors(elem) for elem in obj)
+        elif isinstance(obj, dict):
+            return all(Plan._are_native_tensors(elem) for elem in obj.values())
+        return isinstance(obj, torch.Tensor) and not obj.has_child()
+
     def run(self, args_: Tuple, result_ids: List[Union[str, int]]):
         """Controls local or remote plan execution.
         If the plan doesn't have the plan built, first build it using the original function.
@@ -472,6 +561,33 @@ class Plan(AbstractSendable):
     def register_build_translator(translator: "AbstractPlanTranslator"):
         Plan._build_translators.append(translator)
 
+    @staticmethod
+    def register_build_optimizer(optimizer: "AbstractPlanOptimizer"):
+        Plan._build_optimizers.append(optimizer)
+
+    def optimize(self, *optimizers: "AbstractPlanOptimizer") -> Dict[str, int]:
+        """Rewrites the actions of the plan into fewer actions computing the same outputs.
+
+        Args:
+            optimizers: The optimizers to run in order, by default constant folding, common
+                subexpression elimination and dead code elimination.
+
+        Returns:
+            The number of actions removed by each optimizer, by name.
+        """
+        if not self.is_built:
+            raise RuntimeError("Plan needs to be built before being optimized.")
+
+        if not optimizers:
+            optimizers = (
+                PlanOptimizerConstantFolding,
+                PlanOptimizerCSE,
+                PlanOptimizerDeadCode,
+            )
+
+        # The role program is compiled again at its next execution
+        return {optimizer.__name__: optimizer(self).optimize() for optimizer in optimizers}
+
     @staticmethod
     def register_framework(f_name, f_package):
         """
@@ -49,6 +49,10 @@ class Role(SyftSerializable):
         self.state = state or State()
         self.tracing = False
 
+        # Program compiled from the actions, see compile()
+        self._program = None
+        self._program_source = None
+
         for name, package in framework_packages.items():
             tracing_wrapper = FrameworkWrapper(package=package, role=self)
             setattr(self, name, tracing_wrapper)
@@ -163,8 +167,23 @@ class Role(SyftSerializable):
     def execute(self):
         """ Make the role execute all its actions.
         """
-        for action in self.actions:
-            self._execute_action(action)
+        if not self._is_compiled():
+            self.compile()
+
+        for function, target, name, args_, kwargs_, return_placeholders, dead in self._program:
+            if target is None:
+                response = function(*args_, **kwargs_)
+            else:
+                response = getattr(target, name)(*args_, **kwargs_)
+
+            if not isinstance(response, (tuple, list)):
+                response = (response,)
+
+            PlaceHolder.instantiate_placeholders(return_placeholders, response)
+
+            # Release the intermediate tensors which are not used anymore
+            for placeholder in dead:
+                placeholder.child = None
 
         output_placeholders = tuple(
             self.placeholders[output_id] for output_id in self.output_placeholder_ids
@@ -172,6 +191,78 @@ class Role(SyftSerializable):
 
         return tuple(p.child for p in output_placeholders)
 
+    def execute_action(self, action):
+        """ Run a single action outside of the program and instantiate its return placeholders.
+        """
+        function, target, name, args_, kwargs_, return_placeholders = self._compile_action(action)
+        if target is None:
+            response = function(*args_, **kwargs_)
+        else:
+            response = getattr(target, name)(*args_, **kwargs_)
+
+        if not isinstance(response, (tuple, list)):
+            response = (response,)
+
+        PlaceHolder.instantiate_placeholders(return_placeholders, response)
+
+    def compile(self):
+        """ Lower the actions into a flat program run by execute: the placeholders are fetched
+        from their ids and the framework functions are resolved once, instead of at each
+        execution.
+
+        A liveness pass also finds the last use of each intermediate placeholder, ie. defined by
+        an action before being used and which is not an output, so that execute releases its
+        tensor right after. The inputs, the state and the other placeholders read before being
+        defined keep their tensors for the next executions.
+
+        The program is compiled again by execute if the actions or the placeholders changed.
+        """
+        kept_ids = set(self.input_placeholder_ids) | set(self.output_placeholder_ids)
+        kept_ids.update(ph.id.value for ph in self.state.state_placeholders)
+        defined_ids = set()
+        last_uses = {}
+        for i, action in enumerate(self.actions):
+            for id_ in self._placeholder_ids((action.target, action.args, action.kwargs)):
+                if id_ not in defined_ids:
+                    kept_ids.add(id_)
+                last_uses[id_] = i
+            for id_ in self._placeholder_ids(action.return_ids):
+                defined_ids.add(id_)
+                last_uses[id_] = i
+
+        dead = [[] for _ in self.actions]
+        for id_, i in last_uses.items():
+            if id_ not in kept_ids:
+                dead[i].append(self.placeholders[id_])
+
+        self._program = [
+            self._compile_action(action) + (tuple(dead_placeholders),)
+            for action, dead_placeholders in zip(self.actions, dead)
+        ]
+        self._program_source = (
+            self.actions,
+            len(self.actions),
+            self.placeholders,
+            len(self.placeholders),
+            self.input_placeholder_ids,
+            self.output_placeholder_ids,
+        )
+
+    def _is_compiled(self):
+        if self._program_source is None:
+            return False
+        actions, n_actions, placeholders, n_placeholders, input_ids, output_ids = (
+            self._program_source
+        )
+        return (
+            actions is self.actions
+            and n_actions == len(self.actions)
+            and placeholders is self.placeholders
+            and n_placeholders == len(self.placeholders)
+            and input_ids is self.input_placeholder_ids
+            and output_ids is self.output_placeholder_ids
+        )
+
     def load(self, tensor):
         """ Load tensors used in a protocol from worker's local store
         """
@@ -200,8 +291,9 @@ class Role(SyftSerializable):
 
         Role.nested_object_traversal(args_, traversal_function, FrameworkTensor)
 
-    def _execute_action(self, action):
-        """ Build placeholders and store action.
+    def _compile_action(self, action):
+        """ Build the instruction running an action: a tuple (function, target, name, args,
+        kwargs, return placeholders) where the placeholder ids are replaced by the placeholders.
         """
         cmd, _self, args_, kwargs_, return_values = (
             action.name,
@@ -221,16 +313,17 @@ class Role(SyftSerializable):
             return_values, lambda ph: return_placeholders.append(ph), PlaceHolder
         )
 
-        if _self is None:
-            method = self._fetch_package_method(cmd)
-            response = method(*args_, **kwargs_)
-        else:
-            response = getattr(_self, cmd)(*args_, **kwargs_)
+        function = self._fetch_package_method(cmd) if _self is None else None
 
-        if not isinstance(response, (tuple, list)):
-            response = (response,)
+        return function, _self, cmd, args_, kwargs_, return_placeholders
 
-        PlaceHolder.instantiate_placeholders(return_placeholders, response)
+    @staticmethod
+    def _placeholder_ids(obj):
+        """ List the values of the placeholder ids found in an object
+        """
+        ids = []
+        Role.nested_object_traversal(obj, lambda x: ids.append(x.value), PlaceholderId)
+        return ids
 
     def _fetch_package_method(self, cmd):
         cmd_path = cmd.split(".")
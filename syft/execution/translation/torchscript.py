@@ -22,6 +22,8 @@ class PlanTranslatorTorchscript(AbstractPlanTranslator):
         # TODO see if type check can be made less strict,
         #  e.g. tensor/custom tensor/nn.Parameter could be considered same type
         translation_plan.validate_input_types = False
+        # The plan is traced from its actions, not from a previous translation
+        translation_plan.use_torchscript = False
 
         # To avoid storing Plan state tensors in torchscript, they will be sent as parameters
         # we trace wrapper func, which accepts state parameters as last arg
@@ -1,12 +1,37 @@
-class CipherText:
+import numpy as np
+
+import syft as sy
+from syft.serde.syft_serializable import SyftSerializable
+
+
+class CipherText(SyftSerializable):
     """A wrapper class for representing ciphertext.
 
     Typical format of ciphertext data would be [c0, c1, c2...] where ci represents
     list of polynomials.
 
     Attributes:
-        data: A 3-dim list representing ciphertext values.
+        data: A 3-dim array of shape (size, coeff_mod_size, coeff_count) representing
+            ciphertext values.
     """
 
     def __init__(self, data):
         self.data = data
+
+    @staticmethod
+    def simplify(worker, ciphertext: "CipherText") -> tuple:
+        data = ciphertext.data
+        # Arrays of Python integers, used for moduli above 62 bits, have no compact buffer
+        data = data.tolist() if data.dtype == object else data
+        return (sy.serde.msgpack.serde._simplify(worker, data),)
+
+    @staticmethod
+    def detail(worker, ciphertext_tuple: tuple) -> "CipherText":
+        (data,) = ciphertext_tuple
+        data = sy.serde.msgpack.serde._detail(worker, data)
+        data = np.array(data, dtype=object) if isinstance(data, list) else data
+        return CipherText(data)
+
+    @staticmethod
+    def get_msgpack_code():
+        return {"code": 1002}
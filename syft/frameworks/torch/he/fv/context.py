@@ -1,3 +1,4 @@
+from syft.frameworks.torch.he.fv.util.ntt import create_ntt_tables
 from syft.frameworks.torch.he.fv.util.rns_tool import RNSTool
 
 
@@ -10,6 +11,8 @@ class Context:
         coeff_div_plain_modulus: A list of float values equal to (q[i]/t),
             In research papers denoted by delta.
         rns_tool: A RNSTool class instance.
+        ntt_tables: A list of NTTTables, one for each coefficient modulus, used to multiply
+            polynomials in O(n log n), or None if a coefficient modulus does not support the NTT.
     """
 
     def __init__(self, encryption_param):
@@ -21,3 +24,7 @@ class Context:
         ]
 
         self.rns_tool = RNSTool(encryption_param)
+
+        self.ntt_tables = create_ntt_tables(
+            encryption_param.poly_modulus, encryption_param.coeff_modulus
+        )
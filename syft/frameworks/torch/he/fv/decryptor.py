@@ -1,4 +1,5 @@
 import copy
+import numpy as np
 from numpy.polynomial import polynomial as poly
 
 
@@ -6,6 +7,7 @@ from syft.frameworks.torch.he.fv.plaintext import PlainText
 from syft.frameworks.torch.he.fv.util.operations import get_significant_count
 from syft.frameworks.torch.he.fv.util.operations import poly_add_mod
 from syft.frameworks.torch.he.fv.util.operations import poly_mul_mod
+from syft.frameworks.torch.he.fv.util.operations import poly_dtype
 
 
 class Decryptor:
@@ -21,6 +23,8 @@ class Decryptor:
         self._coeff_modulus = context.param.coeff_modulus
         self._coeff_count = context.param.poly_modulus
         self._secret_key = secret_key.data
+        # Powers of the secret key in NTT form, computed on demand
+        self._sk_ntt_powers = []
 
     def decrypt(self, encrypted):
         """Decrypts the encrypted ciphertext objects.
@@ -40,7 +44,8 @@ class Decryptor:
 
         # removing leading zeroes in plaintext representation.
         plain_coeff_count = get_significant_count(result)
-        return PlainText(result[:plain_coeff_count])
+        plain_modulus = self._context.param.plain_modulus
+        return PlainText(np.array(result[:plain_coeff_count], dtype=poly_dtype([plain_modulus])))
 
     def _mul_ct_sk(self, encrypted):
         """Calculate [c0 + c1 * sk + c2 * sk^2 ...]_q
@@ -52,11 +57,15 @@ class Decryptor:
             encrypted: A ciphertext object of encrypted data.
 
         Returns:
-            A 2-dim list containing result of [c0 + c1 * sk + c2 * sk^2 ...]_q.
+            A 2-dim list or uint64 array containing result of [c0 + c1 * sk + c2 * sk^2 ...]_q,
+            for the RNS tool.
         """
+        if self._context.ntt_tables is not None:
+            return self._mul_ct_sk_ntt(encrypted)
+
         phase = encrypted[0]
 
-        secret_key_array = self._get_sufficient_sk_power(len(encrypted))
+        secret_key_array = self._get_sufficient_sk_power(len(encrypted) - 1)
 
         for j in range(1, len(encrypted)):
             for i in range(len(self._coeff_modulus)):
@@ -68,7 +77,43 @@ class Decryptor:
                     self._coeff_modulus[i],
                 )
 
-        return phase
+        return phase.tolist()
+
+    def _mul_ct_sk_ntt(self, encrypted):
+        """Calculate [c0 + c1 * sk + c2 * sk^2 ...]_q in NTT form, with a single inverse
+        transform for each coefficient modulus, as a uint64 array."""
+        sk_ntt_powers = self._get_sk_ntt_powers(len(encrypted) - 1)
+        phase = [0] * len(self._coeff_modulus)
+
+        for i, tables in enumerate(self._context.ntt_tables):
+            c_ntt = tables.forward(encrypted[1:, i])
+            products = tables.multiply(c_ntt, sk_ntt_powers[:, i])
+            total = products[0]
+            for product in products[1:]:
+                total = tables.add(total, product)
+            phase[i] = tables.add(tables.inverse(total), tables.to_array(encrypted[0, i]))
+        return np.stack(phase)
+
+    def _get_sk_ntt_powers(self, max_power):
+        """Returns an array of shape (max_power, coeff_mod_size, coeff_count) with the powers
+        1...max_power of the secret key in NTT form, extending the cached powers if needed."""
+        ntt_tables = self._context.ntt_tables
+        if not self._sk_ntt_powers:
+            self._sk_ntt_powers.append(
+                np.stack(
+                    [tables.forward(self._secret_key[i]) for i, tables in enumerate(ntt_tables)]
+                )
+            )
+        while len(self._sk_ntt_powers) < max_power:
+            self._sk_ntt_powers.append(
+                np.stack(
+                    [
+                        tables.multiply(self._sk_ntt_powers[-1][i], self._sk_ntt_powers[0][i])
+                        for i, tables in enumerate(ntt_tables)
+                    ]
+                )
+            )
+        return np.stack(self._sk_ntt_powers[:max_power])
 
     def _get_sufficient_sk_power(self, max_power):
         """Generate an list of secret key polynomial raised to 1...max_power.
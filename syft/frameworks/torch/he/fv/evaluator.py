@@ -1,10 +1,9 @@
-import copy
 from enum import Enum
 
-from syft.frameworks.torch.he.fv.util.operations import poly_add_mod
-from syft.frameworks.torch.he.fv.util.operations import negate_mod
-from syft.frameworks.torch.he.fv.util.operations import poly_sub_mod
-from syft.frameworks.torch.he.fv.util.operations import poly_negate_mod
+import numpy as np
+
+from syft.frameworks.torch.he.fv.util.operations import get_decomposition_shifts
+from syft.frameworks.torch.he.fv.util.operations import moduli_column
 from syft.frameworks.torch.he.fv.util.operations import multiply_add_plain_with_delta
 from syft.frameworks.torch.he.fv.util.operations import multiply_sub_plain_with_delta
 from syft.frameworks.torch.he.fv.ciphertext import CipherText
@@ -39,6 +38,8 @@ class Evaluator:
         self.context = context
         self.coeff_modulus = context.param.coeff_modulus
         self.plain_modulus = context.param.plain_modulus
+        # Broadcasts against the ciphertext arrays of shape (size, coeff_mod_size, coeff_count)
+        self._coeff_modulus_column = moduli_column(self.coeff_modulus)
 
     def add(self, op1, op2):
         """Adds two operands using FV scheme.
@@ -106,13 +107,75 @@ class Evaluator:
         Returns:
             A Ciphertext object with value equivalent to result of -(ct_value).
         """
-        result = copy.deepcopy(ct.data)
+        return CipherText(-ct.data % self._coeff_modulus_column)
+
+    def multiply(self, op1, op2):
+        """Multiplies two operands using FV scheme.
+
+        Args:
+            op1 (Ciphertext/Plaintext): First polynomial argument (Multiplicand).
+            op2 (Ciphertext/Plaintext): Second polynomial argument (Multiplier).
+
+        Returns:
+            A Ciphertext object with value equivalent to the result of the product of two
+                operands. The product of two ciphertexts of sizes s1 and s2 has size s1 + s2 - 1,
+                and can be brought back to size 2 with relinearize.
+        """
+        param_type = _typecheck(op1, op2)
+
+        if param_type == ParamTypes.CTCT:
+            return self._mul_cipher_cipher(op1, op2)
 
-        for i in range(len(result)):
-            for j in range(len(result[i])):
-                for k in range(len(result[i][j])):
-                    result[i][j][k] = negate_mod(ct.data[i][j][k], self.coeff_modulus[j])
+        elif param_type == ParamTypes.CTPT:
+            return self._mul_cipher_plain(op1, op2)
+
+        elif param_type == ParamTypes.PTCT:
+            return self._mul_cipher_plain(op2, op1)
+
+        else:
+            raise TypeError(
+                f"Multiplication Operation not supported between {type(op1)} and {type(op2)}"
+            )
+
+    def relinearize(self, ct, relin_keys):
+        """Reduces a ciphertext of size 3 to an encryption of the same value of size 2.
+
+        Args:
+            ct (Ciphertext): Ciphertext to be relinearized, usually the product of two
+                ciphertexts of size 2.
+            relin_keys (RelinKeys): Relinearization keys generated by KeyGenerator.relin_keygen
+                for the secret key of ct.
 
+        Returns:
+            A Ciphertext object of size 2.
+        """
+        ntt_tables = self._get_ntt_tables()
+        ct = ct.data
+        if len(ct) == 2:
+            return CipherText(ct.copy())
+        if len(ct) != 3:
+            raise ValueError(f"cannot relinearize a ciphertext of size {len(ct)}")
+
+        # Decompose c2 in digits of the residues modulo each prime, which are small enough to
+        # multiply the keys without a large noise growth
+        bit_count = relin_keys.decomposition_bit_count
+        mask = np.uint64((1 << bit_count) - 1)
+        c2 = ct[2].astype(np.uint64)
+        digits = np.stack(
+            [
+                (c2[index] >> np.uint64(shift)) & mask
+                for index, shift in get_decomposition_shifts(self.coeff_modulus, bit_count)
+            ]
+        )
+
+        result = ct[:2].copy()
+        for i, tables in enumerate(ntt_tables):
+            digits_ntt = tables.forward(digits % np.uint64(self.coeff_modulus[i]))
+            products = tables.multiply(digits_ntt[:, None], relin_keys.data[:, :, i])
+            total = products[0]
+            for product in products[1:]:
+                total = tables.add(total, product)
+            result[:, i] = tables.add(tables.inverse(total), tables.to_array(ct[:2, i]))
         return CipherText(result)
 
     def _add_cipher_cipher(self, ct1, ct2):
@@ -126,12 +189,11 @@ class Evaluator:
             A Ciphertext object with value equivalent to result of addition of two provided
                 arguments.
         """
-        ct1, ct2 = copy.deepcopy(ct1.data), copy.deepcopy(ct2.data)
-        result = ct2 if len(ct2) > len(ct1) else ct1
+        ct1, ct2 = ct1.data, ct2.data
+        min_size = min(len(ct1), len(ct2))
+        result = (ct2 if len(ct2) > len(ct1) else ct1).copy()
 
-        for i in range(min(len(ct1), len(ct2))):
-            for j in range(len(self.coeff_modulus)):
-                result[i][j] = poly_add_mod(ct1[i][j], ct2[i][j], self.coeff_modulus[j])
+        result[:min_size] = (ct1[:min_size] + ct2[:min_size]) % self._coeff_modulus_column
 
         return CipherText(result)
 
@@ -146,7 +208,6 @@ class Evaluator:
             A Ciphertext object with value equivalent to result of addition of two provided
                 arguments.
         """
-        ct = copy.deepcopy(ct)
         return multiply_add_plain_with_delta(ct, pt, self.context)
 
     def _add_plain_plain(self, pt1, pt2):
@@ -160,8 +221,13 @@ class Evaluator:
             A Plaintext object with value equivalent to result of addition of two provided
                 arguments.
         """
-        pt1, pt2 = copy.deepcopy(pt1), copy.deepcopy(pt2)
-        return PlainText(poly_add_mod(pt1.data, pt2.data, self.plain_modulus))
+        pt1, pt2 = pt1.data, pt2.data
+        result = (pt2 if len(pt2) > len(pt1) else pt1).copy()
+        min_count = min(len(pt1), len(pt2))
+
+        result[:min_count] = (pt1[:min_count] + pt2[:min_count]) % self.plain_modulus
+
+        return PlainText(result)
 
     def _sub_cipher_plain(self, ct, pt):
         """Subtract a plaintext from a ciphertext.
@@ -174,7 +240,6 @@ class Evaluator:
             A Ciphertext object with value equivalent to result of addition of two provided
                 arguments.
         """
-        ct = copy.deepcopy(ct)
         return multiply_sub_plain_with_delta(ct, pt, self.context)
 
     def _sub_cipher_cipher(self, ct1, ct2):
@@ -188,16 +253,79 @@ class Evaluator:
             A Ciphertext object with value equivalent to result of subtraction of two provided
                 arguments.
         """
-        ct1, ct2 = copy.deepcopy(ct1.data), copy.deepcopy(ct2.data)
-        result = ct2 if len(ct2) > len(ct1) else ct1
-        min_size, max_size = min(len(ct1), len(ct2)), max(len(ct1), len(ct2))
+        ct1, ct2 = ct1.data, ct2.data
+        min_size = min(len(ct1), len(ct2))
+        result = ct1.copy() if len(ct1) >= len(ct2) else -ct2 % self._coeff_modulus_column
+
+        result[:min_size] = (ct1[:min_size] - ct2[:min_size]) % self._coeff_modulus_column
+
+        return CipherText(result)
+
+    def _get_ntt_tables(self):
+        ntt_tables = self.context.ntt_tables
+        if ntt_tables is None or not self.context.rns_tool.is_vectorized:
+            raise ValueError("multiplication requires coefficient moduli supporting the NTT")
+        return ntt_tables
+
+    def _mul_cipher_cipher(self, ct1, ct2):
+        """Multiplies two ciphertexts with the BEHZ full RNS variant of FV.
+
+        Args:
+            ct1 (Ciphertext): First polynomial argument (Multiplicand).
+            ct2 (Ciphertext): Second polynomial argument (Multiplier).
+
+        Returns:
+            A Ciphertext object of size len(ct1) + len(ct2) - 1 with value equivalent to result
+                of multiplication of two provided arguments.
+        """
+        rns_tool = self.context.rns_tool
+        ntt_tables = self._get_ntt_tables() + rns_tool.base_Bsk_ntt_tables
+
+        # Extend the ciphertexts from base q to base q U Bsk
+        ct1, ct2 = ct1.data.astype(np.uint64), ct2.data.astype(np.uint64)
+        ct1 = np.concatenate([ct1, rns_tool.sm_mrq(rns_tool.fastbconv_m_tilde(ct1))], axis=1)
+        ct2 = np.concatenate([ct2, rns_tool.sm_mrq(rns_tool.fastbconv_m_tilde(ct2))], axis=1)
+
+        # Tensor product of the ciphertexts in NTT form, for each prime of q U Bsk
+        size1, size2 = len(ct1), len(ct2)
+        tensor = np.empty((size1 + size2 - 1,) + ct1.shape[1:], dtype=np.uint64)
+        for i, tables in enumerate(ntt_tables):
+            products = tables.multiply(
+                tables.forward(ct1[:, i])[:, None], tables.forward(ct2[:, i])[None, :]
+            )
+            for k in range(size1 + size2 - 1):
+                total = None
+                for j in range(max(0, k - size2 + 1), min(k, size1 - 1) + 1):
+                    product = products[j, k - j]
+                    total = product if total is None else tables.add(total, product)
+                tensor[k, i] = tables.inverse(total)
 
-        for i in range(min_size):
-            for j in range(len(self.coeff_modulus)):
-                result[i][j] = poly_sub_mod(ct1[i][j], ct2[i][j], self.coeff_modulus[j])
+        result = rns_tool.multiply_scale_and_floor(tensor)
+        return CipherText(result.astype(self._coeff_modulus_column.dtype))
 
-        for i in range(min_size + 1, max_size):
-            for j in range(len(self.coeff_modulus)):
-                result[i][j] = poly_negate_mod(result[i][j], self.coeff_modulus[j])
+    def _mul_cipher_plain(self, ct, pt):
+        """Multiplies a ciphertext by a plaintext.
 
+        Args:
+            ct (Ciphertext): First polynomial argument (Multiplicand).
+            pt (Plaintext): Second polynomial argument (Multiplier).
+
+        Returns:
+            A Ciphertext object with value equivalent to result of multiplication of two provided
+                arguments.
+        """
+        ntt_tables = self._get_ntt_tables()
+        ct = ct.data
+        coeff_count = self.context.param.poly_modulus
+
+        # Coefficients from (t + 1) / 2 on represent negative values, lifted modulo each q_i
+        plain = np.zeros(coeff_count, dtype=np.uint64)
+        plain[: len(pt.data)] = pt.data
+        is_negative = plain >= np.uint64((self.plain_modulus + 1) // 2)
+
+        result = np.empty_like(ct)
+        for i, tables in enumerate(ntt_tables):
+            lift = np.uint64(self.coeff_modulus[i] - self.plain_modulus)
+            plain_ntt = tables.forward(np.where(is_negative, plain + lift, plain))
+            result[:, i] = tables.inverse(tables.multiply(tables.forward(ct[:, i]), plain_ntt))
         return CipherText(result)
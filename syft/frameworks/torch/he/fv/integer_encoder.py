@@ -1,5 +1,8 @@
+import numpy as np
+
 from syft.frameworks.torch.he.fv.plaintext import PlainText
 from syft.frameworks.torch.he.fv.util.operations import get_significant_count
+from syft.frameworks.torch.he.fv.util.operations import poly_dtype
 
 
 class IntegerEncoder:
@@ -63,7 +66,7 @@ class IntegerEncoder:
                 value >>= 1
                 coeff_index += 1
 
-        return PlainText(plaintext)
+        return PlainText(np.array(plaintext, dtype=poly_dtype([self.plain_modulus])))
 
     def decode(self, plain):
         """Decodes a plaintext polynomial and returns the integer.
@@ -78,10 +81,11 @@ class IntegerEncoder:
         """
 
         result = 0
-        bit_index = get_significant_count(plain.data)
+        data = plain.data.tolist()
+        bit_index = get_significant_count(data)
         while bit_index > 0:
             bit_index -= 1
-            coeff = plain.data[bit_index]
+            coeff = data[bit_index]
 
             # Left shift result.
             next_result = result << 1
@@ -1,12 +1,17 @@
+import numpy as np
+
 from syft.frameworks.torch.he.fv.context import Context
+from syft.frameworks.torch.he.fv.util.ntt import MAX_NTT_MODULUS_BITS
+from syft.frameworks.torch.he.fv.util.operations import get_decomposition_shifts
 from syft.frameworks.torch.he.fv.util.rlwe import sample_poly_ternary
 from syft.frameworks.torch.he.fv.util.rlwe import encrypt_symmetric
 from syft.frameworks.torch.he.fv.secret_key import SecretKey
 from syft.frameworks.torch.he.fv.public_key import PublicKey
+from syft.frameworks.torch.he.fv.relin_keys import RelinKeys
 
 
 class KeyGenerator:
-    """It is used for generating matching secret key and public key.
+    """It is used for generating matching secret key, public key and relinearization keys.
     Constructing a KeyGenerator requires only a Context class instance with valid
     encryption parameters.
 
@@ -20,6 +25,7 @@ class KeyGenerator:
 
         self._public_key = None
         self._secret_key = None
+        self._relin_keys = None
         self._context = context
 
     def keygen(self):
@@ -44,3 +50,58 @@ class KeyGenerator:
 
         public_key = encrypt_symmetric(self._context, self._secret_key.data)
         self._public_key = PublicKey(public_key.data)
+
+    def relin_keygen(self, decomposition_bit_count=None):
+        """Generate the relinearization keys of the secret key generated by keygen.
+
+        Without a special prime in the coefficient modulus, the keys are built for a
+        decomposition of the ciphertexts in their residues modulo each prime, the residues being
+        further split into digits of decomposition_bit_count bits: smaller digits add less noise
+        but more keys.
+
+        Args:
+            decomposition_bit_count: (optional) The bit count of the digits, by default the bit
+                count of the largest coefficient modulus (one digit per prime).
+
+        Returns:
+            A RelinKeys object.
+
+        Raises:
+            RuntimeError: if the secret key has not been generated.
+            ValueError: if the coefficient moduli do not support the NTT or the bit count is
+                invalid.
+        """
+        if self._secret_key is None:
+            raise RuntimeError("cannot generate relinearization keys for unspecified secret key")
+
+        ntt_tables = self._context.ntt_tables
+        if ntt_tables is None:
+            raise ValueError("relinearization requires coefficient moduli supporting the NTT")
+
+        coeff_modulus = self._context.param.coeff_modulus
+        if decomposition_bit_count is None:
+            decomposition_bit_count = max(modulus.bit_length() for modulus in coeff_modulus)
+        if not 0 < decomposition_bit_count <= MAX_NTT_MODULUS_BITS:
+            raise ValueError(f"invalid decomposition bit count {decomposition_bit_count}")
+
+        secret_key = self._secret_key.data
+        sk_squared = [
+            tables.multiply(tables.forward(secret_key[i]), tables.forward(secret_key[i]))
+            for i, tables in enumerate(ntt_tables)
+        ]
+
+        keys = []
+        for index, shift in get_decomposition_shifts(coeff_modulus, decomposition_bit_count):
+            key = encrypt_symmetric(self._context, secret_key).data
+            key = np.stack(
+                [tables.forward(key[:, i]) for i, tables in enumerate(ntt_tables)], axis=1
+            )
+
+            # Add 2^shift * sk^2 in the residues of the prime of the digit only
+            tables = ntt_tables[index]
+            factor = np.uint64((1 << shift) % coeff_modulus[index])
+            key[0, index] = tables.add(key[0, index], tables.multiply(sk_squared[index], factor))
+            keys.append(key)
+
+        self._relin_keys = RelinKeys(np.stack(keys), decomposition_bit_count)
+        return self._relin_keys
@@ -1,12 +1,36 @@
-class PlainText:
+import numpy as np
+
+import syft as sy
+from syft.serde.syft_serializable import SyftSerializable
+
+
+class PlainText(SyftSerializable):
     """A wrapper class for representing plaintext.
 
     Typical format of plaintext data would be [x0, x1, x2...] where xi represents
     coefficients of the polynomial.
 
     Attributes:
-        data: A 1-dim list representing plaintext coefficient values.
+        data: A 1-dim array representing plaintext coefficient values.
     """
 
     def __init__(self, data):
         self.data = data
+
+    @staticmethod
+    def simplify(worker, plaintext: "PlainText") -> tuple:
+        data = plaintext.data
+        # Arrays of Python integers, used for moduli above 62 bits, have no compact buffer
+        data = data.tolist() if data.dtype == object else data
+        return (sy.serde.msgpack.serde._simplify(worker, data),)
+
+    @staticmethod
+    def detail(worker, plaintext_tuple: tuple) -> "PlainText":
+        (data,) = plaintext_tuple
+        data = sy.serde.msgpack.serde._detail(worker, data)
+        data = np.array(data, dtype=object) if isinstance(data, list) else data
+        return PlainText(data)
+
+    @staticmethod
+    def get_msgpack_code():
+        return {"code": 1001}
@@ -5,7 +5,8 @@ class PublicKey:
     a list of polynomials.
 
     Attributes:
-        data: A 3-dim list representing public key values.
+        data: A 3-dim array of shape (2, coeff_mod_size, coeff_count) representing public key
+            values.
     """
 
     def __init__(self, data):
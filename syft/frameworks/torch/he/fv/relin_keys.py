@@ -0,0 +1,16 @@
+class RelinKeys:
+    """A wrapper class for representing relinearization keys.
+
+    The key of each digit of the decomposition listed by get_decomposition_shifts is an
+    encryption of zero to which 2^shift * sk^2 is added in the residues modulo the prime of
+    the digit, so that a ciphertext of size 3 can be brought back to size 2.
+
+    Attributes:
+        data: A 4-dim uint64 array of shape (digit_count, 2, coeff_mod_size, coeff_count)
+            representing the keys in NTT form.
+        decomposition_bit_count: The bit count of the digits of the decomposition.
+    """
+
+    def __init__(self, data, decomposition_bit_count):
+        self.data = data
+        self.decomposition_bit_count = decomposition_bit_count
@@ -8,7 +8,8 @@ class SecretKey:
     modulus.
 
     Attributes:
-        data: A 2-dim list representing secret key values.
+        data: A 2-dim array of shape (coeff_mod_size, coeff_count) representing secret key
+            values.
     """
 
     def __init__(self, data):
@@ -1,4 +1,9 @@
+import numpy as np
+
+from syft.frameworks.torch.he.fv.util.operations import array_add_mod
+from syft.frameworks.torch.he.fv.util.operations import array_multiply_shoup_mod
 from syft.frameworks.torch.he.fv.util.operations import multiply_mod
+from syft.frameworks.torch.he.fv.util.operations import shoup_operands
 
 
 class BaseConvertor:
@@ -25,6 +30,10 @@ class BaseConvertor:
                     self._ibase.punctured_prod_list[j] % self._obase.base[i]
                 )
 
+        # uint64 constants of fast_convert_array, computed on first use as they require all
+        # the base values to be below 2^63
+        self._array_constants = None
+
     def fast_convert_list(self, input, count):
         """Converts the plain/base of input list from input base to output base
         declared at the time of initialization of BaseConvertor class.
@@ -63,3 +72,49 @@ class BaseConvertor:
                 output[j][k] = dot_product % obase
 
         return output
+
+    def fast_convert_array(self, input):
+        """Converts an array of residues from input base to output base, as fast_convert_list
+        does, with vectorized uint64 arithmetic.
+
+        Args:
+            input: A uint64 array of shape (..., ibase_size, count) of residues in the input base.
+
+        Returns:
+            A uint64 array of shape (..., obase_size, count) of residues in the output base.
+        """
+        if self._array_constants is None:
+            self._array_constants = self._get_array_constants()
+        ibase, inv_punctured, inv_punctured_shoup, obase, matrix, matrix_shoup = (
+            self._array_constants
+        )
+
+        temp = array_multiply_shoup_mod(input, inv_punctured, inv_punctured_shoup, ibase)
+
+        # Each input residue contributes to all the output residues at once
+        output = None
+        for i in range(self._ibase.size):
+            term = array_multiply_shoup_mod(
+                temp[..., i : i + 1, :], matrix[:, i : i + 1], matrix_shoup[:, i : i + 1], obase
+            )
+            output = term if output is None else array_add_mod(output, term, obase)
+        return output
+
+    def _get_array_constants(self):
+        ibase, obase = self._ibase.base, self._obase.base
+        inv_punctured, inv_punctured_shoup = shoup_operands(
+            self._ibase.inv_punctured_prod_mod_base_list, ibase
+        )
+        matrix, matrix_shoup = shoup_operands(
+            [value for row in self._base_change_matrix for value in row],
+            [modulus for modulus in obase for _ in ibase],
+        )
+        shape = (self._obase.size, self._ibase.size)
+        return (
+            np.array(ibase, dtype=np.uint64)[:, None],
+            inv_punctured[:, None],
+            inv_punctured_shoup[:, None],
+            np.array(obase, dtype=np.uint64)[:, None],
+            matrix.reshape(shape),
+            matrix_shoup.reshape(shape),
+        )
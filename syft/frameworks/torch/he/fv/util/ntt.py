@@ -0,0 +1,184 @@
+import numpy as np
+
+from syft.frameworks.torch.he.fv.util.operations import array_add_mod
+from syft.frameworks.torch.he.fv.util.operations import array_multiply_shoup_mod
+from syft.frameworks.torch.he.fv.util.operations import array_negate_mod
+from syft.frameworks.torch.he.fv.util.operations import array_sub_mod
+from syft.frameworks.torch.he.fv.util.operations import exponentiate_mod
+from syft.frameworks.torch.he.fv.util.operations import invert_mod
+from syft.frameworks.torch.he.fv.util.operations import mulhi
+from syft.frameworks.torch.he.fv.util.operations import reverse_bit
+from syft.frameworks.torch.he.fv.util.operations import shoup_operands
+
+# The residues are handled as uint64 and the sums of two residues must not overflow.
+MAX_NTT_MODULUS_BITS = 62
+
+
+def is_ntt_friendly(coeff_count, modulus):
+    """Checks if the negacyclic NTT of length coeff_count is available modulo modulus: the
+    length must be a power of two and the modulus a prime congruent to 1 mod 2 * coeff_count."""
+    return (
+        coeff_count >= 2
+        and coeff_count & (coeff_count - 1) == 0
+        and modulus.bit_length() <= MAX_NTT_MODULUS_BITS
+        and modulus % (2 * coeff_count) == 1
+    )
+
+
+def create_ntt_tables(coeff_count, coeff_modulus):
+    """Builds the NTT tables of each coefficient modulus.
+
+    Returns:
+        A list of NTTTables, or None if one of the modulus does not support the NTT.
+    """
+    if not all(is_ntt_friendly(coeff_count, modulus) for modulus in coeff_modulus):
+        return None
+    return [NTTTables(coeff_count, modulus) for modulus in coeff_modulus]
+
+
+class NTTTables:
+    """Precomputed tables of the negacyclic number theoretic transform modulo a prime q.
+
+    The forward transform maps a polynomial of Z_q[x]/(x^n + 1) to its evaluations at the
+    odd powers of a primitive 2n-th root of unity psi (in bit-reversed order), so that the
+    product of two polynomials becomes a coefficient-wise product. Both transforms run on
+    uint64 numpy arrays of shape (..., n) and use the Shoup multiplication by the
+    precomputed twiddle factors, the other products being reduced with the Montgomery
+    reduction.
+
+    Args:
+        coeff_count: The degree n of the polynomial modulus x^n + 1.
+        modulus: A prime q congruent to 1 mod 2n.
+    """
+
+    def __init__(self, coeff_count, modulus):
+        if not is_ntt_friendly(coeff_count, modulus):
+            raise ValueError(f"{modulus} does not support a NTT of length {coeff_count}")
+
+        self.coeff_count = coeff_count
+        self.modulus = modulus
+        self._q = np.uint64(modulus)
+
+        root = self._find_root(coeff_count, modulus)
+        inv_root = invert_mod(root, modulus)
+
+        # Powers of psi and psi^-1 stored in bit-reversed order: reversing the bits of i + n
+        # and dropping its leading bit reverses the log(n) bits of i
+        root_powers = [0] * coeff_count
+        inv_root_powers = [0] * coeff_count
+        power, inv_power = 1, 1
+        for i in range(coeff_count):
+            index = reverse_bit(i + coeff_count) >> 1
+            root_powers[index] = power
+            inv_root_powers[index] = inv_power
+            power = power * root % modulus
+            inv_power = inv_power * inv_root % modulus
+        self.root = root
+        self._root_powers, self._root_powers_shoup = self._shoup_table(root_powers)
+        self._inv_root_powers, self._inv_root_powers_shoup = self._shoup_table(inv_root_powers)
+
+        inv_n = invert_mod(coeff_count, modulus)
+        self._inv_n, self._inv_n_shoup = self._shoup_table([inv_n])
+
+        # Montgomery constants with R = 2^64
+        self._q_neg_inv = np.uint64(-invert_mod(modulus, 1 << 64) % (1 << 64))
+        self._r2 = np.uint64((1 << 128) % modulus)
+
+    @staticmethod
+    def _find_root(coeff_count, modulus):
+        """Finds a primitive 2n-th root of unity psi modulo q, ie. psi^n = -1 mod q."""
+        exponent = (modulus - 1) // (2 * coeff_count)
+        for generator in range(2, modulus):
+            root = exponentiate_mod(generator, exponent, modulus)
+            if exponentiate_mod(root, coeff_count, modulus) == modulus - 1:
+                return root
+        raise ValueError(f"no primitive {2 * coeff_count}-th root of unity modulo {modulus}")
+
+    def _shoup_table(self, values):
+        """Returns the values and their Shoup precomputations floor(w * 2^64 / q)."""
+        return shoup_operands(values, [self.modulus] * len(values))
+
+    def _mul_shoup(self, a, w, w_shoup):
+        """Returns a * w mod q, where w_shoup is the Shoup precomputation of w."""
+        return array_multiply_shoup_mod(a, w, w_shoup, self._q)
+
+    def _reduce(self, lo, hi):
+        """Montgomery reduction: returns (hi * 2^64 + lo) / 2^64 mod q for a product of
+        two residues."""
+        m = lo * self._q_neg_inv
+        # lo + m * q is a multiple of 2^64, so its low half only carries when lo != 0
+        result = hi + mulhi(m, self._q) + (lo != 0).astype(np.uint64)
+        return np.where(result >= self._q, result - self._q, result)
+
+    def _mont_mul(self, a, b):
+        return self._reduce(a * b, mulhi(a, b))
+
+    def to_array(self, values):
+        """Converts a polynomial, or a list of polynomials, to a uint64 array."""
+        return np.array(values, dtype=np.uint64)
+
+    def forward(self, values):
+        """Forward negacyclic NTT, with the Cooley-Tukey butterflies.
+
+        Args:
+            values: Polynomial coefficients in [0, q), of shape (..., n).
+
+        Returns:
+            A new uint64 array with the transformed values in bit-reversed order.
+        """
+        values = self.to_array(values)
+        shape = values.shape
+        n = self.coeff_count
+        m, t = 1, n
+        while m < n:
+            t //= 2
+            values = values.reshape(shape[:-1] + (m, 2, t))
+            twiddles = self._root_powers[m : 2 * m, None]
+            twiddles_shoup = self._root_powers_shoup[m : 2 * m, None]
+            u = values[..., 0, :]
+            v = self._mul_shoup(values[..., 1, :], twiddles, twiddles_shoup)
+            values = np.stack([self.add(u, v), self.sub(u, v)], axis=-2)
+            m *= 2
+        return values.reshape(shape)
+
+    def inverse(self, values):
+        """Inverse negacyclic NTT, with the Gentleman-Sande butterflies.
+
+        Args:
+            values: Transformed values in bit-reversed order, of shape (..., n).
+
+        Returns:
+            A new uint64 array with the polynomial coefficients.
+        """
+        values = self.to_array(values)
+        shape = values.shape
+        n = self.coeff_count
+        h, t = n // 2, 1
+        while h >= 1:
+            values = values.reshape(shape[:-1] + (h, 2, t))
+            twiddles = self._inv_root_powers[h : 2 * h, None]
+            twiddles_shoup = self._inv_root_powers_shoup[h : 2 * h, None]
+            u = values[..., 0, :]
+            v = values[..., 1, :]
+            diff = self._mul_shoup(self.sub(u, v), twiddles, twiddles_shoup)
+            values = np.stack([self.add(u, v), diff], axis=-2)
+            h //= 2
+            t *= 2
+        return self._mul_shoup(values.reshape(shape), self._inv_n, self._inv_n_shoup)
+
+    def add(self, a, b):
+        return array_add_mod(a, b, self._q)
+
+    def sub(self, a, b):
+        return array_sub_mod(a, b, self._q)
+
+    def negate(self, a):
+        return array_negate_mod(a, self._q)
+
+    def multiply(self, a, b):
+        """Coefficient-wise product a * b mod q of two arrays of residues."""
+        return self._mont_mul(self._mont_mul(a, b), self._r2)
+
+    def poly_mul(self, op1, op2):
+        """Negacyclic product of two polynomials in coefficient form."""
+        return self.inverse(self.multiply(self.forward(op1), self.forward(op2)))
@@ -4,6 +4,68 @@ from numpy.polynomial import polynomial as poly
 from syft.frameworks.torch.he.fv.ciphertext import CipherText
 
 
+def poly_dtype(moduli):
+    """Returns the numpy dtype used to store residues modulo the given moduli: int64 when the
+    sum of two residues cannot overflow, Python integers otherwise."""
+    return np.int64 if max(moduli).bit_length() <= 62 else object
+
+
+def moduli_column(moduli):
+    """Returns the moduli as an array of shape (len(moduli), 1), which broadcasts against
+    polynomials of shape (..., len(moduli), coeff_count)."""
+    return np.array(moduli, dtype=poly_dtype(moduli))[:, None]
+
+
+_MASK_32 = np.uint64(0xFFFFFFFF)
+_SHIFT_32 = np.uint64(32)
+
+
+def mulhi(a, b):
+    """Returns the 64 high bits of the 128-bit products of the uint64 arrays a and b,
+    computed from their 32-bit limbs."""
+    a_lo, a_hi = a & _MASK_32, a >> _SHIFT_32
+    b_lo, b_hi = b & _MASK_32, b >> _SHIFT_32
+    lo_hi = a_lo * b_hi
+    hi_lo = a_hi * b_lo
+    middle = ((a_lo * b_lo) >> _SHIFT_32) + (lo_hi & _MASK_32) + (hi_lo & _MASK_32)
+    return a_hi * b_hi + (lo_hi >> _SHIFT_32) + (hi_lo >> _SHIFT_32) + (middle >> _SHIFT_32)
+
+
+def shoup_operands(operands, moduli):
+    """Returns the uint64 arrays of constant operands and of their Shoup precomputations
+    floor(operand * 2^64 / modulus), to be used with array_multiply_shoup_mod.
+
+    Args:
+        operands: A list of integers, each one smaller than its modulus.
+        moduli: A list of moduli smaller than 2^63, of the same length as operands.
+    """
+    shoup = [(operand << 64) // modulus for operand, modulus in zip(operands, moduli)]
+    return np.array(operands, dtype=np.uint64), np.array(shoup, dtype=np.uint64)
+
+
+def array_multiply_shoup_mod(values, operand, operand_shoup, modulus):
+    """Returns values * operand mod modulus for uint64 arrays, where the constant operand
+    comes with its Shoup precomputation. Any modulus smaller than 2^63 is supported."""
+    result = values * operand - mulhi(values, operand_shoup) * modulus
+    return np.where(result >= modulus, result - modulus, result)
+
+
+def array_add_mod(a, b, modulus):
+    """Returns a + b mod modulus for uint64 arrays of residues."""
+    result = a + b
+    return np.where(result >= modulus, result - modulus, result)
+
+
+def array_sub_mod(a, b, modulus):
+    """Returns a - b mod modulus for uint64 arrays of residues."""
+    return np.where(a >= b, a - b, a + (modulus - b))
+
+
+def array_negate_mod(a, modulus):
+    """Returns -a mod modulus for a uint64 array of residues."""
+    return np.where(a == 0, a, modulus - a)
+
+
 def multiply_mod(operand1, operand2, modulus):
     return (operand1 * operand2) % modulus
 
@@ -172,6 +234,20 @@ def reverse_bit(value):
     return result
 
 
+def get_decomposition_shifts(coeff_modulus, bit_count):
+    """Lists the digits of the decomposition of a polynomial in RNS form, used by the
+    relinearization: each residue modulo coeff_modulus[i] is split into digits of bit_count bits.
+
+    Returns:
+        A list of (index, shift) pairs, the digit being (residue[index] >> shift) mod 2^bit_count.
+    """
+    return [
+        (index, shift)
+        for index, modulus in enumerate(coeff_modulus)
+        for shift in range(0, modulus.bit_length(), bit_count)
+    ]
+
+
 def multiply_many_except(operands, count, expt):
     result = 1
     for i in range(count):
@@ -223,20 +299,7 @@ def multiply_add_plain_with_delta(ct, pt, context):
     Returns:
         A Ciphertext object with the encrypted result of encryption process.
     """
-    coeff_modulus = context.param.coeff_modulus
-    pt = pt.data
-    plain_coeff_count = len(pt)
-    delta = context.coeff_div_plain_modulus
-    ct0, ct1 = ct.data  # here ct = pk * u * e
-
-    # Coefficients of plain m multiplied by coeff_modulus q, divided by plain_modulus t,
-    # and rounded to the nearest integer (rounded up in case of a tie). Equivalent to
-    for i in range(plain_coeff_count):
-        for j in range(len(coeff_modulus)):
-            temp = round(delta[j] * pt[i]) % coeff_modulus[j]
-            ct0[j][i] = (ct0[j][i] + temp) % coeff_modulus[j]
-
-    return CipherText([ct0, ct1])  # ct0 = pk0 * u * e + delta * pt
+    return _add_plain_with_delta(ct, pt, context, 1)  # ct0 = pk0 * u * e + delta * pt
 
 
 def multiply_sub_plain_with_delta(ct, pt, context):
@@ -250,17 +313,21 @@ def multiply_sub_plain_with_delta(ct, pt, context):
     Returns:
         A Ciphertext object with the encrypted result of encryption process.
     """
+    return _add_plain_with_delta(ct, pt, context, -1)  # ct0 = pk0 * u * e - delta * pt
+
+
+def _add_plain_with_delta(ct, pt, context, sign):
     coeff_modulus = context.param.coeff_modulus
-    pt = pt.data
+    pt = pt.data.tolist()
     plain_coeff_count = len(pt)
     delta = context.coeff_div_plain_modulus
-    ct0, ct1 = ct.data  # here ct = pk * u * e
+    result = ct.data.copy()
 
     # Coefficients of plain m multiplied by coeff_modulus q, divided by plain_modulus t,
-    # and rounded to the nearest integer (rounded up in case of a tie). Equivalent to
-    for i in range(plain_coeff_count):
-        for j in range(len(coeff_modulus)):
-            temp = round(delta[j] * pt[i]) % coeff_modulus[j]
-            ct0[j][i] = (ct0[j][i] - temp) % coeff_modulus[j]
+    # and rounded to the nearest integer (rounded up in case of a tie).
+    for j, modulus in enumerate(coeff_modulus):
+        temp = np.array([round(delta[j] * coeff) % modulus for coeff in pt], dtype=result.dtype)
+        ct0 = result[0, j, :plain_coeff_count]
+        ct0[:] = (ct0 + sign * temp) % modulus
 
-    return CipherText([ct0, ct1])  # ct0 = pk0 * u * e - delta * pt
+    return CipherText(result)
@@ -1,15 +1,28 @@
+import numpy as np
 import torch as th
-from secrets import SystemRandom
-from secrets import randbits
+from secrets import randbelow
+from secrets import token_bytes
 from torch.distributions import Normal
 
 from syft.frameworks.torch.he.fv.ciphertext import CipherText
+from syft.frameworks.torch.he.fv.util.operations import moduli_column
 from syft.frameworks.torch.he.fv.util.operations import poly_add_mod
 from syft.frameworks.torch.he.fv.util.operations import poly_mul_mod
 from syft.frameworks.torch.he.fv.util.operations import poly_negate_mod
+from syft.frameworks.torch.he.fv.util.operations import poly_dtype
 from syft.frameworks.torch.he.fv.util.global_variable import NOISE_STANDARD_DEVIATION
 
 
+def _random_values(count, dtype, limit):
+    """Draws count values of the unsigned numpy dtype, uniformly in [0, limit), from the
+    system CSPRNG by rejecting the values above limit."""
+    result = np.empty(0, dtype=dtype)
+    while len(result) < count:
+        values = np.frombuffer(token_bytes(np.dtype(dtype).itemsize * count), dtype=dtype)
+        result = np.concatenate([result, values[values < limit]])
+    return result[:count]
+
+
 def sample_poly_ternary(parms):
     """Generate a ternary polynomial uniformally with elements [-1, 0, 1]
     where -1 is represented as (modulus - 1) because -1 % modulus == modulus - 1.
@@ -21,28 +34,12 @@ def sample_poly_ternary(parms):
        parms (EncryptionParam): Encryption parameters.
 
     Returns:
-        A 2-dim list having integer from [-1, 0, 1].
+        A 2-dim array of shape (coeff_mod_size, coeff_count) having integer from [-1, 0, 1].
     """
-    coeff_modulus = parms.coeff_modulus
-    coeff_count = parms.poly_modulus
-    coeff_mod_size = len(coeff_modulus)
-
-    result = [0] * coeff_mod_size
-    for i in range(coeff_mod_size):
-        result[i] = [0] * coeff_count
-
-    for i in range(coeff_count):
-        rand_index = SystemRandom().choice([-1, 0, 1])
-        if rand_index == 1:
-            for j in range(coeff_mod_size):
-                result[j][i] = 1
-        elif rand_index == -1:
-            for j in range(coeff_mod_size):
-                result[j][i] = coeff_modulus[j] - 1
-        else:
-            for j in range(coeff_mod_size):
-                result[j][i] = 0
-    return result
+    coeff_modulus = moduli_column(parms.coeff_modulus)
+    # 255 is the largest multiple of 3 below 2^8
+    values = _random_values(parms.poly_modulus, np.uint8, 255) % 3
+    return (values.astype(coeff_modulus.dtype) - 1) % coeff_modulus
 
 
 def sample_poly_normal(param):
@@ -53,30 +50,13 @@ def sample_poly_normal(param):
         parms (EncryptionParam): Encryption parameters.
 
     Returns:
-        A 2-dim list having integer from normal distributions.
+        A 2-dim array of shape (coeff_mod_size, coeff_count) having integer from normal
+            distributions.
     """
-    coeff_modulus = param.coeff_modulus
-    coeff_mod_size = len(coeff_modulus)
-    coeff_count = param.poly_modulus
-
-    result = [0] * coeff_mod_size
-    for i in range(coeff_mod_size):
-        result[i] = [0] * coeff_count
-
-    for i in range(coeff_count):
-        noise = Normal(th.tensor([0.0]), th.tensor(NOISE_STANDARD_DEVIATION))
-        noise = int(noise.sample().item())
-        if noise > 0:
-            for j in range(coeff_mod_size):
-                result[j][i] = noise
-        elif noise < 0:
-            noise = -noise
-            for j in range(coeff_mod_size):
-                result[j][i] = coeff_modulus[j] - noise
-        else:
-            for j in range(coeff_mod_size):
-                result[j][i] = 0
-    return result
+    coeff_modulus = moduli_column(param.coeff_modulus)
+    noise = Normal(th.tensor(0.0), th.tensor(NOISE_STANDARD_DEVIATION))
+    values = noise.sample((param.poly_modulus,)).long().numpy()
+    return values.astype(coeff_modulus.dtype) % coeff_modulus
 
 
 def sample_poly_uniform(param):
@@ -85,27 +65,21 @@ def sample_poly_uniform(param):
     Args:
         parms (EncryptionParam): Encryption parameters.
     Returns:
-        A 2-dim list having integer from uniform distributions.
+        A 2-dim array of shape (coeff_mod_size, coeff_count) having integer from uniform
+            distributions.
     """
     coeff_modulus = param.coeff_modulus
-    coeff_mod_size = len(coeff_modulus)
     coeff_count = param.poly_modulus
 
-    max_random = 0x7FFFFFFFFFFFFFFF
-    result = [0] * coeff_mod_size
-    for i in range(coeff_mod_size):
-        result[i] = [0] * coeff_count
-
-    for j in range(coeff_mod_size):
-        modulus = coeff_modulus[j]
-        max_multiple = max_random - (max_random % modulus) - 1
-        for i in range(coeff_count):
-            # This ensures uniform distribution.
-            while True:
-                rand = randbits(32) << 31 | randbits(32) >> 1
-                if rand < max_multiple:
-                    break
-            result[j][i] = rand % modulus
+    result = np.empty((len(coeff_modulus), coeff_count), dtype=poly_dtype(coeff_modulus))
+    for j, modulus in enumerate(coeff_modulus):
+        if modulus.bit_length() > 64:
+            result[j] = [randbelow(modulus) for _ in range(coeff_count)]
+            continue
+        # This ensures uniform distribution.
+        max_multiple = (1 << 64) - (1 << 64) % modulus
+        values = _random_values(coeff_count, np.uint64, np.uint64(max_multiple))
+        result[j] = values % np.uint64(modulus)
     return result
 
 
@@ -129,19 +103,27 @@ def encrypt_asymmetric(context, public_key):
     # Generate u <-- R_3
     u = sample_poly_ternary(param)
 
-    c_0 = [0] * coeff_mod_size
-
-    c_1 = [0] * coeff_mod_size
-    result = [c_0, c_1]
-
     # c[i] = u * public_key[i]
     # Generate e_j <-- chi
     # c[i] = public_key[i] * u + e[i]
+    e = np.stack([sample_poly_normal(param) for _ in range(encrypted_size)])
+    result = np.empty_like(e)
+
+    if context.ntt_tables is not None:
+        for i, tables in enumerate(context.ntt_tables):
+            # Transform u once and all the public key polynomials at once
+            products = tables.inverse(
+                tables.multiply(tables.forward(public_key[:, i]), tables.forward(u[i]))
+            )
+            result[:, i] = tables.add(products, tables.to_array(e[:, i]))
+        return CipherText(result)
+
     for j in range(encrypted_size):
-        e = sample_poly_normal(param)
         for i in range(coeff_mod_size):
-            result[j][i] = poly_add_mod(
-                poly_mul_mod(public_key[j][i], u[i], coeff_modulus[i]), e[i], coeff_modulus[i]
+            result[j, i] = poly_add_mod(
+                poly_mul_mod(public_key[j, i].tolist(), u[i].tolist(), coeff_modulus[i]),
+                e[j, i].tolist(),
+                coeff_modulus[i],
             )
     return CipherText(result)
 
@@ -168,14 +150,22 @@ def encrypt_symmetric(context, secret_key):
 
     # calculate -(a*s + e) (mod q) and store in c0
 
-    c0 = [0] * coeff_mod_size
+    c0 = np.empty_like(c1)
+
+    if context.ntt_tables is not None:
+        for i, tables in enumerate(context.ntt_tables):
+            a_s = tables.poly_mul(c1[i], secret_key[i])
+            c0[i] = tables.negate(tables.add(a_s, tables.to_array(e[i])))
+        return CipherText(np.stack([c0, c1]))
 
     for i in range(coeff_mod_size):
         c0[i] = poly_negate_mod(
             poly_add_mod(
-                poly_mul_mod(c1[i], secret_key[i], coeff_modulus[i]), e[i], coeff_modulus[i]
+                poly_mul_mod(c1[i].tolist(), secret_key[i].tolist(), coeff_modulus[i]),
+                e[i].tolist(),
+                coeff_modulus[i],
             ),
             coeff_modulus[i],
         )
 
-    return CipherText([c0, c1])
+    return CipherText(np.stack([c0, c1]))
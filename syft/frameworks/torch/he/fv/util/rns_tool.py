@@ -1,18 +1,45 @@
+import numpy as np
+
 from syft.frameworks.torch.he.fv.util.global_variable import gamma
+from syft.frameworks.torch.he.fv.util.ntt import MAX_NTT_MODULUS_BITS
+from syft.frameworks.torch.he.fv.util.ntt import create_ntt_tables
+from syft.frameworks.torch.he.fv.util.numth import get_primes
+from syft.frameworks.torch.he.fv.util.operations import array_add_mod
+from syft.frameworks.torch.he.fv.util.operations import array_multiply_shoup_mod
+from syft.frameworks.torch.he.fv.util.operations import array_negate_mod
+from syft.frameworks.torch.he.fv.util.operations import array_sub_mod
 from syft.frameworks.torch.he.fv.util.operations import negate_mod
 from syft.frameworks.torch.he.fv.util.operations import invert_mod
 from syft.frameworks.torch.he.fv.util.operations import multiply_mod
+from syft.frameworks.torch.he.fv.util.operations import shoup_operands
 from syft.frameworks.torch.he.fv.util.base_converter import BaseConvertor
 from syft.frameworks.torch.he.fv.util.rns_base import RNSBase
 
+# Bit size of the primes of the auxiliary base Bsk used by the multiplication
+AUX_PRIME_BITS = 61
+M_TILDE = 1 << 32
+
+
+def _constant_column(values, moduli):
+    """Returns the uint64 columns of constants and of their Shoup precomputations, which
+    broadcast against arrays of shape (..., len(moduli), coeff_count)."""
+    values, values_shoup = shoup_operands(values, moduli)
+    return values[:, None], values_shoup[:, None]
+
 
 class RNSTool:
     """A class performing major operations required in the process of decryption
-    in RNS variant of FV HE Scheme.
+    and multiplication in RNS variant of FV HE Scheme.
 
     After the multiplication of secret key with the ciphertext as [ct0 + ct1 * sk + ct2 * sk^2...]
     we apply the decrypt_scale_and_round method of this class to get the plaintext object.
 
+    The multiplication of ciphertexts follows the BEHZ full RNS variant: the ciphertexts are
+    extended to an auxiliary base Bsk = B U {m_sk} (fastbconv_m_tilde and sm_mrq), multiplied in
+    base q U Bsk, and scaled down by t/q back to base q (multiply_scale_and_floor). These steps
+    work on uint64 arrays and are only available when all the coefficient moduli and the plain
+    modulus have at most MAX_NTT_MODULUS_BITS bits (is_vectorized).
+
     Args:
         encryption_param (EncryptionParams): For extracting encryption parameters.
     """
@@ -42,6 +69,182 @@ class RNSTool:
                 self.neg_inv_q_mod_t_gamma[i], self._base_t_gamma.base[i]
             )
 
+        self.is_vectorized = all(
+            modulus.bit_length() <= MAX_NTT_MODULUS_BITS for modulus in q + [t]
+        )
+        if self.is_vectorized:
+            self._q_column = np.array(q, dtype=np.uint64)[:, None]
+            self._t_gamma_column = np.array(self._base_t_gamma.base, dtype=np.uint64)[:, None]
+            self._base_q_to_t_gamma_conv = BaseConvertor(self.base_q, self._base_t_gamma)
+            self._prod_t_gamma_mod_q = _constant_column(self.prod_t_gamma_mod_q, q)
+            self._neg_inv_q_mod_t_gamma = _constant_column(
+                self.neg_inv_q_mod_t_gamma, self._base_t_gamma.base
+            )
+            self._inv_gamma_mod_t_column = _constant_column([self._inv_gamma_mod_t], [t])
+            self._init_multiplication_bases(n, q, t)
+
+    def _init_multiplication_bases(self, n, q, t):
+        """Computes the auxiliary bases and the constants of the BEHZ multiplication."""
+        # The base B must be large enough to hold the tensor product of two ciphertexts
+        base_B_size = self.base_q_size
+        total_q_bits = self.base_q.base_prod.bit_length()
+        if 32 + t.bit_length() + total_q_bits >= AUX_PRIME_BITS * (self.base_q_size + 1):
+            base_B_size += 1
+
+        excluded = [prime for prime in q + [gamma] if prime.bit_length() == AUX_PRIME_BITS]
+        primes = get_primes(n, AUX_PRIME_BITS, base_B_size + 1 + len(excluded))
+        base_Bsk = [prime for prime in primes if prime not in excluded][: base_B_size + 1]
+
+        self.base_B = RNSBase(base_Bsk[:-1])
+        self.m_sk = base_Bsk[-1]
+        self.base_Bsk = RNSBase(base_Bsk)
+        self.base_Bsk_size = len(base_Bsk)
+        self._base_Bsk_ntt_tables = None
+
+        self._Bsk_column = np.array(base_Bsk, dtype=np.uint64)[:, None]
+        self._q_Bsk_column = np.concatenate([self._q_column, self._Bsk_column])
+        self._m_sk = np.uint64(self.m_sk)
+        self._m_tilde = np.uint64(M_TILDE)
+
+        self._base_q_to_Bsk_conv = BaseConvertor(self.base_q, self.base_Bsk)
+        self._base_q_to_m_tilde_conv = BaseConvertor(self.base_q, RNSBase([M_TILDE]))
+        self._base_B_to_q_conv = BaseConvertor(self.base_B, self.base_q)
+        self._base_B_to_m_sk_conv = BaseConvertor(self.base_B, RNSBase([self.m_sk]))
+
+        prod_q = self.base_q.base_prod
+        prod_B = self.base_B.base_prod
+        self._m_tilde_mod_q = _constant_column([M_TILDE % prime for prime in q], q)
+        self._inv_prod_q_mod_m_tilde = _constant_column(
+            [invert_mod(prod_q % M_TILDE, M_TILDE)], [M_TILDE]
+        )
+        self._prod_q_mod_Bsk = _constant_column([prod_q % p for p in base_Bsk], base_Bsk)
+        self._inv_prod_q_mod_Bsk = _constant_column(
+            [invert_mod(prod_q % p, p) for p in base_Bsk], base_Bsk
+        )
+        self._inv_m_tilde_mod_Bsk = _constant_column(
+            [invert_mod(M_TILDE % p, p) for p in base_Bsk], base_Bsk
+        )
+        self._inv_prod_B_mod_m_sk = _constant_column(
+            [invert_mod(prod_B % self.m_sk, self.m_sk)], [self.m_sk]
+        )
+        self._prod_B_mod_q = _constant_column([prod_B % prime for prime in q], q)
+        self._neg_prod_B_mod_q = _constant_column(
+            [negate_mod(prod_B % prime, prime) for prime in q], q
+        )
+        self._t_mod_q_Bsk = _constant_column([t % p for p in q + base_Bsk], q + base_Bsk)
+
+    @property
+    def base_Bsk_ntt_tables(self):
+        """The NTTTables of the primes of Bsk, built on first use."""
+        if self._base_Bsk_ntt_tables is None:
+            self._base_Bsk_ntt_tables = create_ntt_tables(self._coeff_count, self.base_Bsk.base)
+        return self._base_Bsk_ntt_tables
+
+    def fastbconv_m_tilde(self, input):
+        """Multiplies the polynomials by m_tilde and converts them from base q to base
+        Bsk U {m_tilde} with the fast base conversion, which may add a small multiple of q.
+
+        Args:
+            input: A uint64 array of shape (..., base_q_size, coeff_count).
+
+        Returns:
+            A uint64 array of shape (..., base_Bsk_size + 1, coeff_count), the residues modulo
+                m_tilde coming last.
+        """
+        temp = array_multiply_shoup_mod(input, *self._m_tilde_mod_q, self._q_column)
+        return np.concatenate(
+            [
+                self._base_q_to_Bsk_conv.fast_convert_array(temp),
+                self._base_q_to_m_tilde_conv.fast_convert_array(temp),
+            ],
+            axis=-2,
+        )
+
+    def sm_mrq(self, input):
+        """Small Montgomery reduction modulo q: removes the multiple of q added by
+        fastbconv_m_tilde and divides by m_tilde.
+
+        Args:
+            input: A uint64 array of shape (..., base_Bsk_size + 1, coeff_count) returned by
+                fastbconv_m_tilde.
+
+        Returns:
+            A uint64 array of shape (..., base_Bsk_size, coeff_count) representing the input
+                polynomials of base q in base Bsk.
+        """
+        input_m_tilde = input[..., -1:, :]
+        r_m_tilde = array_negate_mod(
+            array_multiply_shoup_mod(input_m_tilde, *self._inv_prod_q_mod_m_tilde, self._m_tilde),
+            self._m_tilde,
+        )
+
+        # Lift r_m_tilde to Bsk as a value of [-m_tilde/2, m_tilde/2)
+        r_Bsk = np.where(
+            r_m_tilde >= self._m_tilde >> np.uint64(1),
+            r_m_tilde + (self._Bsk_column - self._m_tilde),
+            r_m_tilde,
+        )
+        temp = array_multiply_shoup_mod(r_Bsk, *self._prod_q_mod_Bsk, self._Bsk_column)
+        temp = array_add_mod(temp, input[..., :-1, :], self._Bsk_column)
+        return array_multiply_shoup_mod(temp, *self._inv_m_tilde_mod_Bsk, self._Bsk_column)
+
+    def fast_floor(self, input):
+        """Computes floor(input / q) in base Bsk, up to a small error.
+
+        Args:
+            input: A uint64 array of shape (..., base_q_size + base_Bsk_size, coeff_count) in
+                base q U Bsk.
+
+        Returns:
+            A uint64 array of shape (..., base_Bsk_size, coeff_count).
+        """
+        input_q = input[..., : self.base_q_size, :]
+        input_Bsk = input[..., self.base_q_size :, :]
+        temp = self._base_q_to_Bsk_conv.fast_convert_array(input_q)
+        temp = array_sub_mod(input_Bsk, temp, self._Bsk_column)
+        return array_multiply_shoup_mod(temp, *self._inv_prod_q_mod_Bsk, self._Bsk_column)
+
+    def fastbconv_sk(self, input):
+        """Converts polynomials from base Bsk to base q exactly, using the Shenoy-Kumaresan
+        correction computed with the residues modulo m_sk.
+
+        Args:
+            input: A uint64 array of shape (..., base_Bsk_size, coeff_count).
+
+        Returns:
+            A uint64 array of shape (..., base_q_size, coeff_count).
+        """
+        input_B = input[..., :-1, :]
+        input_m_sk = input[..., -1:, :]
+        temp_q = self._base_B_to_q_conv.fast_convert_array(input_B)
+
+        # alpha is the multiple of prod(B) added by the fast base conversion
+        alpha = self._base_B_to_m_sk_conv.fast_convert_array(input_B)
+        alpha = array_sub_mod(alpha, input_m_sk, self._m_sk)
+        alpha = array_multiply_shoup_mod(alpha, *self._inv_prod_B_mod_m_sk, self._m_sk)
+
+        # Remove alpha * prod(B), alpha being centered in [-m_sk/2, m_sk/2]
+        correction = np.where(
+            alpha > self._m_sk >> np.uint64(1),
+            array_multiply_shoup_mod(self._m_sk - alpha, *self._prod_B_mod_q, self._q_column),
+            array_multiply_shoup_mod(alpha, *self._neg_prod_B_mod_q, self._q_column),
+        )
+        return array_add_mod(temp_q, correction, self._q_column)
+
+    def multiply_scale_and_floor(self, input):
+        """Scales the tensor product of two ciphertexts by t/q.
+
+        Args:
+            input: A uint64 array of shape (..., base_q_size + base_Bsk_size, coeff_count) in
+                base q U Bsk.
+
+        Returns:
+            A uint64 array of shape (..., base_q_size, coeff_count) of floor(t * input / q),
+                up to a small error.
+        """
+        temp = array_multiply_shoup_mod(input, *self._t_mod_q_Bsk, self._q_Bsk_column)
+        return self.fastbconv_sk(self.fast_floor(temp))
+
     def decrypt_scale_and_round(self, input):
         """Perform the remaining procedure of decryptions process after getting the result of
         [c0 + c1 * sk + c2 * sk^2 ...]_q.
@@ -52,6 +255,12 @@ class RNSTool:
         Returns:
             A 1-dim list representing plaintext polynomial of the decrypted result.
         """
+        if self.is_vectorized:
+            return self._decrypt_scale_and_round_array(np.asarray(input, dtype=np.uint64))
+
+        if isinstance(input, np.ndarray):
+            input = input.tolist()
+
         result = [0] * self._coeff_count
 
         # Computing |gamma * t|_qi * ct(s)
@@ -99,3 +308,22 @@ class RNSTool:
                 result[i] = multiply_mod(result[i], self._inv_gamma_mod_t, self._t)
 
         return result
+
+    def _decrypt_scale_and_round_array(self, input):
+        """decrypt_scale_and_round on a uint64 array of shape (base_q_size, coeff_count)."""
+        temp = array_multiply_shoup_mod(input, *self._prod_t_gamma_mod_q, self._q_column)
+        temp_t_gamma = self._base_q_to_t_gamma_conv.fast_convert_array(temp)
+        temp_t_gamma = array_multiply_shoup_mod(
+            temp_t_gamma, *self._neg_inv_q_mod_t_gamma, self._t_gamma_column
+        )
+
+        # Subtract the gamma component, centered in (-gamma/2, gamma/2], from the t component
+        t = np.uint64(self._t)
+        temp_t, temp_gamma = temp_t_gamma[0], temp_t_gamma[1]
+        result = np.where(
+            temp_gamma > np.uint64(gamma >> 1),
+            temp_t + (np.uint64(gamma) - temp_gamma) % t,
+            temp_t + (t - temp_gamma % t),
+        )
+        result = array_multiply_shoup_mod(result % t, *self._inv_gamma_mod_t_column, t)
+        return result[0].tolist()
@@ -1,8 +1,133 @@
+from collections import Counter
+from contextlib import contextmanager
 from typing import Callable
 import torch
 
+import syft as sy
+from syft.frameworks.torch.mpc.primitives import triple_signature
 from syft.workers.abstract import AbstractWorker
 
+# Signatures of the triples used while a profile is recorded, see triple_profile
+_profile = None
+
+
+def get_triple(
+    crypto_provider: AbstractWorker,
+    cmd: Callable,
+    field: int,
+    dtype: str,
+    a_size: tuple,
+    b_size: tuple,
+    locations: list,
+):
+    """Gets a multiplication triple: from the offline stores of the locations if
+    triples of this signature were preprocessed for them, else from the crypto provider.
+
+    Args: see request_triple
+
+    Returns:
+        A triple of AdditiveSharedTensors such that c_shared = cmd(a_shared, b_shared).
+    """
+    signature = triple_signature(cmd.__name__, a_size, b_size, field)
+    if _profile is not None:
+        _profile[signature] += 1
+
+    if min(count_offline_triples(signature, locations)) > 0:
+        return use_offline_triple(crypto_provider, signature, dtype, locations)
+
+    return request_triple(crypto_provider, cmd, field, dtype, a_size, b_size, locations)
+
+
+def count_offline_triples(signature: tuple, locations: list) -> list:
+    """Asks the stores of the locations how many triples of a signature they hold,
+    including the pools persisted on disk by a previous run.
+    """
+    me = sy.local_worker
+    messages = [
+        me.create_worker_command_message("count_beaver_triples", None, signature) for _ in locations
+    ]
+    return me.send_msgs(messages, locations)
+
+
+def use_offline_triple(crypto_provider: AbstractWorker, signature: tuple, dtype: str, locations):
+    """Builds a triple from the shares preprocessed in the stores of the locations,
+    the crypto provider is not contacted.
+    """
+    me = sy.local_worker
+    op, a_size, b_size, field = signature
+
+    ids = [[sy.ID_PROVIDER.pop() for _ in range(3)] for _ in locations]
+    messages = [
+        me.create_worker_command_message("use_beaver_triple", None, signature, return_ids)
+        for return_ids in ids
+    ]
+    c_size = me.send_msgs(messages, locations)[0]
+
+    triple = []
+    for i, size in enumerate((a_size, b_size, c_size)):
+        shares = {
+            location.id: sy.PointerTensor(
+                location=location,
+                id_at_location=return_ids[i],
+                owner=me,
+                id=sy.ID_PROVIDER.pop(),
+                shape=torch.Size(size),
+            )
+            for location, return_ids in zip(locations, ids)
+        }
+        triple.append(
+            sy.AdditiveSharingTensor(
+                shares, field=field, dtype=dtype, crypto_provider=crypto_provider
+            )
+        )
+
+    return tuple(triple)
+
+
+@contextmanager
+def triple_profile():
+    """Records the signatures of the triples used by the multiplications run in the
+    block, to preprocess them with preprocess_triples.
+
+    Example:
+        >>> with triple_profile() as profile:
+        ...     model(x)
+        >>> preprocess_triples(crypto_provider, [alice, bob], profile, n_runs=100)
+    """
+    global _profile
+    previous_profile, _profile = _profile, Counter()
+    try:
+        yield _profile
+    finally:
+        _profile = previous_profile
+
+
+def preprocess_triples(
+    crypto_provider: AbstractWorker, locations: list, profile: Counter, n_runs: int = 1
+):
+    """Generates ahead of time the triples needed to run n_runs times a computation,
+    and stores them on the locations.
+
+    Args:
+        crypto_provider: worker generating the triples
+        locations: the workers sharing the triples
+        profile: the number of triples of each signature used by the computation,
+            see triple_profile
+        n_runs: how many times the computation will be run
+    """
+    me = sy.local_worker
+    worker_ids = [location.id for location in locations]
+    for signature, count in profile.items():
+        n_instances = count * n_runs
+        kwargs = {"n_instances": n_instances, "signature": signature}
+        if crypto_provider == me:
+            me.provide_crypto_primitives(["beaver"], worker_ids, **kwargs)
+        else:
+            message = me.create_worker_command_message(
+                "provide_crypto_primitives", None, ["beaver"], worker_ids, **kwargs
+            )
+            me.send_msg(message, crypto_provider)
+
 
 def request_triple(
     crypto_provider: AbstractWorker,
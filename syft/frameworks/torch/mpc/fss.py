@@ -9,8 +9,7 @@ Useful papers are:
 
 Note that the protocols are quite different in aspect from those papers
 """
-import hashlib
-
+import numpy as np
 import torch as th
 import syft as sy
 
@@ -61,20 +60,26 @@ def initialize_crypto_plans(worker):
     worker.register_obj(xor_add_plan)
 
 
-def request_run_plan(worker, plan_tag, location, return_value, args=(), kwargs={}):
-    response_ids = (sy.ID_PROVIDER.pop(),)
-    args = (args, response_ids)
+def request_run_plans(worker, plan_tag, locations, return_value, args_list, n_outputs=1):
+    """
+    Runs a plan on all the locations at once, with different arguments for each
+    location, so that a protocol stage costs a single round.
+
+    Returns:
+        the responses of each location, a tuple of n_outputs responses if n_outputs > 1
+    """
+    response_ids_list = [tuple(sy.ID_PROVIDER.pop() for _ in range(n_outputs)) for _ in locations]
+    args_list = [(args, response_ids) for args, response_ids in zip(args_list, response_ids_list)]
 
-    response = worker.send_command(
+    responses = worker.send_commands(
+        recipients=locations,
         cmd_name="run",
         target=plan_tag,
-        recipient=location,
-        return_ids=response_ids,
+        args_list=args_list,
+        return_ids_list=response_ids_list,
         return_value=return_value,
-        kwargs_=kwargs,
-        args_=args,
     )
-    return response
+    return responses
 
 
 def fss_op(x1, x2, type_op="eq"):
@@ -92,73 +97,104 @@ def fss_op(x1, x2, type_op="eq"):
     Returns:
         shares of the comparison
     """
+    return fss_ops([(x1, x2)], type_op)[0]
 
-    me = sy.local_worker
-    locations = x1.locations
 
-    shares = []
-    for location in locations:
-        args = (x1.child[location.id], x2.child[location.id])
-        share = request_run_plan(
-            me, f"#fss_{type_op}_plan_1", location, return_value=True, args=args
+def fss_ops(pairs, type_op="eq"):
+    """
+    Evaluates several independent comparisons in a single Function Secret Sharing
+    evaluation: the shares of all the comparisons are concatenated, so the number
+    of rounds doesn't depend on the number of comparisons.
+
+    Args:
+        pairs: list of couples (x1, x2) of AST to compare
+        type_op: type of operation to perform, should be 'eq' or 'comp'
+
+    Returns:
+        list of the shares of each comparison
+    """
+    me = sy.local_worker
+    locations = pairs[0][0].locations
+    shapes = [tuple(x1.shape) for x1, _ in pairs]
+    n_outputs = len(pairs)
+
+    args_list = [
+        (
+            tuple(x1.child[location.id] for x1, _ in pairs),
+            tuple(x2.child[location.id] for _, x2 in pairs),
         )
-        shares.append(share)
+        for location in locations
+    ]
+    shares = request_run_plans(
+        me, f"#fss_{type_op}_plan_1", locations, return_value=True, args_list=args_list
+    )
 
     mask_value = sum(shares) % 2 ** n
 
-    shares = []
-    for i, location in enumerate(locations):
-        args = (th.IntTensor([i]), mask_value)
-        share = request_run_plan(
-            me, f"#fss_{type_op}_plan_2", location, return_value=False, args=args
+    if type_op == "comp":
+        args_list = [(th.IntTensor([i]), mask_value) for i in range(len(locations))]
+        prev_shares = request_run_plans(
+            me, f"#fss_{type_op}_plan_2", locations, return_value=False, args_list=args_list
         )
-        shares.append(share)
 
-    if type_op == "comp":
-        prev_shares = shares
-        shares = []
-        for prev_share, location in zip(prev_shares, locations):
-            share = request_run_plan(
-                me, "#xor_add_1", location, return_value=True, args=(prev_share,)
-            )
-            shares.append(share)
+        args_list = [(prev_share,) for prev_share in prev_shares]
+        shares = request_run_plans(
+            me, "#xor_add_1", locations, return_value=True, args_list=args_list
+        )
 
         masked_value = shares[0] ^ shares[1]  # TODO case >2 workers ?
 
-        shares = {}
-        for i, prev_share, location in zip(range(len(locations)), prev_shares, locations):
-            share = request_run_plan(
-                me,
-                "#xor_add_2",
-                location,
-                return_value=False,
-                args=(th.IntTensor([i]), masked_value),
-            )
-            shares[location.id] = share
+        args_list = [(th.IntTensor([i]), masked_value, shapes) for i in range(len(locations))]
+        shares = request_run_plans(
+            me,
+            "#xor_add_2",
+            locations,
+            return_value=False,
+            args_list=args_list,
+            n_outputs=n_outputs,
+        )
     else:
-        shares = {loc.id: share for loc, share in zip(locations, shares)}
+        args_list = [(th.IntTensor([i]), mask_value, shapes) for i in range(len(locations))]
+        shares = request_run_plans(
+            me,
+            f"#fss_{type_op}_plan_2",
+            locations,
+            return_value=False,
+            args_list=args_list,
+            n_outputs=n_outputs,
+        )
 
-    response = sy.AdditiveSharingTensor(shares, **x1.get_class_attributes())
-    return response
+    if n_outputs == 1:
+        shares = [(share,) for share in shares]
+
+    responses = []
+    for j, (x1, _) in enumerate(pairs):
+        response = sy.AdditiveSharingTensor(
+            {location.id: share[j] for location, share in zip(locations, shares)},
+            **x1.get_class_attributes(),
+        )
+        responses.append(response)
+    return responses
 
 
 # share level
 def mask_builder(x1, x2, type_op):
-    x = x1 - x2
+    # The shares of independent comparisons are masked together
+    x = concat(*[(x1_i - x2_i).reshape(-1) for x1_i, x2_i in zip(x1, x2)])
     # Keep the primitive in store as we use it after
-    alpha, s_0, *CW = x1.owner.crypto_store.get_keys(
-        f"fss_{type_op}", n_instances=x1.numel(), remove=False
+    alpha, s_0, *CW = x1[0].owner.crypto_store.get_keys(
+        f"fss_{type_op}", n_instances=x.numel(), remove=False
     )
     return x + alpha.reshape(x.shape)
 
 
 # share level
-def eq_eval_plan(b, x_masked):
+def eq_eval_plan(b, x_masked, shapes):
     alpha, s_0, *CW = x_masked.owner.crypto_store.get_keys(
         type_op="fss_eq", n_instances=x_masked.numel(), remove=True
     )
     result_share = DPF.eval(b, x_masked, s_0, *CW)
-    return result_share
+    return split_outputs(result_share, shapes)
 
 
 # share level
@@ -177,11 +213,21 @@ def xor_add_convert_1(x):
     return x ^ xor_share.reshape(x.shape)
 
 
-def xor_add_convert_2(b, x):
+def xor_add_convert_2(b, x, shapes):
     xor_share, add_share = x.owner.crypto_store.get_keys(
         type_op="xor_add_couple", n_instances=x.numel(), remove=True
     )
-    return add_share.reshape(x.shape) * (1 - 2 * x) + x * b
+    result_share = add_share.reshape(x.shape) * (1 - 2 * x) + x * b
+    return split_outputs(result_share, shapes)
+
+
+def split_outputs(flat_result, shapes):
+    """Splits the flat result of several comparisons evaluated together."""
+    sizes = [int(np.prod(shape)) for shape in shapes]
+    outputs = tuple(
+        output.reshape(shape) for output, shape in zip(flat_result.split(sizes), shapes)
+    )
+    return outputs[0] if len(outputs) == 1 else outputs
 
 
 def eq(x1, x2):
@@ -203,32 +249,26 @@ class DPF:
         beta = th.tensor([1], dtype=dtype)
         alpha = th.randint(0, 2 ** n, (n_values,))
 
-        α = bit_decomposition(alpha)
+        α = bit_decomposition(alpha).long()
         s, t, CW = (
-            Array(n + 1, 2, λ, n_values),
-            Array(n + 1, 2, n_values),
-            Array(n, 2 * (λ + 1), n_values),
+            Words(n + 1, 2, W, n_values),
+            Words(n + 1, 2, n_values),
+            Words(n, 2, W, n_values),
         )
-        s[0] = randbit(size=(2, λ, n_values))
-        t[0] = th.tensor([[0, 1]] * n_values, dtype=th.uint8).t()
+        s[0] = randseed(size=(2, W, n_values))
+        t[0, 0], t[0, 1] = 0, 1
         for i in range(0, n):
-            g0 = G(s[i, 0])
-            g1 = G(s[i, 1])
+            # Expand the seeds of both parties at once
+            g0, g1 = G(concat(s[i, 0], s[i, 1], axis=1)).split(n_values, dim=2)
             # Re-use useless randomness
-            sL_0, _, sR_0, _ = split(g0, [λ, 1, λ, 1])
-            sL_1, _, sR_1, _ = split(g1, [λ, 1, λ, 1])
-            s_rand = (sL_0 ^ sL_1) * α[i] + (sR_0 ^ sR_1) * (1 - α[i])
-
+            s_rand = select(g0 ^ g1, 1 - α[i]) & seed_mask
             cw_i = TruthTableDPF(s_rand, α[i])
             CW[i] = cw_i ^ g0 ^ g1
 
             for b in (0, 1):
                 τ = [g0, g1][b] ^ (t[i, b] * CW[i])
-                τ = τ.reshape(2, λ + 1, n_values)
-                # filtered_τ = τ[𝛼[i]] OLD
-                α_i = α[i].unsqueeze(0).expand(λ + 1, n_values).unsqueeze(0).long()
-                filtered_τ = th.gather(τ, 0, α_i).squeeze(0)
-                s[i + 1, b], t[i + 1, b] = split(filtered_τ, [λ, 1])
+                filtered_τ = select(τ, α[i])
+                s[i + 1, b], t[i + 1, b] = filtered_τ & seed_mask, bit(filtered_τ, λ)
 
         CW_n = (-1) ** t[n, 1].to(dtype) * (beta - Convert(s[n, 0]) + Convert(s[n, 1]))
 
@@ -239,19 +279,16 @@ class DPF:
         original_shape = x.shape
         x = x.reshape(-1)
         n_values = x.shape[0]
-        x = bit_decomposition(x)
-        s, t = Array(n + 1, λ, n_values), Array(n + 1, 1, n_values)
-        s[0] = k_b[0]
+        x = bit_decomposition(x).long()
+        s, t = k_b[0], Words(n_values)
         # here k[1:] is (CW, CW_n)
-        CW = k_b[1].unbind() + (k_b[2],)
-        t[0] = b
+        CW, CW_n = k_b[1:]
+        t[:] = b
         for i in range(0, n):
-            τ = G(s[i]) ^ (t[i] * CW[i])
-            τ = τ.reshape(2, λ + 1, n_values)
-            x_i = x[i].unsqueeze(0).expand(λ + 1, n_values).unsqueeze(0).long()
-            filtered_τ = th.gather(τ, 0, x_i).squeeze(0)
-            s[i + 1], t[i + 1] = split(filtered_τ, [λ, 1])
-        flat_result = (-1) ** b * (Convert(s[n]) + t[n].squeeze() * CW[n])
+            τ = G(s) ^ (t * CW[i])
+            filtered_τ = select(τ, x[i])
+            s, t = filtered_τ & seed_mask, bit(filtered_τ, λ)
+        flat_result = (-1) ** b * (Convert(s) + t.to(dtype) * CW_n)
         return flat_result.reshape(original_shape)
 
 
@@ -264,31 +301,26 @@ class DIF:
     @staticmethod
     def keygen(n_values=1):
         alpha = th.randint(0, 2 ** n, (n_values,))
-        α = bit_decomposition(alpha)
+        α = bit_decomposition(alpha).long()
         s, t, CW = (
-            Array(n + 1, 2, λ, n_values),
-            Array(n + 1, 2, n_values),
-            Array(n, 2 + 2 * (λ + 1), n_values),
+            Words(n + 1, 2, W, n_values),
+            Words(n + 1, 2, n_values),
+            Words(n, 2, W, n_values),
         )
-        s[0] = randbit(size=(2, λ, n_values))
-        t[0] = th.tensor([[0, 1]] * n_values, dtype=th.uint8).t()
+        s[0] = randseed(size=(2, W, n_values))
+        t[0, 0], t[0, 1] = 0, 1
         for i in range(0, n):
-            h0 = H(s[i, 0])
-            h1 = H(s[i, 1])
+            # Expand the seeds of both parties at once
+            h0, h1 = H(concat(s[i, 0], s[i, 1], axis=1)).split(n_values, dim=2)
             # Re-use useless randomness
-            _, _, sL_0, _, sR_0, _ = split(h0, [1, 1, λ, 1, λ, 1])
-            _, _, sL_1, _, sR_1, _ = split(h1, [1, 1, λ, 1, λ, 1])
-            s_rand = (sL_0 ^ sL_1) * α[i] + (sR_0 ^ sR_1) * (1 - α[i])
+            s_rand = select(h0 ^ h1, 1 - α[i]) & seed_mask
             cw_i = TruthTableDIF(s_rand, α[i])
             CW[i] = cw_i ^ h0 ^ h1
 
             for b in (0, 1):
                 τ = [h0, h1][b] ^ (t[i, b] * CW[i])
-                τ = τ.reshape(2, λ + 2, n_values)
-                # filtered_τ = τ[𝛼[i]] OLD
-                α_i = α[i].unsqueeze(0).expand(λ + 2, n_values).unsqueeze(0).long()
-                filtered_τ = th.gather(τ, 0, α_i).squeeze(0)
-                σ_leaf, s[i + 1, b], t[i + 1, b] = split(filtered_τ, [1, λ, 1])
+                filtered_τ = select(τ, α[i])
+                s[i + 1, b], t[i + 1, b] = filtered_τ & seed_mask, bit(filtered_τ, λ)
 
         return (alpha,) + s[0].unbind() + (CW,)
 
@@ -297,62 +329,157 @@ class DIF:
         original_shape = x.shape
         x = x.reshape(-1)
         n_values = x.shape[0]
-        x = bit_decomposition(x)
-        FnOutput = Array(n + 1, n_values)
-        s, t = Array(n + 1, λ, n_values), Array(n + 1, 1, n_values)
-        s[0] = k_b[0]
-        CW = k_b[1].unbind()
-        t[0] = b
+        x = bit_decomposition(x).long()
+        s, t = k_b[0], Words(n_values)
+        CW = k_b[1]
+        t[:] = b
+        # The output is the XOR of the leaves σ met along the path
+        flat_result = th.zeros(n_values, dtype=th.long)
         for i in range(0, n):
-            τ = H(s[i]) ^ (t[i] * CW[i])
-            τ = τ.reshape(2, λ + 2, n_values)
-            x_i = x[i].unsqueeze(0).expand(λ + 2, n_values).unsqueeze(0).long()
-            filtered_τ = th.gather(τ, 0, x_i).squeeze(0)
-            σ_leaf, s[i + 1], t[i + 1] = split(filtered_τ, [1, λ, 1])
-            FnOutput[i] = σ_leaf
+            τ = H(s) ^ (t * CW[i])
+            filtered_τ = select(τ, x[i])
+            σ_leaf = bit(filtered_τ, λ + 1)
+            s, t = filtered_τ & seed_mask, bit(filtered_τ, λ)
+            flat_result ^= σ_leaf
 
         # Last tour, the other σ is also a leaf:
-        FnOutput[n] = t[n]
-        flat_result = FnOutput.sum(axis=0) % 2
+        flat_result ^= t
         return flat_result.reshape(original_shape)
 
 
+# Packed representation
+# The nodes of the DPF and DIF trees are packed in W int64 words: the λ bits of the
+# seed come first, followed by the control bit t and, for the DIF, the leaf bit σ.
+W = (λ + 2 + 63) // 64
+
+
+def _low_bits_mask(n_bits):
+    """Returns the packed mask of the n_bits lowest bits of a node, of shape (W, 1)."""
+    words = []
+    for k in range(W):
+        width = min(max(n_bits - 64 * k, 0), 64)
+        words.append(-1 if width == 64 else (1 << width) - 1)
+    return th.tensor(words, dtype=th.long).unsqueeze(-1)
+
+
+def _bit_mask(position):
+    """Returns the packed mask of the bit at the given position, of shape (W, 1)."""
+    return _low_bits_mask(position + 1) ^ _low_bits_mask(position)
+
+
+seed_mask = _low_bits_mask(λ)
+t_mask = _bit_mask(λ)
+σ_mask = _bit_mask(λ + 1)
+
+
+def bit(words, position):
+    """Extracts the bit at the given position of packed nodes of shape (W, n_values)."""
+    return (words[position // 64] >> (position % 64)) & 1
+
+
+def select(nodes, side):
+    """For each value, selects the left (side = 0) or right (side = 1) node out of
+    the pairs of packed nodes of shape (2, W, n_values)."""
+    index = side.expand(nodes.shape[1:]).unsqueeze(0)
+    return th.gather(nodes, 0, index).squeeze(0)
+
+
+def randseed(size):
+    """Draws random packed seeds, size should be (..., W, n_values)."""
+    high = th.randint(0, 2 ** 32, size, dtype=th.long)
+    low = th.randint(0, 2 ** 32, size, dtype=th.long)
+    return ((high << 32) | low) & seed_mask
+
+
 # PRG
-def G(seed):
-    assert seed.shape[0] == λ
-    seed_t = seed.t().tolist()
-    gen_list = []
-    for seed_bit in seed_t:
-        enc_str = str(seed_bit).encode()
-        h = hashlib.sha3_256(enc_str)
-        r = h.digest()
-        binary_str = bin(int.from_bytes(r, byteorder="big"))[2 : 2 + (2 * (λ + 1))]
-        gen_list.append(list(map(int, binary_str)))
+# The PRG is ChaCha20 keyed with the seed and vectorized with numpy over all the
+# seeds of a batch, so that G and H cost a constant number of array operations
+# instead of one hash per value.
+CHACHA_CONSTANTS = (0x61707865, 0x3320646E, 0x79622D32, 0x6B206574)
+CHACHA_DOUBLE_ROUNDS = 10
+# Nonces used to separate the outputs of G and H
+G_NONCE, H_NONCE = 0, 1
 
-    return th.tensor(gen_list, dtype=th.uint8).t()
 
+def _rotl(x, r):
+    return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
 
-def H(seed):
-    assert seed.shape[0] == λ
-    seed_t = seed.t().tolist()
-    gen_list = []
-    for seed_bit in seed_t:
-        enc_str = str(seed_bit).encode()
-        h = hashlib.sha3_256(enc_str)
-        r = h.digest()
-        binary_str = bin(int.from_bytes(r, byteorder="big"))[2 : 2 + 2 + (2 * (λ + 1))]
-        gen_list.append(list(map(int, binary_str)))
 
-    return th.tensor(gen_list, dtype=th.uint8).t()
+def _quarter_round(state, a, b, c, d):
+    state[a] += state[b]
+    state[d] = _rotl(state[d] ^ state[a], 16)
+    state[c] += state[d]
+    state[b] = _rotl(state[b] ^ state[c], 12)
+    state[a] += state[b]
+    state[d] = _rotl(state[d] ^ state[a], 8)
+    state[c] += state[d]
+    state[b] = _rotl(state[b] ^ state[c], 7)
+
+
+def chacha_prg(seed, n_words, nonce=0):
+    """
+    Expands a batch of seeds into pseudo-random words with one ChaCha20 block per seed.
+
+    Args:
+        seed: packed seeds of shape (W, n_values)
+        n_words: number of int64 output words per seed, at most 8
+        nonce: used to draw independent outputs from the same seeds
+
+    Returns:
+        int64 tensor of shape (n_words, n_values)
+    """
+    assert n_words <= 8
+    n_values = seed.shape[1]
+    # The seed fills the first words of the 256-bit key, one row per value
+    key = np.zeros((n_values, 8), dtype=np.uint32)
+    packed_seed = np.ascontiguousarray(seed.numpy().T, dtype="<i8").view("<u4")
+    key[:, : packed_seed.shape[1]] = packed_seed
+
+    state = np.empty((16, n_values), dtype=np.uint32)
+    state[0:4] = np.array(CHACHA_CONSTANTS, dtype=np.uint32).reshape(4, 1)
+    state[4:12] = key.T
+    state[12:16] = 0
+    state[13] = nonce
+
+    working_state = state.copy()
+    with np.errstate(over="ignore"):
+        for _ in range(CHACHA_DOUBLE_ROUNDS):
+            _quarter_round(working_state, 0, 4, 8, 12)
+            _quarter_round(working_state, 1, 5, 9, 13)
+            _quarter_round(working_state, 2, 6, 10, 14)
+            _quarter_round(working_state, 3, 7, 11, 15)
+            _quarter_round(working_state, 0, 5, 10, 15)
+            _quarter_round(working_state, 1, 6, 11, 12)
+            _quarter_round(working_state, 2, 7, 8, 13)
+            _quarter_round(working_state, 3, 4, 9, 14)
+        working_state += state
+
+    block = np.ascontiguousarray(working_state.T, dtype="<u4").view("<i8")
+    words = block[:, :n_words].astype(np.int64)
+    return th.from_numpy(np.ascontiguousarray(words.T))
+
 
+def G(seed):
+    """Expands packed seeds of shape (W, n_values) into two nodes (s, t) per value."""
+    assert seed.shape[0] == W
+    nodes = chacha_prg(seed, 2 * W, nonce=G_NONCE).reshape(2, W, -1)
+    return nodes & (seed_mask | t_mask)
 
-def Convert(bits):
-    bit_pow_lambda = th.flip(2 ** th.arange(λ), (0,)).unsqueeze(-1).to(th.long)
-    return (bits.to(th.long) * bit_pow_lambda).sum(dim=0).to(dtype)
 
+def H(seed):
+    """Expands packed seeds of shape (W, n_values) into two nodes (s, t, σ) per value."""
+    assert seed.shape[0] == W
+    nodes = chacha_prg(seed, 2 * W, nonce=H_NONCE).reshape(2, W, -1)
+    return nodes & (seed_mask | t_mask | σ_mask)
 
-def Array(*shape):
-    return th.empty(shape, dtype=th.uint8)
+
+def Convert(seed):
+    """Maps packed seeds to the ring of the shares."""
+    return seed[0].to(dtype)
+
+
+def Words(*shape):
+    return th.empty(shape, dtype=th.long)
 
 
 bit_pow_n = th.flip(2 ** th.arange(n), (0,))
@@ -365,40 +492,19 @@ def bit_decomposition(x):
     return (z > 0).to(th.uint8)
 
 
-def randbit(size):
-    return th.randint(2, size=size)
-
-
 def concat(*args, **kwargs):
     return th.cat(args, **kwargs)
 
 
-def split(x, idx):
-    return th.split(x, idx)
-
-
 def TruthTableDPF(s, α_i):
-    one = th.ones((1, s.shape[1])).to(th.uint8)
-    s_one = concat(s, one)
-    Table = th.zeros((2, λ + 1, len(α_i)), dtype=th.uint8)
-    for j, el in enumerate(α_i):
-        Table[el.item(), :, j] = s_one[:, j]
-    return Table.reshape(-1, Table.shape[2])
+    # The seed corrections s and a control bit 1 go on the side of α
+    node = s | t_mask
+    return th.stack((node * (1 - α_i), node * α_i))
 
 
 def TruthTableDIF(s, α_i):
-    leafTable = th.zeros((2, 1, len(α_i)), dtype=th.uint8)
-    # TODO optimize: just put alpha on first line
-    leaf_value = α_i
-    for j, el in enumerate(α_i):
-        leafTable[(1 - el).item(), 0, j] = leaf_value[j]
-
-    one = th.ones((1, s.shape[1])).to(th.uint8)
-    s_one = concat(s, one)
-    nextTable = th.zeros((2, λ + 1, len(α_i)), dtype=th.uint8)
-    for j, el in enumerate(α_i):
-        nextTable[el.item(), :, j] = s_one[:, j]
-
-    Table = concat(leafTable, nextTable, axis=1)
-    Table = Table.reshape(-1, Table.shape[2])
-    return Table
+    # The seed corrections s and a control bit 1 go on the side of α, and the other
+    # side is a leaf with value α
+    node = s | t_mask
+    leaf = σ_mask * α_i
+    return th.stack((node * (1 - α_i) + leaf, node * α_i))
@@ -1,11 +1,205 @@
+from collections import Counter
 from collections import defaultdict
+from collections import deque
+import json
+import logging
+import os
+import threading
 from typing import List, Union
 
+import numpy as np
 import torch as th
 import syft as sy
 from syft.exceptions import EmptyCryptoPrimitiveStoreError
 from syft.workers.abstract import AbstractWorker
 
+logger = logging.getLogger(__name__)
+
+# Number of seconds a store waits for the primitives of a refill before giving up
+REFILL_TIMEOUT = 60
+
+
+class PrimitiveStack:
+    """
+    Stock of the instances of one type of crypto primitive.
+
+    The primitives are kept in the chunks they were received in, in a queue:
+    appending a chunk doesn't copy the stock, and a chunk is dropped, releasing
+    its memory, as soon as all its instances are consumed.
+    """
+
+    def __init__(self):
+        self._chunks = deque()
+        # Number of instances already consumed in the first chunk
+        self._offset = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, component):
+        """Returns all the available instances of a component of the primitive."""
+        if self._length == 0:
+            raise IndexError("No primitives available")
+        return self.take(self._length, remove=False)[component]
+
+    def append(self, primitives):
+        """Adds a chunk of primitives, each component having the instances on its
+        last dimension."""
+        n_instances = primitives[0].shape[-1]
+        if n_instances > 0:
+            self._chunks.append(list(primitives))
+            self._length += n_instances
+
+    def take(self, n_instances, remove=True):
+        """
+        Returns the components of the n_instances first primitives.
+
+        Only the instances spanning several chunks are copied.
+        """
+        pieces = []
+        offset, missing = self._offset, n_instances
+        for chunk in self._chunks:
+            if missing == 0:
+                break
+            length = min(chunk[0].shape[-1] - offset, missing)
+            pieces.append([th.narrow(component, -1, offset, length) for component in chunk])
+            offset, missing = 0, missing - length
+
+        if len(pieces) == 1:
+            keys = pieces[0]
+        else:
+            keys = [th.cat(components, dim=-1) for components in zip(*pieces)]
+
+        if remove:
+            self._consume(n_instances)
+
+        return keys
+
+    def _consume(self, n_instances):
+        self._length -= n_instances
+        while n_instances > 0:
+            available = self._chunks[0][0].shape[-1] - self._offset
+            if n_instances >= available:
+                self._chunks.popleft()
+                self._offset = 0
+                n_instances -= available
+            else:
+                self._offset += n_instances
+                n_instances = 0
+
+
+class RefillPolicy:
+    """
+    Describes how the primitives of a given type are refilled: when a store drops
+    below low_water_mark instances, the crypto_provider is asked to provide
+    refill_size instances to all the workers, in chunks of chunk_size instances.
+    """
+
+    def __init__(
+        self,
+        crypto_provider: str,
+        worker_ids: List[str],
+        low_water_mark: int,
+        refill_size: int,
+        chunk_size: int = None,
+        background: bool = True,
+    ):
+        self.crypto_provider = crypto_provider
+        self.worker_ids = worker_ids
+        self.low_water_mark = low_water_mark
+        self.refill_size = refill_size
+        self.chunk_size = chunk_size
+        self.background = background
+
+
+def triple_signature(op: str, a_size, b_size, field: int) -> tuple:
+    """The signature of the beaver triples used to compute op(a, b)."""
+    return op, tuple(int(d) for d in a_size), tuple(int(d) for d in b_size), int(field)
+
+
+class MemmapPrimitiveStack:
+    """
+    Stock of the shares of beaver triples of one signature, persisted in a memory-mapped
+    file with one triple per row, so that large pools don't live in memory and survive
+    restarts. It is used like a PrimitiveStack.
+
+    Args:
+        path: path of the file without extension, a .json file holds the metadata
+        signature: the signature of the triples
+    """
+
+    def __init__(self, path: str, signature: tuple):
+        self.path = path
+        self.signature = signature
+        self.shapes = None
+        self.dtype = None
+        self._n_rows = 0
+        self._consumed = 0
+
+        if os.path.exists(f"{path}.json"):
+            with open(f"{path}.json") as f:
+                metadata = json.load(f)
+            self.shapes = [tuple(shape) for shape in metadata["shapes"]]
+            self.dtype = metadata["dtype"]
+            self._n_rows = metadata["n_rows"]
+            self._consumed = metadata["consumed"]
+
+    def __len__(self):
+        return self._n_rows - self._consumed
+
+    def _save_metadata(self):
+        metadata = {
+            "signature": self.signature,
+            "shapes": self.shapes,
+            "dtype": self.dtype,
+            "n_rows": self._n_rows,
+            "consumed": self._consumed,
+        }
+        with open(f"{self.path}.json", "w") as f:
+            json.dump(metadata, f)
+
+    def append(self, primitives):
+        """Appends triples whose components have the instances on their last dimension."""
+        n_instances = primitives[0].shape[-1]
+        if n_instances == 0:
+            return
+        if self.shapes is None:
+            self.shapes = [tuple(component.shape[:-1]) for component in primitives]
+            self.dtype = str(primitives[0].numpy().dtype)
+
+        rows = np.concatenate(
+            [component.reshape(-1, n_instances).t().numpy() for component in primitives], axis=1
+        )
+        with open(f"{self.path}.bin", "ab") as f:
+            rows.astype(self.dtype).tofile(f)
+        self._n_rows += n_instances
+        self._save_metadata()
+
+    def take(self, n_instances, remove=True):
+        """Returns the components of the n_instances first triples, with the instances
+        on the last dimension."""
+        sizes = [int(np.prod(shape)) for shape in self.shapes]
+        rows = np.memmap(
+            f"{self.path}.bin", dtype=self.dtype, mode="r", shape=(self._n_rows, sum(sizes))
+        )
+        rows = th.from_numpy(np.array(rows[self._consumed : self._consumed + n_instances]))
+
+        keys = [
+            component.t().reshape(*shape, n_instances)
+            for component, shape in zip(rows.split(sizes, dim=1), self.shapes)
+        ]
+
+        if remove:
+            self._consumed += n_instances
+            if self._consumed == self._n_rows:
+                # The pool is exhausted, release the disk space
+                os.remove(f"{self.path}.bin")
+                self._n_rows = self._consumed = 0
+            self._save_metadata()
+
+        return keys
+
 
 class PrimitiveStorage:
     """
@@ -16,18 +210,18 @@ class PrimitiveStorage:
     def __init__(self, owner):
         """
         Their are below different kinds of primitives available.
-        Each primitive stack is a fixed length list corresponding to all the
-        components for the primitive. For example, the beaver triple primitive would
-        have 3 components. Each component is a high dimensional tensor whose
-        last dimension is the same and corresponds to the number of instances available
-        for this primitive. That's why get_keys uses a quite complicated dimension
-        selector. This structure helps generating efficiently primitives using
-        tensorized key generation algorithms.
-        """
-        self.fss_eq: list = []
-        self.fss_comp: list = []
-        self.beaver: list = []
-        self.xor_add_couple: list = []  # couple of the same value shared via ^ or + op
+        Each primitive stack holds the components of a primitive, for example the
+        beaver triple primitive would have 3 components. Each component is a high
+        dimensional tensor whose last dimension is the same and corresponds to the
+        number of instances available for this primitive. This structure helps
+        generating efficiently primitives using tensorized key generation algorithms.
+        """
+        self.fss_eq: PrimitiveStack = PrimitiveStack()
+        self.fss_comp: PrimitiveStack = PrimitiveStack()
+        # beaver triples are stored by signature, see triple_signature
+        self.beaver: dict = {}
+        # couple of the same value shared via ^ or + op
+        self.xor_add_couple: PrimitiveStack = PrimitiveStack()
 
         self._owner: AbstractWorker = owner
         self._builders: dict = {
@@ -37,6 +231,20 @@ class PrimitiveStorage:
             "xor_add_couple": self.build_xor_add_couple,
         }
 
+        self._refill_policies: dict = {}
+        self._pending_refills: set = set()
+        # Number of instances of each type announced by a refill and not received yet
+        self._expected_instances: Counter = Counter()
+        # Directory of the memory-mapped beaver triple pools, None to keep them in memory
+        self.triple_directory: str = None
+        # PRZS generators of the groups this worker is a party of, see przs.py
+        self.przs_generators: dict = {}
+        # Used by the workers running a computation: parties of the groups whose
+        # PRZS seeds are set up
+        self.przs_groups: dict = {}
+        # Protects the stacks, which can be refilled from another thread
+        self._lock = threading.Condition()
+
     def get_keys(self, type_op, n_instances=1, remove=True):
         """
         Return FSS keys primitives
@@ -50,31 +258,155 @@ class PrimitiveStorage:
                 needed because we're working on virtual workers and they need to gather
                 a some point and then re-access the keys.
         """
-        primitive_stack = getattr(self, type_op)
-
-        available_instances = len(primitive_stack[0]) if len(primitive_stack) > 0 else -1
-        if available_instances >= n_instances:
-            keys = []
-            # We iterate on the different elements that constitute a given primitive, for
-            # example of the beaver triples, you would have 3 elements.
-            for i, prim in enumerate(primitive_stack):
-                # We're selecting on the last dimension of the tensor because it's simpler for
-                # generating those primitives in crypto protocols
-                # th.narrow(dim, index_start, length)
-                keys.append(th.narrow(prim, -1, 0, n_instances))
-                if remove:
-                    length = prim.shape[-1] - n_instances
-                    primitive_stack[i] = th.narrow(prim, -1, n_instances, length)
-
-            return keys
-        else:
-            raise EmptyCryptoPrimitiveStoreError(self, type_op, available_instances, n_instances)
+        with self._lock:
+            primitive_stack = getattr(self, type_op)
+
+            # If the store is being refilled, wait for the primitives rather than fail
+            self._lock.wait_for(
+                lambda: len(primitive_stack) >= n_instances
+                or self._expected_instances[type_op] <= 0,
+                timeout=REFILL_TIMEOUT,
+            )
+
+            available_instances = len(primitive_stack)
+            if available_instances < n_instances:
+                raise EmptyCryptoPrimitiveStoreError(
+                    self, type_op, available_instances, n_instances
+                )
+
+            # The instances are selected on the last dimension of the tensors because it's
+            # simpler for generating those primitives in crypto protocols
+            keys = primitive_stack.take(n_instances, remove=remove)
+
+        if remove:
+            self._check_low_water_mark(type_op)
+
+        return keys
+
+    def set_refill_policy(
+        self,
+        crypto_type: str,
+        crypto_provider: AbstractWorker,
+        workers: List[AbstractWorker],
+        low_water_mark: int,
+        refill_size: int,
+        chunk_size: int = None,
+        background: bool = True,
+    ):
+        """
+        Refill automatically the primitives of a type when their number drops below
+        low_water_mark, so that the online phase doesn't run out of primitives.
+
+        The primitives of all the workers are refilled together, so the policy should
+        be set on the store of one of the workers only. This store announces each refill
+        to the stores of the other workers, which then wait for the primitives instead
+        of failing when they run out.
+
+        Args:
+            crypto_type: type of primitive (fss_eq, etc)
+            crypto_provider: the worker asked to provide more primitives
+            workers: all the workers using those primitives
+            low_water_mark: the number of instances under which a refill is requested
+            refill_size: how many instances are requested
+            chunk_size: if not None, the crypto provider sends the primitives in chunks
+                of this size
+            background: if True and the crypto provider can pipeline requests, the refill
+                is requested without waiting for the primitives to be sent
+        """
+        self._refill_policies[crypto_type] = RefillPolicy(
+            crypto_provider=crypto_provider.id,
+            worker_ids=[worker.id for worker in workers],
+            low_water_mark=low_water_mark,
+            refill_size=refill_size,
+            chunk_size=chunk_size,
+            background=background,
+        )
+        self._check_low_water_mark(crypto_type)
+
+    def _check_low_water_mark(self, crypto_type):
+        policy = self._refill_policies.get(crypto_type)
+        if policy is None:
+            return
+
+        with self._lock:
+            if crypto_type in self._pending_refills:
+                return
+            if len(getattr(self, crypto_type)) >= policy.low_water_mark:
+                return
+            self._pending_refills.add(crypto_type)
+
+        try:
+            self._announce_refill(crypto_type, policy)
+
+            message = self._owner.create_worker_command_message(
+                "provide_crypto_primitives",
+                None,
+                [crypto_type],
+                policy.worker_ids,
+                n_instances=policy.refill_size,
+                chunk_size=policy.chunk_size,
+            )
+            crypto_provider = self._owner.get_worker(policy.crypto_provider)
+
+            # Workers are not thread-safe, so the request is only left in flight when
+            # the crypto provider pipelines requests on a thread-safe connection
+            future = None
+            if policy.background:
+                bin_message = self._owner._serialize_msg(message, crypto_provider)
+                future = crypto_provider._recv_msg_async(bin_message)
+
+            if future is None:
+                self._owner.send_msg(message, crypto_provider)
+                self._end_refill(crypto_type)
+            else:
+                future.add_done_callback(lambda f: self._end_refill(crypto_type, f.exception()))
+        except Exception as e:
+            self._end_refill(crypto_type, e)
+
+    def _announce_refill(self, crypto_type, policy):
+        """Tells the stores of all the workers how many instances the refill will send them."""
+        workers = []
+        for worker_id in policy.worker_ids:
+            if worker_id == self._owner.id:
+                self.expect_primitives(crypto_type, policy.refill_size)
+            else:
+                workers.append(self._owner.get_worker(worker_id))
+
+        message = self._owner.create_worker_command_message(
+            "expect_crypto_primitives", None, crypto_type, policy.refill_size
+        )
+        self._owner.send_msgs([message] * len(workers), workers)
+
+    def _end_refill(self, crypto_type, error=None):
+        if error is not None:
+            logger.error(
+                "Failed to refill the crypto primitives of type %s", crypto_type, exc_info=error
+            )
+        with self._lock:
+            self._pending_refills.discard(crypto_type)
+            if error is not None:
+                # The other stores stop waiting after REFILL_TIMEOUT
+                self._expected_instances.pop(crypto_type, None)
+            self._lock.notify_all()
+
+    def expect_primitives(self, crypto_type: str, n_instances: int):
+        """
+        Announces that n_instances primitives of a type are being sent to this store, so
+        that get_keys waits for them rather than fails when the store runs out.
+
+        Args:
+            crypto_type: type of primitive (fss_eq, etc)
+            n_instances: how many instances will be received
+        """
+        with self._lock:
+            self._expected_instances[crypto_type] += n_instances
 
     def provide_primitives(
         self,
         crypto_types: Union[str, List[str]],
         workers: List[AbstractWorker],
         n_instances: int = 10,
+        chunk_size: int = None,
         **kwargs,
     ):
         """ Build n_instances of crypto primitives of the different crypto_types given and
@@ -84,25 +416,34 @@ class PrimitiveStorage:
             crypto_types: type of primitive (fss_eq, etc)
             workers: recipients for those primitive
             n_instances: how many of them are needed
+            chunk_size: if not None, the primitives are built and sent in chunks of
+                chunk_size instances, so that the workers can use the first chunks while
+                the next ones are built
             **kwargs: any parameters needs for the primitive builder
         """
         if isinstance(crypto_types, str):
             crypto_types = [crypto_types]
 
-        worker_types_primitives = defaultdict(dict)
-        for crypto_type in crypto_types:
-            builder = self._builders[crypto_type]
+        if chunk_size is None:
+            chunk_size = n_instances
 
-            primitives = builder(n_party=len(workers), n_instances=n_instances, **kwargs)
+        for start in range(0, n_instances, chunk_size):
+            chunk_instances = min(chunk_size, n_instances - start)
 
-            for worker_primitives, worker in zip(primitives, workers):
-                worker_types_primitives[worker][crypto_type] = worker_primitives
+            worker_types_primitives = defaultdict(dict)
+            for crypto_type in crypto_types:
+                builder = self._builders[crypto_type]
 
-        for i, worker in enumerate(workers):
-            worker_message = self._owner.create_worker_command_message(
-                "feed_crypto_primitive_store", None, worker_types_primitives[worker]
-            )
-            self._owner.send_msg(worker_message, worker)
+                primitives = builder(n_party=len(workers), n_instances=chunk_instances, **kwargs)
+
+                for worker_primitives, worker in zip(primitives, workers):
+                    worker_types_primitives[worker][crypto_type] = worker_primitives
+
+            for i, worker in enumerate(workers):
+                worker_message = self._owner.create_worker_command_message(
+                    "feed_crypto_primitive_store", None, worker_types_primitives[worker]
+                )
+                self._owner.send_msg(worker_message, worker)
 
     def add_primitives(self, types_primitives: dict):
         """
@@ -111,20 +452,69 @@ class PrimitiveStorage:
         Args:
             types_primitives: dict {crypto_type: str: primitives: list}
         """
-        for crypto_type, primitives in types_primitives.items():
-            assert hasattr(self, crypto_type), f"Unknown crypto primitives {crypto_type}"
+        with self._lock:
+            for crypto_type, primitives in types_primitives.items():
+                assert hasattr(self, crypto_type), f"Unknown crypto primitives {crypto_type}"
+
+                if crypto_type == "beaver":
+                    for signature, triples in primitives.items():
+                        self._triple_stack(signature).append(triples)
+                else:
+                    getattr(self, crypto_type).append(primitives)
+                    if crypto_type in self._expected_instances:
+                        self._expected_instances[crypto_type] -= primitives[0].shape[-1]
+                        if self._expected_instances[crypto_type] <= 0:
+                            del self._expected_instances[crypto_type]
+
+            self._lock.notify_all()
+
+    def set_triple_directory(self, directory: str):
+        """
+        Store the beaver triples in memory-mapped files in a directory, and load the
+        triple pools already stored there.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self.triple_directory = directory
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith(".json"):
+                    with open(os.path.join(directory, file_name)) as f:
+                        signature = json.load(f)["signature"]
+                    self._triple_stack(triple_signature(*signature))
 
-            current_primitives = getattr(self, crypto_type)
-            if len(current_primitives) == 0:
-                setattr(self, crypto_type, list(primitives))
+    def _triple_stack(self, signature: tuple):
+        signature = triple_signature(*signature)
+        if signature not in self.beaver:
+            if self.triple_directory is None:
+                self.beaver[signature] = PrimitiveStack()
             else:
-                for i, primitive in enumerate(primitives):
-                    if len(current_primitives[i]) == 0:
-                        current_primitives[i] = primitive
-                    else:
-                        current_primitives[i] = th.cat(
-                            (current_primitives[i], primitive), dim=len(primitive.shape) - 1
-                        )
+                op, a_size, b_size, field = signature
+                file_name = "_".join(
+                    [op, "x".join(map(str, a_size)), "x".join(map(str, b_size)), str(field)]
+                )
+                path = os.path.join(self.triple_directory, file_name)
+                self.beaver[signature] = MemmapPrimitiveStack(path, signature)
+        return self.beaver[signature]
+
+    def count_triples(self, signature: tuple) -> int:
+        """Returns the number of beaver triples of the given signature in the store"""
+        with self._lock:
+            return len(self._triple_stack(signature))
+
+    def get_triple(self, signature: tuple):
+        """
+        Pops a beaver triple of the given signature
+
+        Returns:
+            the shares of a, b and c = op(a, b) held by this worker
+        """
+        with self._lock:
+            stack = self._triple_stack(signature)
+            if len(stack) == 0:
+                raise EmptyCryptoPrimitiveStoreError(self, f"beaver {signature}", 0, 1)
+            triple = stack.take(1, remove=True)
+
+        return [component.squeeze(-1) for component in triple]
 
     def build_fss_keys(self, type_op):
         """
@@ -161,5 +551,50 @@ class PrimitiveStorage:
 
         return [(r ^ mask1, r - mask2), (mask1, mask2)]
 
-    def build_triples(self, **kwargs):
-        raise NotImplementedError
+    @staticmethod
+    def build_triples(n_party, n_instances=100, signature=None):
+        """
+        Build beaver triples (a, b, c = op(a, b)) of a given signature
+
+        Args:
+            n_party: number of workers sharing the triples
+            n_instances: number of triples
+            signature: the signature (op, a_size, b_size, field) of the triples, where op
+                is mul or matmul, see triple_signature
+
+        Returns:
+            for each worker, a dict {signature: shares of (a, b, c)}, with the instances
+            on the last dimension
+        """
+        op, a_size, b_size, field = triple_signature(*signature)
+        assert field in (2 ** 32, 2 ** 64), "Triples can only be preprocessed for int or long"
+        torch_dtype = th.int32 if field == 2 ** 32 else th.int64
+        cmd = getattr(th, op)
+
+        def random(size):
+            return th.randint(
+                -(field // 2), (field - 1) // 2, (n_instances, *size), dtype=torch_dtype
+            )
+
+        a, b = random(a_size), random(b_size)
+        if op == "matmul" and min(len(a_size), len(b_size)) < 2:
+            c = th.stack([cmd(a_i, b_i) for a_i, b_i in zip(a, b)])
+        else:
+            # Align the dimensions of a and b after the dimension of the instances
+            n_dim = max(len(a_size), len(b_size))
+            c = cmd(
+                a.view(n_instances, *[1] * (n_dim - len(a_size)), *a_size),
+                b.view(n_instances, *[1] * (n_dim - len(b_size)), *b_size),
+            )
+
+        workers_shares = [[] for _ in range(n_party)]
+        for component in (a, b, c):
+            # Put the instances on the last dimension
+            size = component.shape[1:]
+            shares = [random(size) for _ in range(n_party - 1)]
+            shares.append(component - sum(shares))
+            shares = [share.permute(*range(1, share.dim()), 0).contiguous() for share in shares]
+            for worker_shares, share in zip(workers_shares, shares):
+                worker_shares.append(share)
+
+        return [{(op, a_size, b_size, field): shares} for shares in workers_shares]
@@ -0,0 +1,172 @@
+"""
+Pseudo-random zero sharing (PRZS)
+
+Each party of a group draws a PRG seed once and gives it to the previous party
+of the group. A party then derives locally its share of zero as the difference
+between the values generated with its own seed and with the seed of the next
+party: the sum of the shares telescopes to zero, and no party, nor the worker
+running the computation, can compute the share of another party.
+
+Secrets are shared with the same idea: all the shares but the first one are
+generated by the parties from a fresh seed, so that only one masked tensor is
+sent over the network.
+"""
+import secrets
+from typing import List
+
+import torch
+
+import syft as sy
+from syft.workers.abstract import AbstractWorker
+
+SEED_BITS = 63
+
+
+def _new_seed() -> int:
+    return secrets.randbits(SEED_BITS)
+
+
+def _generator(seed: int) -> torch.Generator:
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+    return generator
+
+
+def _ring(field: int, dtype: str):
+    """Returns an empty AdditiveSharingTensor providing the bounds, the torch
+    dtype and the modulo of the ring of the shares."""
+    return sy.AdditiveSharingTensor(field=field, dtype=dtype)
+
+
+def _random(shape, generator: torch.Generator, ring) -> torch.Tensor:
+    return torch.empty(shape, dtype=ring.torch_dtype).random_(
+        ring.min_value, ring.max_value, generator=generator
+    )
+
+
+def _pointer(location: AbstractWorker, id_at_location, shape, owner: AbstractWorker):
+    return sy.PointerTensor(
+        location=location,
+        id_at_location=id_at_location,
+        owner=owner,
+        id=sy.ID_PROVIDER.pop(),
+        shape=torch.Size(shape),
+    )
+
+
+def _run_on(worker: AbstractWorker, locations: List[AbstractWorker], command: str, args_list):
+    """Runs a worker command on each location in a single round, the worker
+    itself being called directly if it is one of the locations."""
+    messages, remote_locations = [], []
+    for location, args in zip(locations, args_list):
+        if location == worker:
+            getattr(worker, command)(*args)
+        else:
+            messages.append(worker.create_worker_command_message(command, None, *args))
+            remote_locations.append(location)
+    worker.send_msgs(messages, remote_locations)
+
+
+def setup(worker: AbstractWorker, *locations: AbstractWorker):
+    """Makes the locations agree on the PRZS seeds of their group, unless
+    they already did.
+
+    Args:
+        worker: the worker running the computation
+        *locations: the parties of the group, in the order of the shares
+    """
+    group = tuple(location.id for location in locations)
+    known_locations = worker.crypto_store.przs_groups.get(group, ())
+    if len(known_locations) == len(locations) and all(
+        known is location for known, location in zip(known_locations, locations)
+    ):
+        return
+
+    args_list = [(group, locations[i - 1].id) for i in range(len(locations))]
+    _run_on(worker, locations, "przs_setup", args_list)
+    worker.crypto_store.przs_groups[group] = locations
+
+
+def shares_of_zero(
+    worker: AbstractWorker, shape, field: int, dtype: str, crypto_provider, *locations
+):
+    """Builds an AdditiveSharingTensor of value zero whose shares are generated
+    locally by the locations.
+
+    Returns:
+        the AdditiveSharingTensor of zeros, owned by worker
+    """
+    setup(worker, *locations)
+    group = tuple(location.id for location in locations)
+    shape = tuple(shape)
+    ids = [sy.ID_PROVIDER.pop() for _ in locations]
+    args_list = [(group, shape, field, dtype, id_at_location) for id_at_location in ids]
+    _run_on(worker, locations, "przs_zero_share", args_list)
+
+    shares = {
+        location.id: _pointer(location, id_at_location, shape, worker)
+        for location, id_at_location in zip(locations, ids)
+    }
+    return sy.AdditiveSharingTensor(
+        shares, owner=worker, field=field, dtype=dtype, crypto_provider=crypto_provider
+    )
+
+
+def share_secret(worker: AbstractWorker, secret: torch.Tensor, field: int, dtype: str, *locations):
+    """Shares a secret among the locations: the locations but the first one
+    generate their share from a fresh seed, and the first one is sent the secret
+    masked with these shares.
+
+    Returns:
+        the dict of the pointers to the shares
+    """
+    locations = [worker.get_worker(location) for location in locations]
+    ring = _ring(field, dtype)
+    shape = tuple(secret.shape)
+    seeds = [_new_seed() for _ in locations[1:]]
+    ids = [sy.ID_PROVIDER.pop() for _ in locations[1:]]
+
+    masked_secret = secret
+    for seed in seeds:
+        masked_secret = masked_secret - _random(shape, _generator(seed), ring)
+    masked_secret = ring.modulo(masked_secret)
+
+    args_list = [
+        (seed, shape, field, dtype, id_at_location) for seed, id_at_location in zip(seeds, ids)
+    ]
+    _run_on(worker, locations[1:], "przs_random_share", args_list)
+
+    shares = {locations[0].id: masked_secret.send(locations[0], no_wrap=True)}
+    for location, id_at_location in zip(locations[1:], ids):
+        shares[location.id] = _pointer(location, id_at_location, shape, worker)
+    return shares
+
+
+# Commands run by the parties
+
+
+def setup_seeds(worker: AbstractWorker, group: tuple, prev_id):
+    """Draws the seed of worker for the group and gives it to the previous party."""
+    seed = _new_seed()
+    worker.crypto_store.przs_generators.setdefault(group, {})["own"] = _generator(seed)
+    if prev_id == worker.id:
+        set_next_seed(worker, group, seed)
+    else:
+        message = worker.create_worker_command_message("przs_set_next_seed", None, group, seed)
+        worker.send_msg(message, worker.get_worker(prev_id))
+
+
+def set_next_seed(worker: AbstractWorker, group: tuple, seed: int):
+    worker.crypto_store.przs_generators.setdefault(group, {})["next"] = _generator(seed)
+
+
+def zero_share(worker: AbstractWorker, group: tuple, shape: tuple, field: int, dtype: str):
+    generators = worker.crypto_store.przs_generators[group]
+    ring = _ring(field, dtype)
+    own = _random(shape, generators["own"], ring)
+    next_ = _random(shape, generators["next"], ring)
+    return ring.modulo(own - next_)
+
+
+def random_share(seed: int, shape: tuple, field: int, dtype: str):
+    return _random(shape, _generator(seed), _ring(field, dtype))
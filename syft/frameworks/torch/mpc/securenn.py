@@ -10,6 +10,7 @@ negative numbers while they are always positive in the paper
 import math
 import torch
 import syft as sy
+from syft.frameworks.torch.mpc import przs
 from syft.generic.utils import memorize
 
 # p is introduced in the SecureNN paper https://eprint.iacr.org/2018/442.pdf
@@ -119,19 +120,11 @@ def _random_common_value(max_value, *workers):
 
 def _shares_of_zero(size, field, dtype, crypto_provider, *workers):
     """
-    Return shares of zeros generated by a worker and sent to all workers,
-    in the form of a MultiPointerTensor
+    Return shares of zeros generated locally by the workers from their PRZS seeds,
+    in the form of an AdditiveSharingTensor of the given size, an int or a shape
     """
-    torch_dtype = get_torch_dtype(field)
-    u = (
-        torch.zeros(size, dtype=torch_dtype)
-        .send(workers[0])
-        .share(*workers, field=field, dtype=dtype, crypto_provider=crypto_provider, **no_wrap)
-        .get()
-        .child
-    )
-
-    return u
+    shape = tuple(size) if isinstance(size, (tuple, torch.Size)) else (size,)
+    return przs.shares_of_zero(sy.local_worker, shape, field, dtype, crypto_provider, *workers)
 
 
 def select_share(alpha_sh, x_sh, y_sh):
@@ -212,17 +205,17 @@ def private_compare(x_bit_sh, r, beta, L):
 
     # if beta == 0
     # 5)
-    w = x_bit_sh + (j * r_bit) - (2 * r_bit * x_bit_sh)
+    w = x_bit_sh.add_public(r_bit) - (2 * r_bit * x_bit_sh)
     # 6)
     wc = w.flip(-1).cumsum(-1).flip(-1) - w
-    c_beta0 = -x_bit_sh + (j * r_bit) + j + wc
+    c_beta0 = (-x_bit_sh + wc).add_public(r_bit + 1)
 
     # elif beta == 1 AND r != 2^l- 1
     # 8)
-    w = x_bit_sh + (j * t_bit) - (2 * t_bit * x_bit_sh)
+    w = x_bit_sh.add_public(t_bit) - (2 * t_bit * x_bit_sh)
     # 9)
     wc = w.flip(-1).cumsum(-1).flip(-1) - w
-    c_beta1 = x_bit_sh + (-j * t_bit) + j + wc
+    c_beta1 = (x_bit_sh + wc).add_public(-t_bit + 1)
 
     # else
     # 11)
@@ -322,13 +315,10 @@ def msb(a_sh):
     )
 
     # 7)
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
-    )
-    gamma = beta_prime_sh + (j * beta) - (2 * beta * beta_prime_sh)
+    gamma = beta_prime_sh.add_public(beta) - (2 * beta * beta_prime_sh)
 
     # 8)
-    delta = x_bit_sh_0 + (j * r_0) - (2 * r_0 * x_bit_sh_0)
+    delta = x_bit_sh_0.add_public(r_0) - (2 * r_0 * x_bit_sh_0)
 
     # 9)
     theta = gamma * delta
@@ -508,10 +498,7 @@ def relu_deriv(a_sh):
     alpha_sh = msb(y_sh)
 
     # 4)
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
-    )
-    gamma_sh = j - alpha_sh + u
+    gamma_sh = (u - alpha_sh).add_public(1)
     return gamma_sh
 
 
@@ -600,12 +587,19 @@ def division(x_sh, y_sh, bit_len_max=None):
         return q
 
 
-def maxpool(x_sh):
+def maxpool(x_sh, dim=None):
     """ Compute MaxPool: returns fresh shares of the max value in the input tensor
     and the index of this value in the flattened tensor
 
+    The values are compared pairwise in a tournament, with one vectorized
+    comparison per level, so the number of rounds is logarithmic in the number
+    of values. Neighbouring candidates are compared and the later one wins a
+    tie, so the index of the last maximum is returned.
+
     Args:
         x_sh (AdditiveSharingTensor): the private tensor on which the op applies
+        dim (None or int): if not None, the dimension to reduce, the index is then
+            the index along this dimension
 
     Returns:
         maximum value as an AdditiveSharingTensor
@@ -622,37 +616,54 @@ def maxpool(x_sh):
     L = x_sh.field
     dtype = get_dtype(L)
 
-    x_sh = x_sh.contiguous().view(-1)
+    if dim is None:
+        x_sh = x_sh.contiguous().view(-1)
+    else:
+        n_dim = len(x_sh.shape)
+        dim = dim % n_dim
+        # Move the dimension to reduce first
+        x_sh = x_sh.permute(dim, *(d for d in range(n_dim) if d != dim)).contiguous()
 
-    # Common Randomness
-    u_sh = _shares_of_zero(1, L, dtype, crypto_provider, *workers)
-    v_sh = _shares_of_zero(1, L, dtype, crypto_provider, *workers)
+    # Common Randomness, one mask per reduced value
+    mask_shape = x_sh.shape[1:] if len(x_sh.shape) > 1 else 1
+    u_sh = _shares_of_zero(mask_shape, L, dtype, crypto_provider, *workers)
+    v_sh = _shares_of_zero(mask_shape, L, dtype, crypto_provider, *workers)
 
     # 1)
-    max_sh = x_sh[0]
-    ind_sh = torch.tensor([0]).share(
-        *workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap
-    )  # I did not manage to create an AST with 0 and 0 as shares
+    n_values = x_sh.shape[0]
+    max_sh = x_sh
+    ind_sh = (
+        torch.arange(n_values)
+        .view((n_values,) + (1,) * (len(x_sh.shape) - 1))
+        .repeat(1, *x_sh.shape[1:])
+        .share(*workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap)
+    )
+
+    while max_sh.shape[0] > 1:
+        # 2) Compare each candidate of even index with the next one
+        half = max_sh.shape[0] // 2
+        a_sh, b_sh = max_sh[0 : 2 * half : 2], max_sh[1 : 2 * half : 2]
 
-    for i in range(1, len(x_sh)):
         # 3)
-        w_sh = x_sh[i] - max_sh
+        w_sh = b_sh - a_sh
 
         # 4)
         beta_sh = relu_deriv(w_sh)
 
         # 5)
-        max_sh = select_share(beta_sh, max_sh, x_sh[i])
+        next_max_sh = select_share(beta_sh, a_sh, b_sh)
 
-        # 6)
-        k = torch.tensor([i]).share(
-            *workers, field=L, dtype=dtype, crypto_provider=crypto_provider, **no_wrap
-        )  # I did not manage to create an AST with 0 and i as shares
+        # 6), 7)
+        next_ind_sh = select_share(beta_sh, ind_sh[0 : 2 * half : 2], ind_sh[1 : 2 * half : 2])
 
-        # 7)
-        ind_sh = select_share(beta_sh, ind_sh, k)
+        # With an odd number of candidates, the last one goes to the next level
+        if max_sh.shape[0] % 2 == 1:
+            next_max_sh = torch.cat([next_max_sh, max_sh[2 * half :]])
+            next_ind_sh = torch.cat([next_ind_sh, ind_sh[2 * half :]])
+
+        max_sh, ind_sh = next_max_sh, next_ind_sh
 
-    return max_sh + u_sh, ind_sh + v_sh
+    return max_sh.squeeze(0) + u_sh, ind_sh.squeeze(0) + v_sh
 
 
 def maxpool_deriv(x_sh):
@@ -689,10 +700,7 @@ def maxpool_deriv(x_sh):
     _, ind_max_sh = maxpool(x_sh)
 
     # 2)
-    j = sy.MultiPointerTensor(
-        children=[torch.tensor([int(i == 0)]).send(w, **no_wrap) for i, w in enumerate(workers)]
-    )
-    k_sh = ind_max_sh + j * r
+    k_sh = ind_max_sh.add_public(r)
 
     # 3)
     t = k_sh.get()
@@ -750,18 +758,22 @@ def maxpool2d(a_sh, kernel_size: int = 1, stride: int = 1, padding: int = 0):
         nb_rows_in += 2 * padding[0]
         nb_cols_in += 2 * padding[1]
 
-    res = []
-    # TODO: make this operation more efficient in order to be used with cnn modules.
-    for batch in range(batch_size):
-        for channel in range(nb_channels):
-            for r_in in range(0, nb_rows_in - (kernel[0] - 1), stride[0]):
-                for c_in in range(0, nb_cols_in - (kernel[1] - 1), stride[1]):
-                    m, _ = maxpool(
-                        a_sh[
-                            batch, channel, r_in : r_in + kernel[0], c_in : c_in + kernel[1],
-                        ].child
-                    )
-                    res.append(m.wrap())
-
-    res = torch.stack(res).reshape(batch_size, nb_channels, nb_rows_out, nb_cols_out)
+    # Gather all the windows in one tensor to compare them all at once
+    a_sh = a_sh.contiguous()
+    windows = a_sh.as_strided(
+        size=(batch_size, nb_channels, nb_rows_out, nb_cols_out, kernel[0], kernel[1]),
+        stride=(
+            nb_channels * nb_rows_in * nb_cols_in,
+            nb_rows_in * nb_cols_in,
+            stride[0] * nb_cols_in,
+            stride[1],
+            nb_cols_in,
+            1,
+        ),
+    )
+    windows = windows.reshape(-1, kernel[0] * kernel[1])
+
+    m, _ = maxpool(windows.child, dim=1)
+
+    res = m.wrap().reshape(batch_size, nb_channels, nb_rows_out, nb_cols_out)
     return res
@@ -1,13 +1,12 @@
 from typing import Callable
+from typing import List
 
 import torch
 
 import syft as sy
-from syft.frameworks.torch.mpc.beaver import request_triple
+from syft.frameworks.torch.mpc.beaver import get_triple
 from syft.workers.abstract import AbstractWorker
 
-no_wrap = {"no_wrap": True}
-
 
 def spdz_mul(cmd: Callable, x_sh, y_sh, crypto_provider: AbstractWorker, field: int, dtype: str):
     """Abstractly multiplies two tensors (mul or matmul)
@@ -23,35 +22,259 @@ def spdz_mul(cmd: Callable, x_sh, y_sh, crypto_provider: AbstractWorker, field:
     Return:
         an AdditiveSharingTensor
     """
-    assert isinstance(x_sh, sy.AdditiveSharingTensor)
-    assert isinstance(y_sh, sy.AdditiveSharingTensor)
+    return spdz_mul_many([cmd], [x_sh], [y_sh], crypto_provider, field, dtype)[0]
+
+
+def spdz_mul_many(
+    cmds: List[Callable],
+    x_shs: list,
+    y_shs: list,
+    crypto_provider: AbstractWorker,
+    field: int,
+    dtype: str,
+):
+    """Abstractly multiplies several independent couples of tensors, opening
+    the maskings of all the multiplications together.
+
+    Args:
+        cmds: the callable of the equation to be computed (mul or matmul) of each couple
+        x_shs (list of AdditiveSharingTensor): the left parts of the operations
+        y_shs (list of AdditiveSharingTensor): the right parts of the operations
+        crypto_provider (AbstractWorker): an AbstractWorker which is used to generate triples
+        field (int): an integer denoting the size of the field
+        dtype (str): denotes the dtype of shares
 
-    locations = x_sh.locations
-    torch_dtype = x_sh.torch_dtype
+    Return:
+        the list of the resulting AdditiveSharingTensors
+    """
+    locations = x_shs[0].locations
+    torch_dtype = x_shs[0].torch_dtype
+    for x_sh, y_sh in zip(x_shs, y_shs):
+        assert isinstance(x_sh, sy.AdditiveSharingTensor)
+        assert isinstance(y_sh, sy.AdditiveSharingTensor)
+        assert x_sh.locations == y_sh.locations == locations
 
     # Get triples
-    a, b, a_mul_b = request_triple(
-        crypto_provider, cmd, field, dtype, x_sh.shape, y_sh.shape, locations
+    triples = [
+        get_triple(crypto_provider, cmd, field, dtype, x_sh.shape, y_sh.shape, locations)
+        for cmd, x_sh, y_sh in zip(cmds, x_shs, y_shs)
+    ]
+
+    maskings = []
+    for (a, b, _), x_sh, y_sh in zip(triples, x_shs, y_shs):
+        maskings += [x_sh - a, y_sh - b]
+    # Reconstruct all the deltas and epsilons and send them to all workers
+    opened = reconstruct_many(maskings)
+
+    results = []
+    for i, (cmd, (a, b, a_mul_b)) in enumerate(zip(cmds, triples)):
+        delta, epsilon = opened[2 * i], opened[2 * i + 1]
+        delta_epsilon = cmd(delta, epsilon)
+
+        delta_b = cmd(delta, b)
+        a_epsilon = cmd(a, epsilon)
+        # delta_epsilon is public, it is added to the share of the first location only
+        res = (delta_b + a_epsilon + a_mul_b).add_public(delta_epsilon)
+        res = res.type(torch_dtype)
+        results.append(res)
+
+    return results
+
+
+def reconstruct_many(x_shs: list) -> list:
+    """Reconstructs several AdditiveSharingTensors sharing the same locations
+    with a single payload per worker in each direction: the workers send all
+    their shares to the first worker in one tensor, which opens them all and
+    sends back all the opened values in one tensor.
+
+    Args:
+        x_shs (list of AdditiveSharingTensor): the tensors to reconstruct
+
+    Returns:
+        For each tensor, a MultiPointerTensor where all workers hold the
+        reconstructed value
+    """
+    me = x_shs[0].owner
+    locations = x_shs[0].locations
+    opener, others = locations[0], locations[1:]
+    shapes = [tuple(x_sh.shape) for x_sh in x_shs]
+    share_ids = {
+        location.id: [x_sh.child[location.id].id_at_location for x_sh in x_shs]
+        for location in locations
+    }
+    payload_ids = [sy.ID_PROVIDER.pop() for _ in others]
+    return_ids = [sy.ID_PROVIDER.pop() for _ in x_shs]
+
+    messages = [
+        me.create_worker_command_message(
+            "spdz_send_shares", None, share_ids[location.id], opener.id, payload_id
+        )
+        for location, payload_id in zip(others, payload_ids)
+    ]
+    me.send_msgs(messages, others)
+
+    message = me.create_worker_command_message(
+        "spdz_open_shares",
+        None,
+        share_ids[opener.id],
+        payload_ids,
+        shapes,
+        x_shs[0].field,
+        x_shs[0].dtype,
+        return_ids,
+        [location.id for location in others],
     )
+    me.send_msg(message, opener)
+
+    return [
+        sy.MultiPointerTensor(
+            children=[
+                sy.PointerTensor(
+                    location=location,
+                    id_at_location=return_id,
+                    owner=me,
+                    id=sy.ID_PROVIDER.pop(),
+                    shape=torch.Size(shape),
+                )
+                for location in locations
+            ]
+        )
+        for return_id, shape in zip(return_ids, shapes)
+    ]
+
+
+class MultiplicationQueue:
+    """Queues independent multiplications to run them together, the maskings
+    of all the queued multiplications being opened in a single exchange.
+
+    Multiplications of additive shared tensors, optionally in fixed precision,
+    are queued. The others are computed right away.
+
+    Example:
+        >>> products = MultiplicationQueue()
+        >>> products.mul(forgetgate, c)
+        >>> products.mul(inputgate, cellgate)
+        >>> forget_c, input_cell = products.flush()
+    """
+
+    def __init__(self):
+        self._results = []
+        self._pending = []
+
+    def mul(self, x, y):
+        self._queue(torch.mul, x, y)
+
+    def matmul(self, x, y):
+        self._queue(torch.matmul, x, y)
+
+    def _queue(self, cmd, x, y):
+        x_sh, x_fpt = _unwrap_shared(x)
+        y_sh, y_fpt = _unwrap_shared(y)
+        if (
+            x_sh is None
+            or y_sh is None
+            or x_sh.crypto_provider is None
+            or x_sh.locations != y_sh.locations
+            or (x_fpt is None) != (y_fpt is None)
+            or (x_fpt is not None and x_fpt.get_class_attributes() != y_fpt.get_class_attributes())
+        ):
+            self._results.append(cmd(x, y))
+        else:
+            self._pending.append((len(self._results), cmd, x_sh, y_sh, x_fpt))
+            self._results.append(None)
+
+    def flush(self) -> list:
+        """Runs the queued multiplications and returns the results of all the
+        multiplications since the last flush, in order."""
+        groups = {}
+        for pending in self._pending:
+            _, _, x_sh, _, _ = pending
+            key = (
+                x_sh.crypto_provider,
+                x_sh.field,
+                x_sh.dtype,
+                tuple(location.id for location in x_sh.locations),
+            )
+            groups.setdefault(key, []).append(pending)
+
+        for (crypto_provider, field, dtype, *_), group in groups.items():
+            _, cmds, x_shs, y_shs, _ = zip(*group)
+            products = spdz_mul_many(cmds, x_shs, y_shs, crypto_provider, field, dtype)
+            for (i, _, _, _, fpt), product in zip(group, products):
+                if fpt is None:
+                    self._results[i] = product.wrap()
+                else:
+                    # Same rescaling as FixedPrecisionTensor.mul_and_div
+                    result = sy.FixedPrecisionTensor(**fpt.get_class_attributes()).on(
+                        product, wrap=False
+                    )
+                    result = result.truncate(fpt.precision_fractional, check_sign=False)
+                    self._results[i] = result.wrap()
+
+        results, self._results, self._pending = self._results, [], []
+        return results
+
+
+def _unwrap_shared(x):
+    """Returns the AdditiveSharingTensor of a wrapper of an AdditiveSharingTensor
+    or of a FixedPrecisionTensor>AdditiveSharingTensor, and the FixedPrecisionTensor.
+    """
+    child = getattr(x, "child", None)
+    if isinstance(child, sy.AdditiveSharingTensor):
+        return child, None
+    if isinstance(child, sy.FixedPrecisionTensor) and isinstance(
+        child.child, sy.AdditiveSharingTensor
+    ):
+        return child.child, child
+    return None, None
+
+
+# Commands run by the workers holding the shares
+
+
+def send_shares(worker: AbstractWorker, share_ids: list, opener_id, payload_id):
+    """Sends the shares of worker to the opener, in a single tensor."""
+    shares = [worker.get_obj(share_id).reshape(-1) for share_id in share_ids]
+    if len({share.dtype for share in shares}) > 1:
+        # e.g. int and long shares are multiplied together in SecureNN's msb, the
+        # opener casts each share back to the dtype of its own share
+        shares = [share.long() for share in shares]
+    payload = torch.cat(shares)
+    payload.id = payload_id
+    worker.send_obj(payload, worker.get_worker(opener_id))
+
+
+def open_shares(
+    worker: AbstractWorker,
+    share_ids: list,
+    payload_ids: list,
+    shapes: list,
+    field: int,
+    dtype: str,
+    return_ids: list,
+    location_ids: list,
+):
+    """Sums the shares of the opener and the payloads received from the other
+    workers, and sends the opened values back to them in a single message."""
+    opened = [worker.get_obj(share_id).reshape(-1) for share_id in share_ids]
+    sizes = [value.numel() for value in opened]
+    for payload_id in payload_ids:
+        shares = worker.get_obj(payload_id).split(sizes)
+        # the shares of a tensor have the same dtype on all the workers
+        opened = [value + share.type(value.dtype) for value, share in zip(opened, shares)]
+        worker.object_store.rm_obj(payload_id)
+    modulo = sy.AdditiveSharingTensor(field=field, dtype=dtype).modulo
+    opened = [modulo(value) for value in opened]
+
+    for location_id in location_ids:
+        message = worker.create_worker_command_message(
+            "spdz_register_opened", None, opened, shapes, return_ids
+        )
+        worker.send_msg(message, worker.get_worker(location_id))
+    register_opened(worker, opened, shapes, return_ids)
+
 
-    delta = x_sh - a
-    epsilon = y_sh - b
-    # Reconstruct and send to all workers
-    delta = delta.reconstruct()
-    epsilon = epsilon.reconstruct()
-
-    delta_epsilon = cmd(delta, epsilon)
-
-    # Trick to keep only one child in the MultiPointerTensor (like in SNN)
-    j1 = torch.ones(delta_epsilon.shape).type(torch_dtype).send(locations[0], **no_wrap)
-    j0 = torch.zeros(delta_epsilon.shape).type(torch_dtype).send(*locations[1:], **no_wrap)
-    if len(locations) == 2:
-        j = sy.MultiPointerTensor(children=[j1, j0])
-    else:
-        j = sy.MultiPointerTensor(children=[j1] + list(j0.child.values()))
-
-    delta_b = cmd(delta, b)
-    a_epsilon = cmd(a, epsilon)
-    res = delta_epsilon * j + delta_b + a_epsilon + a_mul_b
-    res = res.type(torch_dtype)
-    return res
+def register_opened(worker: AbstractWorker, opened: list, shapes: list, return_ids: list):
+    """Registers the opened values under return_ids."""
+    for value, shape, return_id in zip(opened, shapes, return_ids):
+        worker.register_obj(value.reshape(shape).clone(), obj_id=return_id)
@@ -1,5 +1,7 @@
 import torch
 
+from syft.generic.utils import memorize
+
 
 def linear(*args):
     """
@@ -90,31 +92,22 @@ def conv2d(input, weight, bias=None, stride=1, padding=0, dilation=1, groups=1):
         nb_rows_in += 2 * padding[0]
         nb_cols_in += 2 * padding[1]
 
-    # We want to get relative positions of values in the input tensor that are used
-    # by one filter convolution.
-    # It basically is the position of the values used for the top left convolution.
-    pattern_ind = []
-    for ch in range(nb_channels_in):
-        for r in range(nb_rows_kernel):
-            for c in range(nb_cols_kernel):
-                pixel = r * nb_cols_in * dilation[0] + c * dilation[1]
-                pattern_ind.append(pixel + ch * nb_rows_in * nb_cols_in)
-
     # The image tensor is reshaped for the matrix multiplication:
     # on each row of the new tensor will be the input values used for each filter convolution
     # We will get a matrix [[in values to compute out value 0],
     #                       [in values to compute out value 1],
     #                       ...
     #                       [in values to compute out value nb_rows_out*nb_cols_out]]
-    im_flat = input.view(batch_size, -1)
-    im_reshaped = []
-    for cur_row_out in range(nb_rows_out):
-        for cur_col_out in range(nb_cols_out):
-            # For each new output value, we just need to shift the receptive field
-            offset = cur_row_out * stride[0] * nb_cols_in + cur_col_out * stride[1]
-            tmp = [ind + offset for ind in pattern_ind]
-            im_reshaped.append(im_flat[:, tmp])
-    im_reshaped = torch.stack(im_reshaped).permute(1, 0, 2)
+    # All the values are gathered at once, which is a single command on each share
+    # when the input is shared
+    indices = _unfold_indices(
+        (nb_channels_in, nb_rows_in, nb_cols_in),
+        (nb_rows_kernel, nb_cols_kernel),
+        stride,
+        padding,
+        dilation,
+    )
+    im_reshaped = input[(slice(None),) + indices].view(batch_size, nb_rows_out * nb_cols_out, -1)
 
     # The convolution kernels are also reshaped for the matrix multiplication
     # We will get a matrix [[weights for out channel 0],
@@ -153,54 +146,70 @@ def conv2d(input, weight, bias=None, stride=1, padding=0, dilation=1, groups=1):
     return res
 
 
+@memorize
+def _unfold_indices(input_shape, kernel_size, stride, padding, dilation):
+    """Builds the indices gathering the receptive field of each output value of a
+    convolution from the padded input, ordered by channel, kernel row and kernel column.
+
+    The indices broadcast to the shape (nb_rows_out, nb_cols_out, nb_channels_in,
+    nb_rows_kernel, nb_cols_kernel), so that they stay small. They are cached for
+    each convolution geometry.
+
+    Args:
+        input_shape: the shape (channels, rows, cols) of the input, after padding
+        kernel_size, stride, padding, dilation: the parameters of the convolution
+
+    Returns:
+        the channel, row and column indices, as nested lists
+    """
+    nb_channels_in, nb_rows_in, nb_cols_in = input_shape
+    nb_rows_kernel, nb_cols_kernel = kernel_size
+    nb_rows_out = (nb_rows_in - dilation[0] * (nb_rows_kernel - 1) - 1) // stride[0] + 1
+    nb_cols_out = (nb_cols_in - dilation[1] * (nb_cols_kernel - 1) - 1) // stride[1] + 1
+
+    # Position of the top left value of the receptive field of each output value
+    rows_out = torch.arange(nb_rows_out).view(-1, 1, 1, 1, 1) * stride[0]
+    cols_out = torch.arange(nb_cols_out).view(1, -1, 1, 1, 1) * stride[1]
+    # Relative position of the values in the receptive field
+    rows_kernel = torch.arange(nb_rows_kernel).view(1, 1, 1, -1, 1) * dilation[0]
+    cols_kernel = torch.arange(nb_cols_kernel).view(1, 1, 1, 1, -1) * dilation[1]
+
+    channels = torch.arange(nb_channels_in).view(1, 1, -1, 1, 1)
+    rows = rows_out + rows_kernel
+    cols = cols_out + cols_kernel
+    return channels.tolist(), rows.tolist(), cols.tolist()
+
+
 def _pool(tensor, kernel_size: int = 2, stride: int = 2, mode="max"):
-    output_shape = (
-        (tensor.shape[0] - kernel_size) // stride + 1,
-        (tensor.shape[1] - kernel_size) // stride + 1,
-    )
-    kernel_size = (kernel_size, kernel_size)
-    b = torch.ones(tensor.shape)  # when torch.Tensor.stride() is supported: replace with A.stride()
-    a_strides = b.stride()
-    a_w = torch.as_strided(
-        tensor,
-        size=output_shape + kernel_size,
-        stride=(stride * a_strides[0], stride * a_strides[1]) + a_strides,
+    """Pools the last two dimensions of a tensor, all the windows of all the
+    leading dimensions at once: the windows are gathered with a single indexing
+    and reduced along one dimension. For max pooling on shared tensors, the
+    windows are compared in parallel, so the number of rounds only depends
+    on the kernel size.
+    """
+    *batch_shape, nb_rows_in, nb_cols_in = tensor.shape
+    nb_rows_out = (nb_rows_in - kernel_size) // stride + 1
+    nb_cols_out = (nb_cols_in - kernel_size) // stride + 1
+
+    indices = _unfold_indices(
+        (1, nb_rows_in, nb_cols_in), (kernel_size, kernel_size), (stride, stride), (0, 0), (1, 1)
     )
-    a_w = a_w.reshape(-1, *kernel_size)
-    result = []
+    windows = tensor.reshape(-1, 1, nb_rows_in, nb_cols_in)[(slice(None),) + indices]
+    windows = windows.reshape(-1, kernel_size * kernel_size)
+
     if mode == "max":
-        for channel in range(a_w.shape[0]):
-            result.append(a_w[channel].max())
+        result = windows.max(dim=1)[0]
     elif mode == "mean":
-        for channel in range(a_w.shape[0]):
-            result.append(torch.mean(a_w[channel]))
+        result = torch.mean(windows, 1)
     else:
         raise ValueError("unknown pooling mode")
 
-    result = torch.stack(result).reshape(output_shape)
-    return result
+    return result.reshape(*batch_shape, nb_rows_out, nb_cols_out)
 
 
 def pool2d(tensor, kernel_size: int = 2, stride: int = 2, mode="max"):
-    assert len(tensor.shape) < 5
-    if len(tensor.shape) == 2:
-        return _pool(tensor, kernel_size, stride, mode)
-    if len(tensor.shape) == 3:
-        return torch.squeeze(pool2d(torch.unsqueeze(tensor, dim=0), kernel_size, stride, mode))
-    batches = tensor.shape[0]
-    channels = tensor.shape[1]
-    out_shape = (
-        batches,
-        channels,
-        (tensor.shape[2] - kernel_size) // stride + 1,
-        (tensor.shape[3] - kernel_size) // stride + 1,
-    )
-    result = []
-    for batch in range(batches):
-        for channel in range(channels):
-            result.append(_pool(tensor[batch][channel], kernel_size, stride, mode))
-    result = torch.stack(result).reshape(out_shape)
-    return result
+    assert 2 <= len(tensor.shape) < 5
+    return _pool(tensor, kernel_size, stride, mode)
 
 
 def maxpool2d(tensor, kernel_size: int = 2, stride: int = 2):
@@ -4,6 +4,7 @@ from torch import nn
 from torch.nn import init
 
 
+from syft.frameworks.torch.mpc.spdz import MultiplicationQueue
 from syft.frameworks.torch.tensors.interpreters.additive_shared import AdditiveSharingTensor
 from syft.frameworks.torch.tensors.interpreters import precision
 from syft.generic.pointers.pointer_tensor import PointerTensor
@@ -142,7 +143,12 @@ class LSTMCell(RNNCellBase):
         cellgate = torch.tanh(x_c + h_c)
         outputgate = torch.sigmoid(x_o + h_o)
 
-        c_ = torch.mul(forgetgate, c) + torch.mul(inputgate, cellgate)
+        # Both products are computed with a single opening round when encrypted
+        products = MultiplicationQueue()
+        products.mul(forgetgate, c)
+        products.mul(inputgate, cellgate)
+        forget_c, input_cell = products.flush()
+        c_ = forget_c + input_cell
 
         h_ = torch.mul(outputgate, torch.tanh(c_))
 
@@ -7,6 +7,7 @@ from syft.frameworks.torch.mpc import crypto_protocol
 from syft.frameworks.torch.mpc import spdz
 from syft.frameworks.torch.mpc import securenn
 from syft.frameworks.torch.mpc import fss
+from syft.frameworks.torch.mpc import przs
 from syft.generic.utils import memorize
 
 from syft.generic.abstract.tensor import AbstractTensor
@@ -280,16 +281,13 @@ class AdditiveSharingTensor(AbstractTensor):
             *owners the list of shareholders. Can be of any length.
 
         """
-        shares = self.generate_shares(
-            self.child, n_workers=len(owners), random_type=self.torch_dtype
-        )
-
-        shares_dict = {}
-        for share, owner in zip(shares, owners):
-            share_ptr = share.send(owner, **no_wrap)
-            shares_dict[share_ptr.location.id] = share_ptr
+        secret = self.child
+        if secret.dtype != self.torch_dtype:
+            secret = secret.type(self.torch_dtype)
 
-        self.child = shares_dict
+        # All the shares but the first one are generated by the owners from a
+        # seed, only the first share is sent over the network
+        self.child = przs.share_secret(self.owner, secret, self.field, self.dtype, *owners)
         return self
 
     def generate_shares(self, secret, n_workers, random_type):
@@ -348,18 +346,14 @@ class AdditiveSharingTensor(AbstractTensor):
 
         if shape is None or len(shape) == 0:
             shape = self.shape if self.shape else [1]
-        zero = torch.zeros(*shape, dtype=self.torch_dtype).share(
-            *self.locations,
-            field=self.field,
-            dtype=self.dtype,
-            crypto_provider=self.crypto_provider,
-            **no_wrap,
+        zero = przs.shares_of_zero(
+            self.owner, shape, self.field, self.dtype, self.crypto_provider, *self.locations
         )
         return zero
 
     def refresh(self):
         """
-        Refresh shares by adding shares of zero
+        Refresh shares by adding shares of zero, which the workers generate locally
         """
         zero = self.zero()
         r = self + zero
@@ -527,6 +521,34 @@ class AdditiveSharingTensor(AbstractTensor):
     def __rsub__(self, other):
         return (self - other) * -1
 
+    def add_public(self, value):
+        """Adds a public value to the shared value, by adding it to the share of the
+        first location only: contrary to add, no tensor is sent to the other locations.
+
+        The shares of the other locations are kept as they are, like in clone.
+
+        Args:
+            value: the public value, can be:
+                - a MultiPointerTensor holding the same value on all the locations
+                - a torch tensor, which is sent to the first location only
+                - a constant
+        """
+        if isinstance(value, torch.Tensor) and value.is_wrapper:
+            value = value.child
+
+        first_location = self.locations[0]
+        if isinstance(value, sy.MultiPointerTensor):
+            value = value.child[first_location.id]
+            if isinstance(value, torch.Tensor) and value.is_wrapper:
+                value = value.child
+        elif isinstance(value, torch.Tensor):
+            value = value.type(self.torch_dtype).send(first_location, **no_wrap)
+
+        result = type(self)(owner=self.owner, **self.get_class_attributes())
+        result.child = dict(self.child)
+        result.child[first_location.id] = self.modulo(self.child[first_location.id] + value)
+        return result
+
     def _private_mul(self, other, equation: str):
         """Abstractly Multiplies two tensors
 
@@ -1003,6 +1025,11 @@ class AdditiveSharingTensor(AbstractTensor):
         """
         Return the maximum value of an additive shared tensor
 
+        The values are reduced with a tournament: they are compared pairwise with
+        one vectorized comparison per level, so the number of rounds is logarithmic
+        in the number of values. Neighbouring candidates are compared and the later
+        one wins a tie, so the index of the last maximum is returned.
+
         Args:
             dim (None or int): if not None, the dimension on which
                 the comparison should be done
@@ -1018,30 +1045,48 @@ class AdditiveSharingTensor(AbstractTensor):
         n_dim = self.dim()
 
         # Make checks and transformation
-        assert dim is None or (0 <= dim < n_dim), f"Dim overflow  0 <= {dim} < {n_dim}"
-        # FIXME make it cleaner and robust for more options
-        if n_dim == 2:
-            if dim is None:
-                values = values.view(-1)
-            elif dim == 1:
-                values = values.t()
-        assert n_dim <= 2, "Max on tensor with len(shape) > 2 is not supported."
-
-        # Init max vals and idx to the first element
-        max_value = values[0]
-        max_index = torch.tensor([0]).share(
-            *self.locations,
-            field=self.field,
-            dtype=self.dtype,
-            crypto_provider=self.crypto_provider,
-            **no_wrap,
+        assert dim is None or (-n_dim <= dim < n_dim), f"Dim overflow  {-n_dim} <= {dim} < {n_dim}"
+        if dim is None:
+            values = values.reshape(-1)
+        else:
+            dim = dim % n_dim
+            # Move the dimension to reduce first, the comparisons need contiguous shares
+            values = values.permute(dim, *(d for d in range(n_dim) if d != dim)).contiguous()
+
+        # Init the indices of the values along the dimension to reduce
+        n_values = values.shape[0]
+        max_index = (
+            torch.arange(n_values)
+            .view((n_values,) + (1,) * (len(values.shape) - 1))
+            .repeat(1, *values.shape[1:])
+            .share(
+                *self.locations,
+                field=self.field,
+                dtype=self.dtype,
+                crypto_provider=self.crypto_provider,
+                **no_wrap,
+            )
         )
-
-        for i in range(1, len(values)):
-            a = values[i]
-            beta = a >= max_value
-            max_index = max_index + beta * (i - max_index)
-            max_value = max_value + beta * (a - max_value)
+        max_value = values
+
+        while max_value.shape[0] > 1:
+            # Compare each candidate of even index with the next one, so that the
+            # candidates stay in the order of their indices
+            half = max_value.shape[0] // 2
+            a, b = max_value[0 : 2 * half : 2], max_value[1 : 2 * half : 2]
+            a_index, b_index = max_index[0 : 2 * half : 2], max_index[1 : 2 * half : 2]
+            beta = b >= a
+            next_value = a + beta * (b - a)
+            next_index = a_index + beta * (b_index - a_index)
+
+            # With an odd number of candidates, the last one goes to the next level
+            if max_value.shape[0] % 2 == 1:
+                next_value = torch.cat([next_value, max_value[2 * half :]])
+                next_index = torch.cat([next_index, max_index[2 * half :]])
+
+            max_value, max_index = next_value, next_index
+
+        max_value, max_index = max_value.squeeze(0), max_index.squeeze(0)
 
         if dim is None and return_idx is False:
             return max_value
@@ -47,7 +47,7 @@ backward_func = {
 # Methods or functions whose signature changes a lot and that we don't want to "cache", because
 # they have an arbitrary number of tensors in args which can trigger unexpected behaviour
 ambiguous_methods = set()
-ambiguous_functions = {"run"}
+ambiguous_functions = {"run", "map"}
 
 
 ### Registration logic ###
@@ -144,9 +144,50 @@ class PointerPlan(ObjectPointer):
         Returns:
             Execution response
         """
-        plan_name = f"plan{self.id}"
+        return self._request_plan_command("run", location, response_ids, [args, response_ids])
+
+    def map(self, batches: List) -> List:
+        """Requests the remote plan to be called on each input of a list, with a single
+        message, see Plan.map.
+
+        Args:
+            batches: The inputs, each being the tuple of arguments of a call, or its only
+                argument.
 
-        args = [args, response_ids]
+        Returns:
+            The list of the results of each call.
+        """
+        assert (
+            len(self._locations) == 1
+        ), ".map() for PointerPlan with > 1 locations is currently not implemented."
+
+        batches = list(batches)
+        if not batches:
+            return []
+
+        # The number of outputs of the plan isn't known here, so no response ids are
+        # given and the location registers each result with a new id that it sends back
+        response = self._request_plan_command("map", self.location, [], [batches])
+        if not isinstance(response, (list, tuple)):
+            response = (response,)
+
+        # Plans with several outputs return a flat list of their results
+        n_outputs = len(response) // len(batches)
+        if n_outputs == 1:
+            return list(response)
+        return [
+            tuple(response[i * n_outputs : (i + 1) * n_outputs]) for i in range(len(batches))
+        ]
+
+    def _request_plan_command(
+        self,
+        cmd_name: str,
+        location: "sy.workers.BaseWorker",
+        response_ids: List[Union[str, int]],
+        args: list,
+    ) -> object:
+        """Sends a command to the remote plan and wraps the pointers to its results."""
+        plan_name = f"plan{self.id}"
 
         if location not in self._locations:
             raise RuntimeError(
@@ -162,7 +203,7 @@ class PointerPlan(ObjectPointer):
                 break
 
         response = self.owner.send_command(
-            cmd_name="run",
+            cmd_name=cmd_name,
             target=id_at_location,
             args_=tuple(args),
             recipient=location,
@@ -0,0 +1,66 @@
+"""
+Framing of serialized messages which lets several requests be in flight on the
+same connection. Each framed message starts with a small header holding the id
+of the request, and the response to a request is framed with the same id so that
+it can be matched with its request whatever the order responses arrive in.
+"""
+import struct
+from typing import List
+from typing import Tuple
+from typing import Union
+
+# First byte of a framed message. It differs from the compression scheme byte
+# which starts any serialized message, so framed and plain messages can share
+# the same connection.
+FRAME_MARKER = 77
+# First byte of a framed response carrying the pickled exception raised while
+# processing the request, instead of a serialized message.
+ERROR_MARKER = 79
+HEADER = struct.Struct(">BQ")
+HEADER_SIZE = HEADER.size
+
+
+def is_framed(binary: bin) -> bool:
+    """Tells whether a binary is a framed message."""
+    return len(binary) >= HEADER_SIZE and binary[0] in (FRAME_MARKER, ERROR_MARKER)
+
+
+def is_error(binary: bin) -> bool:
+    """Tells whether a framed message carries an exception."""
+    return binary[0] == ERROR_MARKER
+
+
+def frame(
+    request_id: int, message: Union[bin, List[bin]], error: bool = False
+) -> Union[bin, List[bin]]:
+    """Prepends the header holding the request id to a serialized message.
+
+    Args:
+        request_id: the id of the request, an unsigned 64 bits integer.
+        message: the serialized message, or the list of buffers built by
+            syft.serde.msgpack.serialize_buffers.
+        error: if True, the message is a pickled exception.
+
+    Returns:
+        the framed message, a list of buffers if the message was one.
+    """
+    header = HEADER.pack(ERROR_MARKER if error else FRAME_MARKER, request_id)
+    if isinstance(message, list):
+        return [header] + message
+    return header + message
+
+
+def unframe(binary: bin) -> Tuple[int, bin]:
+    """Splits a framed message into its request id and its serialized message.
+
+    Args:
+        binary: the framed message.
+
+    Returns:
+        tuple: the request id and the serialized message, a view on the framed
+            message when it is writable so that it is not copied.
+    """
+    _, request_id = HEADER.unpack_from(binary)
+    if isinstance(binary, bytearray):
+        return request_id, memoryview(binary)[HEADER_SIZE:]
+    return request_id, binary[HEADER_SIZE:]
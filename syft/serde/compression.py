@@ -2,36 +2,51 @@
 This file exists to provide one common place for all compression methods used in
 simplifying and serializing PySyft objects.
 """
+import threading
+from typing import List
 import zlib
+
 import lz4
 from lz4 import (  # noqa: F401
     frame,
 )  # needed as otherwise we will get: module 'lz4' has no attribute 'frame'
+import numpy
 
+from syft import dependency_check
 from syft.exceptions import CompressionNotFoundException
 
+if dependency_check.zstd_available:
+    import zstandard
+
 # COMPRESSION SCHEME INT CODES
 NO_COMPRESSION = 40
 LZ4 = 41
 ZLIB = 42
+ZSTD = 43
 scheme_to_bytes = {
     NO_COMPRESSION: NO_COMPRESSION.to_bytes(1, byteorder="big"),
     LZ4: LZ4.to_bytes(1, byteorder="big"),
     ZLIB: ZLIB.to_bytes(1, byteorder="big"),
+    ZSTD: ZSTD.to_bytes(1, byteorder="big"),
 }
 
+# zstd dictionaries known by this process, by dictionary id. The peers of a
+# connection must register the same dictionaries to exchange messages compressed
+# with them.
+zstd_dictionaries = {}
+
 ## SECTION: chosen Compression Algorithm
 
 
 def _apply_compress_scheme(decompressed_input_bin) -> tuple:
     """
     Apply the selected compression scheme.
-    By default is used LZ4
+    By default the scheme is chosen by the current CompressionPolicy
 
     Args:
         decompressed_input_bin: the binary to be compressed
     """
-    return apply_lz4_compression(decompressed_input_bin)
+    return policy.compress(decompressed_input_bin)
 
 
 def apply_zlib_compression(uncompressed_input_bin) -> tuple:
@@ -61,6 +76,24 @@ def apply_lz4_compression(decompressed_input_bin) -> tuple:
     return lz4.frame.compress(decompressed_input_bin), LZ4
 
 
+def apply_zstd_compression(decompressed_input_bin, dictionary=None) -> tuple:
+    """
+    Apply zstd compression to the input, optionally with a trained dictionary
+
+    Args:
+        decompressed_input_bin: the binary to be compressed
+        dictionary: a zstandard.ZstdCompressionDict registered with
+            register_zstd_dictionary
+
+    Returns:
+        a tuple (compressed_result, ZSTD)
+    """
+    if not dependency_check.zstd_available:
+        raise CompressionNotFoundException("zstd compression requires the zstandard package")
+    compressor = zstandard.ZstdCompressor(dict_data=dictionary)
+    return compressor.compress(decompressed_input_bin), ZSTD
+
+
 def apply_no_compression(decompressed_input_bin) -> tuple:
     """
     No compression is applied to the input
@@ -119,9 +152,216 @@ def _decompress(binary: bin) -> bin:
         return lz4.frame.decompress(binary)
     elif compress_scheme == ZLIB:
         return zlib.decompress(binary)
+    elif compress_scheme == ZSTD:
+        return _zstd_decompress(binary)
     elif compress_scheme == NO_COMPRESSION:
         return binary
     else:
         raise CompressionNotFoundException(
             f"Compression scheme not found for compression code: {str(compress_scheme)}"
         )
+
+
+def _zstd_decompress(binary: bin) -> bin:
+    """Decompresses a zstd frame, with the registered dictionary it was compressed with."""
+    if not dependency_check.zstd_available:
+        raise CompressionNotFoundException("zstd decompression requires the zstandard package")
+    dict_id = zstandard.get_frame_parameters(binary).dict_id
+    if dict_id and dict_id not in zstd_dictionaries:
+        raise CompressionNotFoundException(f"Unknown zstd dictionary: {dict_id}")
+    decompressor = zstandard.ZstdDecompressor(dict_data=zstd_dictionaries.get(dict_id))
+    return decompressor.decompress(binary)
+
+
+def register_zstd_dictionary(dictionary) -> int:
+    """
+    Registers a zstd dictionary so that the messages compressed with it can be
+    decompressed.
+
+    Args:
+        dictionary: a zstandard.ZstdCompressionDict
+
+    Returns:
+        int: the id of the dictionary
+    """
+    zstd_dictionaries[dictionary.dict_id()] = dictionary
+    return dictionary.dict_id()
+
+
+def train_zstd_dictionary(samples: List[bin], dict_size: int = 16 * 1024):
+    """
+    Trains and registers a zstd dictionary on samples of messages.
+
+    Dictionaries pay off for small and repetitive messages, such as the
+    TensorCommandMessage and ObjectRequestMessage a worker sends over and over.
+
+    Args:
+        samples: uncompressed binaries, e.g. msgpack dumps of simplified messages
+        dict_size: the maximum size of the dictionary in bytes
+
+    Returns:
+        the trained zstandard.ZstdCompressionDict
+    """
+    if not dependency_check.zstd_available:
+        raise CompressionNotFoundException("zstd dictionaries require the zstandard package")
+    dictionary = zstandard.train_dictionary(dict_size, samples)
+    register_zstd_dictionary(dictionary)
+    return dictionary
+
+
+def byte_entropy(binary: bin, sample_size: int = 4096, n_samples: int = 4) -> float:
+    """
+    Estimates the Shannon entropy of a binary, in bits per byte, from a few
+    samples spread over it. Values close to 8 mean the binary won't compress.
+
+    Args:
+        binary: the binary to inspect
+        sample_size: the size of each sample
+        n_samples: the number of samples
+
+    Returns:
+        float: the estimated entropy, between 0 and 8
+    """
+    data = numpy.frombuffer(binary, dtype=numpy.uint8)
+    if len(data) > sample_size * n_samples:
+        step = len(data) // n_samples
+        data = numpy.concatenate(
+            [data[i * step : i * step + sample_size] for i in range(n_samples)]
+        )
+    if len(data) == 0:
+        return 0.0
+    counts = numpy.bincount(data, minlength=256)
+    probabilities = counts[counts > 0] / len(data)
+    return float(-(probabilities * numpy.log2(probabilities)).sum())
+
+
+class CompressionPolicy:
+    """
+    Chooses the compression scheme of each binary and keeps statistics about it.
+
+    - binaries smaller than zstd_max_size are compressed with zstd when a trained
+      dictionary is set, as small command messages compress well with it
+    - other binaries smaller than min_size are not compressed
+    - for binaries larger than entropy_check_size, the entropy is sampled and
+      those which look random, such as additive shares, are not compressed
+    - all other binaries are compressed with LZ4
+
+    The compressed binary is dropped if it is not smaller than the input.
+
+    Args:
+        min_size: size in bytes under which binaries are not compressed
+        entropy_check_size: size in bytes from which the entropy is sampled
+        max_entropy: entropy in bits per byte above which binaries are not compressed
+        zstd_dictionary: a zstandard.ZstdCompressionDict, see train_zstd_dictionary
+        zstd_max_size: size in bytes under which the zstd dictionary is used
+    """
+
+    def __init__(
+        self,
+        min_size: int = 512,
+        entropy_check_size: int = 64 * 1024,
+        max_entropy: float = 7.5,
+        zstd_dictionary=None,
+        zstd_max_size: int = 16 * 1024,
+    ):
+        self.min_size = min_size
+        self.entropy_check_size = entropy_check_size
+        self.max_entropy = max_entropy
+        self.zstd_max_size = zstd_max_size
+        self.zstd_dictionary = None
+        if zstd_dictionary is not None:
+            self.set_zstd_dictionary(zstd_dictionary)
+
+        self._lock = threading.Lock()
+        self.reset_statistics()
+
+    def set_zstd_dictionary(self, dictionary):
+        """Uses a zstd dictionary for small binaries, and registers it."""
+        register_zstd_dictionary(dictionary)
+        self.zstd_dictionary = dictionary
+
+    def choose_scheme(self, binary: bin) -> int:
+        """Returns the compression scheme to apply to a binary."""
+        size = len(binary)
+        if self.zstd_dictionary is not None and size <= self.zstd_max_size:
+            return ZSTD
+        if size < self.min_size:
+            return NO_COMPRESSION
+        if size >= self.entropy_check_size and byte_entropy(binary) > self.max_entropy:
+            return NO_COMPRESSION
+        return LZ4
+
+    def compress(self, binary: bin) -> tuple:
+        """
+        Compresses a binary with the scheme chosen by the policy
+
+        Args:
+            binary: the binary to be compressed
+
+        Returns:
+            a tuple (compressed_result, scheme)
+        """
+        scheme = self.choose_scheme(binary)
+        if scheme == ZSTD:
+            stream, scheme = apply_zstd_compression(binary, self.zstd_dictionary)
+        elif scheme == LZ4:
+            stream, scheme = apply_lz4_compression(binary)
+        else:
+            stream, scheme = apply_no_compression(binary)
+
+        rejected_scheme = None
+        if scheme != NO_COMPRESSION and len(stream) >= len(binary):
+            rejected_scheme = scheme
+            stream, scheme = apply_no_compression(binary)
+
+        self._record(scheme, len(binary), len(stream), rejected_scheme)
+        return stream, scheme
+
+    def _record(self, scheme: int, bytes_in: int, bytes_out: int, rejected_scheme: int = None):
+        with self._lock:
+            stats = self._scheme_statistics(scheme)
+            stats["hits"] += 1
+            stats["bytes_in"] += bytes_in
+            stats["bytes_out"] += bytes_out
+            if rejected_scheme is not None:
+                self._scheme_statistics(rejected_scheme)["rejected"] += 1
+
+    def _scheme_statistics(self, scheme: int) -> dict:
+        return self._statistics.setdefault(
+            scheme, {"hits": 0, "rejected": 0, "bytes_in": 0, "bytes_out": 0}
+        )
+
+    def statistics(self) -> dict:
+        """
+        Returns, by scheme code, the number of binaries sent with the scheme, the
+        number of binaries whose compression with it was dropped because it didn't
+        reduce their size, the bytes in and out and the compression ratio. Each
+        binary is counted once in the hits, under the scheme it was sent with.
+        """
+        with self._lock:
+            statistics = {}
+            for key, stats in self._statistics.items():
+                statistics[key] = dict(stats)
+                ratio = stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else 1.0
+                statistics[key]["ratio"] = ratio
+            return statistics
+
+    def reset_statistics(self):
+        """Resets the statistics of all schemes."""
+        with self._lock:
+            self._statistics = {}
+
+
+# The policy used by _apply_compress_scheme
+policy = CompressionPolicy()
+
+
+def set_compression_policy(new_policy: CompressionPolicy):
+    """
+    Sets the policy choosing the compression scheme of serialized messages
+
+    Args:
+        new_policy: the CompressionPolicy to use from now on
+    """
+    global policy
+    policy = new_policy
@@ -6,3 +6,4 @@ from syft.serde.msgpack import proto  # noqa: F401
 from syft.serde.msgpack.proto import proto_type_info  # noqa: F401
 from syft.serde.msgpack.serde import serialize  # noqa: F401
 from syft.serde.msgpack.serde import deserialize  # noqa: F401
+from syft.serde.msgpack.serde import serialize_buffers  # noqa: F401
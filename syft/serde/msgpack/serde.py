@@ -33,6 +33,8 @@ If different compressions are required, the worker can override the function app
 from collections import OrderedDict
 import inspect
 from dataclasses import dataclass
+import struct
+from typing import List
 
 import syft
 import msgpack as msgpack_lib
@@ -40,6 +42,7 @@ from syft import dependency_check
 
 from syft.serde import compression
 from syft.serde import msgpack
+from syft.serde.out_of_band import collect_out_of_band_buffers
 from syft.serde.msgpack.native_serde import MAP_NATIVE_SIMPLIFIERS_AND_DETAILERS
 from syft.workers.abstract import AbstractWorker
 from syft.workers.virtual import VirtualWorker
@@ -48,6 +51,7 @@ from syft.exceptions import GetNotPermittedError
 from syft.exceptions import ResponseSignatureError
 
 from syft.serde.syft_serializable import SyftSerializable, get_msgpack_subclasses
+from syft.serde.syft_serializable import on_new_subclass
 from syft.serde.msgpack.proto import proto_type_info
 
 if dependency_check.torch_available:
@@ -92,6 +96,7 @@ class MsgpackGlobalState(metaclass=MetaMsgpackGlobalState):
     _forced_full_simplifiers = OrderedDict()
     _detailers = OrderedDict()
     _inherited_simplifiers_found = OrderedDict()
+    _inherited_forced_full_simplifiers_found = OrderedDict()
     _no_simplifiers_found = set()
     _no_full_simplifiers_found = set()
 
@@ -138,6 +143,11 @@ class MsgpackGlobalState(metaclass=MetaMsgpackGlobalState):
         return self._no_full_simplifiers_found
 
     def update(self):
+        """
+        Rebuilds the dispatch tables. They are only rebuilt when the state is stale,
+        which happens when a new SyftSerializable subclass is created, and are
+        never mutated afterwards.
+        """
         if not self.stale_state:
             return self
 
@@ -146,54 +156,81 @@ class MsgpackGlobalState(metaclass=MetaMsgpackGlobalState):
         # NOTE: serialization constants for these objects need to be defined in `proto.json` file
         # in https://github.com/OpenMined/proto
 
-        self._OBJ_SIMPLIFIER_AND_DETAILERS = list(get_msgpack_subclasses(SyftSerializable))
+        obj_simplifier_and_detailers = list(get_msgpack_subclasses(SyftSerializable))
 
         # Maps a type to a tuple containing its simplifier and detailer function
         # NOTE: serialization constants for these objects need to be defined in `proto.json` file
         # in https://github.com/OpenMined/proto
 
-        self._MAP_TO_SIMPLFIERS_AND_DETAILERS = OrderedDict(
+        map_to_simplifiers_and_detailers = OrderedDict(
             list(MAP_NATIVE_SIMPLIFIERS_AND_DETAILERS.items())
             + list(MAP_TORCH_SIMPLIFIERS_AND_DETAILERS.items())
             + list(MAP_TF_SIMPLIFIERS_AND_DETAILERS.items())
         )
 
-        self._OBJ_FORCE_FULL_SIMPLIFIER_AND_DETAILERS = [VirtualWorker]
-        self._EXCEPTION_SIMPLIFIER_AND_DETAILERS = [GetNotPermittedError, ResponseSignatureError]
+        obj_force_full_simplifier_and_detailers = [VirtualWorker]
+        exception_simplifier_and_detailers = [GetNotPermittedError, ResponseSignatureError]
 
-        self.stale_state = False
+        simplifiers = OrderedDict()
+        forced_full_simplifiers = OrderedDict()
+        detailers = OrderedDict()
 
         def _add_simplifier_and_detailer(curr_type, simplifier, detailer, forced=False):
             type_info = proto_type_info(curr_type)
             if forced:
-                self._forced_full_simplifiers[curr_type] = (type_info.forced_code, simplifier)
-                self._detailers[type_info.forced_code] = detailer
+                forced_full_simplifiers[curr_type] = (type_info.forced_code, simplifier)
+                detailers[type_info.forced_code] = detailer
             else:
-                self._simplifiers[curr_type] = (type_info.code, simplifier)
-                self._detailers[type_info.code] = detailer
+                simplifiers[curr_type] = (type_info.code, simplifier)
+                detailers[type_info.code] = detailer
 
         # Register native and torch types
-        for curr_type, (simplifier, detailer) in self._MAP_TO_SIMPLFIERS_AND_DETAILERS.items():
+        for curr_type, (simplifier, detailer) in map_to_simplifiers_and_detailers.items():
             _add_simplifier_and_detailer(curr_type, simplifier, detailer)
 
         # # Register syft objects with custom simplify and detail methods
-        for syft_type in (
-            self._OBJ_SIMPLIFIER_AND_DETAILERS + self._EXCEPTION_SIMPLIFIER_AND_DETAILERS
-        ):
+        for syft_type in obj_simplifier_and_detailers + exception_simplifier_and_detailers:
             simplifier, detailer = syft_type.simplify, syft_type.detail
             _add_simplifier_and_detailer(syft_type, simplifier, detailer)
         #
         # # Register syft objects with custom force_simplify and force_detail methods
-        for syft_type in self._OBJ_FORCE_FULL_SIMPLIFIER_AND_DETAILERS:
+        for syft_type in obj_force_full_simplifier_and_detailers:
             force_simplifier, force_detailer = syft_type.force_simplify, syft_type.force_detail
             _add_simplifier_and_detailer(syft_type, force_simplifier, force_detailer, forced=True)
+
+        # Swap the new tables in at once, and reset the caches built on the old ones
+        self._OBJ_SIMPLIFIER_AND_DETAILERS = obj_simplifier_and_detailers
+        self._MAP_TO_SIMPLFIERS_AND_DETAILERS = map_to_simplifiers_and_detailers
+        self._OBJ_FORCE_FULL_SIMPLIFIER_AND_DETAILERS = obj_force_full_simplifier_and_detailers
+        self._EXCEPTION_SIMPLIFIER_AND_DETAILERS = exception_simplifier_and_detailers
+        self._simplifiers = simplifiers
+        self._forced_full_simplifiers = forced_full_simplifiers
+        self._detailers = detailers
+        self._inherited_simplifiers_found = OrderedDict()
+        self._inherited_forced_full_simplifiers_found = OrderedDict()
+        self._no_simplifiers_found = set()
+        self._no_full_simplifiers_found = set()
+
+        self.stale_state = False
         return self
 
+    def mark_stale(self, *unused_args):
+        """Marks the dispatch tables to be rebuilt on their next use."""
+        self.stale_state = True
+
 
 # cached value
 field = 2 ** 64
 str_field = str(2 ** 64)
 
+# First byte of the messages serialized with serialize_buffers. It differs from
+# the compression scheme byte which starts the other serialized messages.
+OUT_OF_BAND_MARKER = 78
+# marker and number of out-of-band buffers, followed by the length of the message
+# and of each buffer
+OUT_OF_BAND_HEADER = struct.Struct(">BI")
+BUFFER_LENGTH = struct.Struct(">Q")
+
 
 ## SECTION: High Level Simplification Router
 def _force_full_simplify(worker: AbstractWorker, obj: object) -> object:
@@ -207,46 +244,44 @@ def _force_full_simplify(worker: AbstractWorker, obj: object) -> object:
     Returns:
         The simplified object.
     """
+    state = msgpack_global_state
+    if state.stale_state:
+        state.update()
+
     # check to see if there is a full simplifier
     # for this type. If there is, return the full simplified object.
     current_type = type(obj)
-    if current_type in msgpack_global_state.forced_full_simplifiers:
-        result = (
-            msgpack_global_state.forced_full_simplifiers[current_type][0],
-            msgpack_global_state.forced_full_simplifiers[current_type][1](worker, obj),
-        )
-        return result
+    simplifier = state._forced_full_simplifiers.get(current_type)
+    if simplifier is None:
+        simplifier = state._inherited_forced_full_simplifiers_found.get(current_type)
+    if simplifier is not None:
+        return (simplifier[0], simplifier[1](worker, obj))
+
     # If we already tried to find a full simplifier for this type but failed, we should
     # simplify it instead.
-    elif current_type in msgpack_global_state.no_full_simplifiers_found:
-        return _simplify(worker, obj)
-    else:
-        # If the object type is not in forced_full_simplifiers,
-        # we check the classes that this object inherits from.
-        # `inspect.getmro` give us all types this object inherits
-        # from, including `type(obj)`. We can skip the type of the
-        # object because we already tried this in the
-        # previous step.
-        classes_inheritance = inspect.getmro(type(obj))[1:]
-
-        for inheritance_type in classes_inheritance:
-            if inheritance_type in msgpack_global_state.forced_full_simplifiers:
-                # Store the inheritance_type in forced_full_simplifiers so next
-                # time we see this type serde will be faster.
-                msgpack_global_state.forced_full_simplifiers[
-                    current_type
-                ] = msgpack_global_state.forced_full_simplifiers[inheritance_type]
-                result = (
-                    msgpack_global_state.forced_full_simplifiers[current_type][0],
-                    msgpack_global_state.forced_full_simplifiers[current_type][1](worker, obj),
-                )
-                return result
-
-        # If there is not a full_simplifier for this
-        # object, then we simplify it.
-        msgpack_global_state.no_full_simplifiers_found.add(current_type)
+    if current_type in state._no_full_simplifiers_found:
         return _simplify(worker, obj)
 
+    # If the object type is not in forced_full_simplifiers,
+    # we check the classes that this object inherits from.
+    # `inspect.getmro` give us all types this object inherits
+    # from, including `type(obj)`. We can skip the type of the
+    # object because we already tried this in the
+    # previous step.
+    classes_inheritance = inspect.getmro(type(obj))[1:]
+
+    for inheritance_type in classes_inheritance:
+        if inheritance_type in state._forced_full_simplifiers:
+            # Store the inheritance_type so next time we see this type serde will be faster.
+            simplifier = state._forced_full_simplifiers[inheritance_type]
+            state._inherited_forced_full_simplifiers_found[current_type] = simplifier
+            return (simplifier[0], simplifier[1](worker, obj))
+
+    # If there is not a full_simplifier for this
+    # object, then we simplify it.
+    state._no_full_simplifiers_found.add(current_type)
+    return _simplify(worker, obj)
+
 
 # Store types that are not simplifiable (int, float, None) so we
 # can ignore them during serialization.
@@ -337,6 +372,65 @@ def serialize(
     return _serialize_msgpack_binary(simple_objects)
 
 
+def serialize_buffers(
+    obj: object, worker: AbstractWorker = None, force_full_simplification: bool = False
+) -> List[memoryview]:
+    """Serializes an object to a list of buffers, for scatter-gather transports.
+
+    The memory of the tensors is kept out of the msgpack message: the first buffer
+    holds the lengths of the other ones, the second one the compressed message and
+    the next ones the memory of each tensor, which is not copied. Joining the
+    buffers gives a binary which deserialize() accepts.
+
+    Args:
+        obj (object): the object to be serialized
+        force_full_simplification (bool): see serialize()
+
+    Returns:
+        list: the buffers to write one after the other.
+    """
+    if worker is None:
+        worker = syft.framework.hook.local_worker
+
+    buffers = []
+    with collect_out_of_band_buffers(buffers):
+        simple_objects = _serialize_msgpack_simple(
+            obj, worker, force_full_simplification=force_full_simplification
+        )
+    message = _serialize_msgpack_binary(simple_objects)
+
+    lengths = [len(message)] + [buffer.nbytes for buffer in buffers]
+    header = OUT_OF_BAND_HEADER.pack(OUT_OF_BAND_MARKER, len(buffers)) + b"".join(
+        BUFFER_LENGTH.pack(length) for length in lengths
+    )
+    return [header, message] + buffers
+
+
+def _deserialize_buffers(binary: bin, worker: AbstractWorker = None) -> object:
+    """Deserializes the joined buffers built by serialize_buffers.
+
+    Tensors are built on top of slices of the input binary, so it is not copied
+    when it is writable (e.g. a bytearray).
+    """
+    _, n_buffers = OUT_OF_BAND_HEADER.unpack_from(binary)
+    offset = OUT_OF_BAND_HEADER.size
+    lengths = []
+    for _ in range(n_buffers + 1):
+        lengths.append(BUFFER_LENGTH.unpack_from(binary, offset)[0])
+        offset += BUFFER_LENGTH.size
+
+    view = memoryview(binary)
+    chunks = []
+    for length in lengths:
+        chunks.append(view[offset : offset + length])
+        offset += length
+
+    message, buffers = bytes(chunks[0]), chunks[1:]
+    with collect_out_of_band_buffers(buffers):
+        simple_objects = _deserialize_msgpack_binary(message, worker)
+        return _deserialize_msgpack_simple(simple_objects, worker)
+
+
 def _deserialize_msgpack_binary(binary: bin, worker: AbstractWorker = None) -> object:
     if worker is None:
         # TODO[jvmancuso]: This might be worth a standalone function.
@@ -373,6 +467,9 @@ def deserialize(binary: bin, worker: AbstractWorker = None) -> object:
         # TODO[jvmancuso]: This might be worth a standalone function.
         worker = syft.framework.hook.local_worker
 
+    if binary[0] == OUT_OF_BAND_MARKER:
+        return _deserialize_buffers(binary, worker)
+
     simple_objects = _deserialize_msgpack_binary(binary, worker)
     return _deserialize_msgpack_simple(simple_objects, worker)
 
@@ -411,72 +508,47 @@ def _simplify(worker: AbstractWorker, obj: object, **kwargs) -> object:
         ValueError: if `move_this` or `in_front_of_that` are not both single ASCII
         characters.
     """
+    state = msgpack_global_state
+    if state.stale_state:
+        state.update()
+
     # Check to see if there is a simplifier
     # for this type. If there is, return the simplified object.
 
     current_type, obj = _simplify_field(obj)
 
-    if current_type in msgpack_global_state.simplifiers:
-        result = (
-            msgpack_global_state.simplifiers[current_type][0],
-            msgpack_global_state.simplifiers[current_type][1](worker, obj, **kwargs),
-        )
-        return result
-    elif current_type in msgpack_global_state.inherited_simplifiers_found:
-        result = (
-            msgpack_global_state.inherited_simplifiers_found[current_type][0],
-            msgpack_global_state.inherited_simplifiers_found[current_type][1](
-                worker, obj, **kwargs
-            ),
-        )
-        return result
+    simplifier = state._simplifiers.get(current_type)
+    if simplifier is None:
+        simplifier = state._inherited_simplifiers_found.get(current_type)
+    if simplifier is not None:
+        return (simplifier[0], simplifier[1](worker, obj, **kwargs))
 
     # If we already tried to find a simplifier for this type but failed, we should
     # just return the object as it is.
-    elif current_type in msgpack_global_state.no_simplifiers_found:
+    if current_type in state._no_simplifiers_found:
         return obj
 
-    else:
-        # If the object type is not in simplifiers,
-        # we check the classes that this object inherits from.
-        # `inspect.getmro` give us all types this object inherits
-        # from, including `type(obj)`. We can skip the type of the
-        # object because we already tried this in the
-        # previous step.
-        classes_inheritance = inspect.getmro(type(obj))[1:]
-
-        for inheritance_type in classes_inheritance:
-            if inheritance_type in msgpack_global_state.simplifiers:
-                # Store the inheritance_type in simplifiers so next time we see this type
-                # serde will be faster.
-                msgpack_global_state.inherited_simplifiers_found[
-                    current_type
-                ] = msgpack_global_state.simplifiers[inheritance_type]
-                result = (
-                    msgpack_global_state.inherited_simplifiers_found[current_type][0],
-                    msgpack_global_state.inherited_simplifiers_found[current_type][1](
-                        worker, obj, **kwargs
-                    ),
-                )
-                return result
-
-        # if there is not a simplifier for this
-        # object, then it might be one external to
-        # the framework
-        msgpack_global_state.stale_state = True
-        if current_type in msgpack_global_state.simplifiers:
-            result = (
-                msgpack_global_state.simplifiers[current_type][0],
-                msgpack_global_state.simplifiers[current_type][1](worker, obj, **kwargs),
-            )
-            return result
-
-        # if there is not a simplifier for this
-        # object, then the object is already a
-        # simple python object and we can just
-        # return it.
-        msgpack_global_state.no_simplifiers_found.add(current_type)
-        return obj
+    # If the object type is not in simplifiers,
+    # we check the classes that this object inherits from.
+    # `inspect.getmro` give us all types this object inherits
+    # from, including `type(obj)`. We can skip the type of the
+    # object because we already tried this in the
+    # previous step.
+    classes_inheritance = inspect.getmro(type(obj))[1:]
+
+    for inheritance_type in classes_inheritance:
+        if inheritance_type in state._simplifiers:
+            # Store the inheritance_type so next time we see this type serde will be faster.
+            simplifier = state._simplifiers[inheritance_type]
+            state._inherited_simplifiers_found[current_type] = simplifier
+            return (simplifier[0], simplifier[1](worker, obj, **kwargs))
+
+    # if there is not a simplifier for this
+    # object, then the object is already a
+    # simple python object and we can just
+    # return it.
+    state._no_simplifiers_found.add(current_type)
+    return obj
 
 
 def _detail_field(typeCode, val):
@@ -508,10 +580,14 @@ def _detail(worker: AbstractWorker, obj: object, **kwargs) -> object:
             deserializing directly.
     """
     if type(obj) in (list, tuple):
-        val = msgpack_global_state.detailers[obj[0]](worker, obj[1], **kwargs)
+        state = msgpack_global_state
+        if state.stale_state:
+            state.update()
+        val = state._detailers[obj[0]](worker, obj[1], **kwargs)
         return _detail_field(obj[0], val)
     else:
         return obj
 
 
 msgpack_global_state = MsgpackGlobalState()
+on_new_subclass(msgpack_global_state.mark_stale)
@@ -26,6 +26,21 @@ from syft.serde.torch.serde import torch_tensor_serializer
 from syft.serde.torch.serde import torch_tensor_deserializer
 from syft.serde.torch.serde import numpy_tensor_serializer
 from syft.serde.torch.serde import numpy_tensor_deserializer  # noqa: F401
+from syft.serde.torch.serde import raw_tensor_serializer
+from syft.serde.torch.serde import raw_tensor_deserializer
+from syft.serde.out_of_band import out_of_band_active
+
+
+def _tensor_serialization(worker: AbstractWorker) -> str:
+    """Returns the tensor serialization strategy to use.
+
+    Tensors exchanged between PyTorch workers are serialized with the raw strategy
+    when their memory can be kept out of the message in out-of-band buffers.
+    """
+    serializer = worker.serializer
+    if serializer == TENSOR_SERIALIZATION.TORCH and out_of_band_active():
+        return TENSOR_SERIALIZATION.RAW
+    return serializer
 
 
 def _serialize_tensor(worker: AbstractWorker, tensor) -> bin:
@@ -42,13 +57,13 @@ def _serialize_tensor(worker: AbstractWorker, tensor) -> bin:
     serializers = {
         TENSOR_SERIALIZATION.TORCH: torch_tensor_serializer,
         TENSOR_SERIALIZATION.NUMPY: numpy_tensor_serializer,
+        TENSOR_SERIALIZATION.RAW: raw_tensor_serializer,
         TENSOR_SERIALIZATION.ALL: simplified_tensor_serializer,
     }
-    if worker.serializer not in serializers:
-        raise NotImplementedError(
-            f"Tensor serialization strategy is not supported: {worker.serializer}"
-        )
-    serializer = serializers[worker.serializer]
+    strategy = _tensor_serialization(worker)
+    if strategy not in serializers:
+        raise NotImplementedError(f"Tensor serialization strategy is not supported: {strategy}")
+    serializer = serializers[strategy]
     return serializer(worker, tensor)
 
 
@@ -67,6 +82,7 @@ def _deserialize_tensor(worker: AbstractWorker, serializer: str, tensor_bin) ->
     deserializers = {
         TENSOR_SERIALIZATION.TORCH: torch_tensor_deserializer,
         TENSOR_SERIALIZATION.NUMPY: numpy_tensor_serializer,
+        TENSOR_SERIALIZATION.RAW: raw_tensor_deserializer,
         TENSOR_SERIALIZATION.ALL: simplified_tensor_deserializer,
     }
     if serializer not in deserializers:
@@ -156,7 +172,7 @@ def _simplify_torch_tensor(worker: AbstractWorker, tensor: torch.Tensor) -> bin:
         grad_chain,
         serde._simplify(worker, tensor.tags),
         serde._simplify(worker, tensor.description),
-        serde._simplify(worker, worker.serializer),
+        serde._simplify(worker, _tensor_serialization(worker)),
         serde._simplify(worker, origin),
         serde._simplify(worker, id_at_origin),
     )
@@ -0,0 +1,36 @@
+"""
+Out-of-band buffers let large binary payloads, such as the memory of tensors, be kept
+out of the serialized message. Serializers supporting it append the payload to the
+active list of buffers and only store its index in the message, so that the transport
+can write the message and the buffers one after the other without concatenating them.
+"""
+from contextlib import contextmanager
+import threading
+from typing import List
+
+_state = threading.local()
+
+
+@contextmanager
+def collect_out_of_band_buffers(buffers: List[memoryview]):
+    """Activates out-of-band buffers for the current thread.
+
+    Args:
+        buffers: the list filled by the serializers, or read by the deserializers.
+    """
+    previous = getattr(_state, "buffers", None)
+    _state.buffers = buffers
+    try:
+        yield buffers
+    finally:
+        _state.buffers = previous
+
+
+def out_of_band_active() -> bool:
+    """Tells whether out-of-band buffers are active in the current thread."""
+    return getattr(_state, "buffers", None) is not None
+
+
+def out_of_band_buffers() -> List[memoryview]:
+    """Returns the out-of-band buffers active in the current thread."""
+    return _state.buffers
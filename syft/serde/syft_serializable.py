@@ -140,6 +140,18 @@ def get_msgpack_subclasses(cls):
     return original_subclasses.union(sub_sets)
 
 
+# Callbacks called with each new subclass of SyftSerializable, used by the serde
+# global states to know when their dispatch tables must be rebuilt
+_subclass_listeners = []
+
+
+def on_new_subclass(callback: Callable):
+    """
+        Registers a callback called with each new subclass of SyftSerializable.
+    """
+    _subclass_listeners.append(callback)
+
+
 class SyftSerializable:
     """
         Interface for the communication protocols in syft.
@@ -157,6 +169,11 @@ class SyftSerializable:
         has to write it's own explicit methods, even if they are the ones from the parent class.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for callback in _subclass_listeners:
+            callback(cls)
+
     @staticmethod
     def simplify(worker, obj):
         """
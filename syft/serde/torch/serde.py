@@ -4,6 +4,8 @@ import warnings
 import numpy
 import torch
 
+from syft.serde.out_of_band import out_of_band_active
+from syft.serde.out_of_band import out_of_band_buffers
 from syft.workers.abstract import AbstractWorker
 
 # Torch dtypes to string (and back) mappers
@@ -32,6 +34,21 @@ TORCH_MFORMAT_ID = {torch.channels_last: 1, torch.contiguous_format: 2, torch.pr
 
 TORCH_ID_MFORMAT = {i: cls for cls, i in TORCH_MFORMAT_ID.items()}
 
+# Torch dtypes whose memory can be read by numpy, and thus by the raw serializer
+RAW_DTYPES = {
+    torch.uint8,
+    torch.int8,
+    torch.int16,
+    torch.int32,
+    torch.int64,
+    torch.float16,
+    torch.float32,
+    torch.float64,
+    torch.complex64,
+    torch.complex128,
+    torch.bool,
+}
+
 
 def torch_tensor_serializer(worker: AbstractWorker, tensor) -> bin:
     """Strategy to serialize a tensor using Torch saver"""
@@ -80,3 +97,68 @@ def numpy_tensor_deserializer(tensor_bin) -> torch.Tensor:
     """
     bin_tensor_stream = io.BytesIO(tensor_bin)
     return torch.from_numpy(numpy.load(bin_tensor_stream))
+
+
+def raw_tensor_serializer(worker: AbstractWorker, tensor: torch.Tensor) -> tuple:
+    """Strategy to serialize a tensor as its dtype, shape and strides plus a
+    memoryview on its memory, so that the tensor content is never copied.
+
+    Tensors which can't be read by numpy (e.g. quantized or GPU tensors) are
+    serialized with the Torch saver instead, and get a None dtype.
+    Non contiguous tensors are copied to a contiguous memory first.
+
+    Args
+        (torch.Tensor): an input tensor to be serialized
+
+    Returns
+        A tuple (dtype, shape, strides, requires_grad, memory). When out-of-band
+        buffers are active (see syft.serde.out_of_band), memory is the index of the
+        tensor memory in the buffers.
+    """
+    if (
+        tensor.dtype not in RAW_DTYPES
+        or tensor.device.type != "cpu"
+        or tensor.layout != torch.strided
+    ):
+        return None, None, None, None, torch_tensor_serializer(worker, tensor)
+
+    requires_grad = tensor.requires_grad
+    data = tensor.detach()
+    if not data.is_contiguous():
+        data = data.contiguous()
+
+    memory = memoryview(data.numpy().reshape(-1)).cast("B")
+    if out_of_band_active():
+        buffers = out_of_band_buffers()
+        buffers.append(memory)
+        memory = len(buffers) - 1
+
+    return TORCH_DTYPE_STR[data.dtype], tuple(data.shape), data.stride(), requires_grad, memory
+
+
+def raw_tensor_deserializer(worker: AbstractWorker, tensor_tuple: tuple) -> torch.Tensor:
+    """Strategy to deserialize a tensor serialized with raw_tensor_serializer.
+
+    The tensor is built on top of the received memory, which is only copied if it
+    is read-only.
+
+    Args
+        tensor_tuple: the tuple built by raw_tensor_serializer
+
+    Returns
+        a Torch tensor
+    """
+    dtype, shape, strides, requires_grad, memory = tensor_tuple
+    if dtype is None:
+        return torch_tensor_deserializer(worker, memory)
+
+    if isinstance(memory, int):
+        memory = out_of_band_buffers()[memory]
+
+    array = numpy.frombuffer(memory, dtype=numpy.dtype(dtype))
+    if not array.flags.writeable:
+        array = array.copy()
+
+    tensor = torch.from_numpy(array).as_strided(shape, strides)
+    tensor.requires_grad = requires_grad
+    return tensor
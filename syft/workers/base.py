@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from contextlib import contextmanager
 
 import logging
@@ -8,6 +9,8 @@ from typing import TYPE_CHECKING
 import syft as sy
 from syft import codes
 from syft.execution.plan import Plan
+from syft.frameworks.torch.mpc import przs
+from syft.frameworks.torch.mpc import spdz
 from syft.frameworks.torch.mpc.primitives import PrimitiveStorage
 
 from syft.generic.abstract.tensor import AbstractTensor
@@ -86,6 +89,18 @@ class BaseWorker(AbstractWorker):
             precision.
     """
 
+    # Tensor serialization strategy used between workers which all run PyTorch.
+    # TENSOR_SERIALIZATION.RAW sends the memory of the tensors as is.
+    torch_tensor_serialization = codes.TENSOR_SERIALIZATION.TORCH
+
+    # Whether messages sent to this worker are serialized to a list of buffers
+    # (see syft.serde.msgpack.serialize_buffers) instead of a single binary
+    scatter_gather = False
+
+    # Whether the plans this worker receives or fetches are run with their TorchScript
+    # translation when they have one, instead of interpreting their actions
+    torchscript_plans = False
+
     def __init__(
         self,
         hook: "FrameworkHook",
@@ -302,10 +317,15 @@ class BaseWorker(AbstractWorker):
         if self.verbose:
             print(f"worker {self} sending {message} to {location}")
 
-        # Step 1: serialize the message to a binary
-        bin_message = sy.serde.serialize(message, worker=self)
+        # Step 1: serialize the message
+        bin_message = self._serialize_msg(message, location)
+
+        # Step 2: send the message and wait for a response, unless the location
+        # doesn't need to acknowledge this message
+        if location.is_fire_and_forget(message):
+            location._send_msg_nowait(bin_message)
+            return None
 
-        # Step 2: send the message and wait for a response
         bin_response = self._send_msg(bin_message, location)
 
         # Step 3: deserialize the response
@@ -313,6 +333,92 @@ class BaseWorker(AbstractWorker):
 
         return response
 
+    def _serialize_msg(self, message: Message, location: "BaseWorker") -> Union[bin, List[bin]]:
+        """Serializes a message to a binary, or to a list of buffers which the
+        location can send without concatenating them."""
+        if location.scatter_gather:
+            return sy.serde.msgpack.serialize_buffers(message, worker=self)
+        return sy.serde.serialize(message, worker=self)
+
+    def send_msgs(self, messages: List[Message], locations: List["BaseWorker"]) -> list:
+        """Sends several messages at once and returns their responses.
+
+        The messages to the locations which can pipeline requests are all sent
+        before waiting for any response, so that sending a message to each party
+        of a protocol costs a single round trip.
+
+        Args:
+            messages: the messages to send.
+            locations: the location of each message.
+
+        Returns:
+            The deserialized responses, in the order of the messages.
+        """
+        bin_responses = self._send_msgs(messages, locations)
+        return [
+            None if bin_response is None else sy.serde.deserialize(bin_response, worker=self)
+            for bin_response in bin_responses
+        ]
+
+    def _send_msgs(self, messages: List[Message], locations: List["BaseWorker"]) -> list:
+        """Sends several messages at once and returns their binary responses,
+        None for the messages which don't need to be acknowledged."""
+        pending = []
+        for message, location in zip(messages, locations):
+            bin_message = self._serialize_msg(message, location)
+            if location.is_fire_and_forget(message):
+                location._send_msg_nowait(bin_message)
+                pending.append(None)
+            else:
+                future = location._recv_msg_async(bin_message)
+                pending.append((bin_message, location) if future is None else future)
+
+        # The locations which can't pipeline requests are sent their messages
+        # while the others compute their responses
+        bin_responses = []
+        for response in pending:
+            if isinstance(response, tuple):
+                response = self._send_msg(*response)
+            bin_responses.append(response)
+        return [
+            response.result() if isinstance(response, Future) else response
+            for response in bin_responses
+        ]
+
+    def is_fire_and_forget(self, message: Message) -> bool:
+        """Tells whether a message sent to this worker can be sent without
+        waiting for its response.
+
+        Workers which can pipeline several requests on one connection override
+        this method, the others always wait for the response.
+
+        Args:
+            message: the message about to be sent to this worker.
+
+        Returns:
+            True if the sender should not wait for the response.
+        """
+        return False
+
+    def _send_msg_nowait(self, message: bin) -> None:
+        """Sends a binary message to this worker without waiting for the response.
+
+        Only called when is_fire_and_forget returns True.
+        """
+        raise NotImplementedError
+
+    def _recv_msg_async(self, message: bin) -> Union[Future, None]:
+        """Sends a binary message to this worker without blocking.
+
+        Workers which can pipeline several requests on one connection override
+        this method, the others return None and their messages are sent with
+        _send_msg.
+
+        Returns:
+            A future resolved with the binary response, or None.
+        """
+        return None
+
     def recv_msg(self, bin_message: bin) -> bin:
         """Implements the logic to receive messages.
 
@@ -330,6 +436,23 @@ class BaseWorker(AbstractWorker):
         # Step 0: deserialize message
         msg = sy.serde.deserialize(bin_message, worker=self)
 
+        # Step 1 and 2: log the message and route it to the appropriate function
+        response = self.route_msg(msg)
+
+        # Step 3: Serialize the message to simple python objects
+        bin_response = sy.serde.serialize(response, worker=self)
+
+        return bin_response
+
+    def route_msg(self, msg: Message) -> object:
+        """Routes a deserialized message to the handler supporting it.
+
+        Args:
+            msg: A deserialized message.
+
+        Returns:
+            The response of the handler, not serialized yet.
+        """
         # Step 1: save message and/or log it out
         if self.log_msgs:
             self.msg_history.append(msg)
@@ -350,10 +473,7 @@ class BaseWorker(AbstractWorker):
                 break
         # TODO(karlhigley): Raise an exception if no handler is found
 
-        # Step 3: Serialize the message to simple python objects
-        bin_response = sy.serde.serialize(response, worker=self)
-
-        return bin_response
+        return response
 
         # SECTION:recv_msg() uses self._message_router to route to these methods
 
@@ -490,6 +610,65 @@ class BaseWorker(AbstractWorker):
             ret_val = None
             return_ids = e.ids_generated
 
+        return self._command_responses(ret_val, recipient, return_ids, return_value)
+
+    def send_commands(
+        self,
+        recipients: List["BaseWorker"],
+        cmd_name: str,
+        target: PointerTensor = None,
+        args_list: List[tuple] = None,
+        kwargs_: dict = {},
+        return_ids_list: List[tuple] = None,
+        return_value: bool = False,
+    ) -> list:
+        """
+        Sends the same command to several recipients at once, see send_msgs.
+
+        Args:
+            recipients: the recipient workers.
+            cmd_name: Command number.
+            target: Target pointer Tensor.
+            args_list: the args for the command execution of each recipient.
+            kwargs_: additional kwargs for command execution.
+            return_ids_list: the return ids of each recipient.
+
+        Returns:
+            The responses of each recipient, as returned by send_command.
+        """
+        if args_list is None:
+            args_list = [()] * len(recipients)
+        if return_ids_list is None:
+            return_ids_list = [(sy.ID_PROVIDER.pop(),) for _ in recipients]
+
+        messages = [
+            TensorCommandMessage.computation(
+                cmd_name, target, args_, kwargs_, return_ids, return_value
+            )
+            for args_, return_ids in zip(args_list, return_ids_list)
+        ]
+        bin_responses = self._send_msgs(messages, recipients)
+
+        responses = []
+        for bin_response, recipient, return_ids in zip(
+            bin_responses, recipients, return_ids_list
+        ):
+            try:
+                if bin_response is None:
+                    ret_val = None
+                else:
+                    ret_val = sy.serde.deserialize(bin_response, worker=self)
+            except ResponseSignatureError as e:
+                ret_val = None
+                return_ids = e.ids_generated
+            responses.append(
+                self._command_responses(ret_val, recipient, return_ids, return_value)
+            )
+        return responses
+
+    def _command_responses(self, ret_val, recipient, return_ids, return_value):
+        """Builds the pointers to the results of a command, or their values if
+        return_value is True, unless the recipient already sent the results."""
         if ret_val is None or type(ret_val) == bytes:
             responses = []
             for return_id in return_ids:
@@ -881,6 +1060,89 @@ class BaseWorker(AbstractWorker):
     def feed_crypto_primitive_store(self, types_primitives: dict):
         self.crypto_store.add_primitives(types_primitives)
 
+    def expect_crypto_primitives(self, crypto_type: str, n_instances: int):
+        """Announces a refill of the crypto store, see PrimitiveStorage.expect_primitives"""
+        self.crypto_store.expect_primitives(crypto_type, n_instances)
+
+    def provide_crypto_primitives(
+        self,
+        crypto_types: List[str],
+        worker_ids: List[str],
+        n_instances: int,
+        chunk_size=None,
+        **kwargs,
+    ):
+        """Builds crypto primitives and sends them to some workers, used by the
+        workers to refill their crypto store and to preprocess beaver triples.
+        """
+        workers = [self.get_worker(worker_id) for worker_id in worker_ids]
+        self.crypto_store.provide_primitives(
+            crypto_types, workers, n_instances=n_instances, chunk_size=chunk_size, **kwargs
+        )
+
+    def count_beaver_triples(self, signature: tuple) -> int:
+        """Returns the number of beaver triples of a signature in the crypto store"""
+        return self.crypto_store.count_triples(signature)
+
+    def use_beaver_triple(self, signature: tuple, return_ids: List[Union[str, int]]):
+        """Pops a beaver triple of the crypto store and registers its shares
+        under return_ids.
+
+        Returns:
+            the shape of c
+        """
+        triple = self.crypto_store.get_triple(signature)
+        for share, return_id in zip(triple, return_ids):
+            self.register_obj(share, obj_id=return_id)
+        return tuple(triple[2].shape)
+
+    def spdz_send_shares(
+        self, share_ids: List[Union[str, int]], opener_id: Union[str, int], payload_id
+    ):
+        """Sends some shares to the worker opening them, see spdz.reconstruct_many"""
+        spdz.send_shares(self, share_ids, opener_id, payload_id)
+
+    def spdz_open_shares(
+        self,
+        share_ids: List[Union[str, int]],
+        payload_ids: List[Union[str, int]],
+        shapes: List[tuple],
+        field: int,
+        dtype: str,
+        return_ids: List[Union[str, int]],
+        location_ids: List[Union[str, int]],
+    ):
+        """Opens shares and sends back the opened values, see spdz.reconstruct_many"""
+        spdz.open_shares(
+            self, share_ids, payload_ids, shapes, field, dtype, return_ids, location_ids
+        )
+
+    def spdz_register_opened(self, opened, shapes: List[tuple], return_ids: List[Union[str, int]]):
+        spdz.register_opened(self, opened, shapes, return_ids)
+
+    def przs_setup(self, group: tuple, prev_id: Union[str, int]):
+        """Draws the PRZS seed of this worker for a group and gives it to the
+        previous party of the group."""
+        przs.setup_seeds(self, group, prev_id)
+
+    def przs_set_next_seed(self, group: tuple, seed: int):
+        przs.set_next_seed(self, group, seed)
+
+    def przs_zero_share(
+        self, group: tuple, shape: tuple, field: int, dtype: str, return_id: Union[str, int]
+    ):
+        """Generates locally the share of zero of this worker for a group and
+        registers it under return_id."""
+        share = przs.zero_share(self, group, shape, field, dtype)
+        self.register_obj(share, obj_id=return_id)
+
+    def przs_random_share(
+        self, seed: int, shape: tuple, field: int, dtype: str, return_id: Union[str, int]
+    ):
+        """Generates locally a random share from a seed and registers it under return_id."""
+        share = przs.random_share(seed, shape, field, dtype)
+        self.register_obj(share, obj_id=return_id)
+
     def list_tensors(self):
         return str(self.object_store._tensors)
 
@@ -932,7 +1194,7 @@ class BaseWorker(AbstractWorker):
             frameworks.add(framework)
 
         if len(frameworks) == 1 and frameworks == {"torch"}:
-            return codes.TENSOR_SERIALIZATION.TORCH
+            return self.torch_tensor_serialization
         else:
             return codes.TENSOR_SERIALIZATION.ALL
 
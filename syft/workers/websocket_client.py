@@ -1,7 +1,16 @@
 import binascii
+from concurrent.futures import Future
+import itertools
+import os
+import pickle
+import socket
+import struct
+import threading
 from typing import Union
 from typing import List
 
+import numpy
+import tblib.pickling_support
 import torch
 import websocket
 import websockets
@@ -14,7 +23,10 @@ import syft as sy
 
 from syft.exceptions import ResponseSignatureError
 
+from syft.messaging import framing
+from syft.messaging.message import ForceObjectDeleteMessage
 from syft.messaging.message import Message
+from syft.messaging.message import ObjectMessage
 from syft.messaging.message import ObjectRequestMessage
 from syft.messaging.message import SearchMessage
 from syft.messaging.message import TensorCommandMessage
@@ -22,10 +34,48 @@ from syft.generic.abstract.tensor import AbstractTensor
 from syft.generic.pointers.pointer_tensor import PointerTensor
 from syft.workers.base import BaseWorker
 
+# errors forwarded by the server are pickled with their traceback
+tblib.pickling_support.install()
+
 logger = logging.getLogger(__name__)
 
 TIMEOUT_INTERVAL = 60
 
+# Size of the chunks of a fragment masked at once before being sent, a multiple of
+# the 4 bytes of the mask key
+MASK_CHUNK_SIZE = 2 ** 20
+
+# Commands which always return exactly one tensor, so the pointer to their
+# result can be built without waiting for the response of the server
+FIRE_AND_FORGET_COMMANDS = {
+    "__add__",
+    "__sub__",
+    "__mul__",
+    "__truediv__",
+    "__matmul__",
+    "__neg__",
+    "__radd__",
+    "__rsub__",
+    "__rmul__",
+    "__iadd__",
+    "__isub__",
+    "__imul__",
+    "add",
+    "sub",
+    "mul",
+    "div",
+    "matmul",
+    "mm",
+    "neg",
+    "t",
+    "view",
+    "reshape",
+    "torch.add",
+    "torch.sub",
+    "torch.mul",
+    "torch.matmul",
+}
+
 
 class WebsocketClientWorker(BaseWorker):
     def __init__(
@@ -40,14 +90,44 @@ class WebsocketClientWorker(BaseWorker):
         verbose: bool = False,
         data: List[Union[torch.Tensor, AbstractTensor]] = None,
         timeout: int = None,
+        binary_transport: bool = True,
+        multiplexed: bool = False,
+        scatter_gather: bool = False,
     ):
         """A client which will forward all messages to a remote worker running a
         WebsocketServerWorker and receive all responses back from the server.
+
+        Args:
+            binary_transport: if True, serialized messages are sent as binary
+                websocket frames. Set it to False to talk to servers which only
+                understand the legacy hex encoded text frames.
+            multiplexed: if True, each message is tagged with a request id and
+                several requests can be in flight on the connection. Responses
+                are read by a background thread and matched with their request
+                by id. Messages which can't fail silently, such as object
+                deletions or commands in FIRE_AND_FORGET_COMMANDS, are then sent
+                without waiting for the acknowledgement of the server.
+            scatter_gather: if True, messages are serialized with the tensor memory
+                kept out of the msgpack message, and the message and the tensors are
+                sent as fragments of one websocket message instead of being
+                concatenated. Only applies to the binary transport.
         """
 
         self.port = port
         self.host = host
         self.timeout = TIMEOUT_INTERVAL if timeout is None else timeout
+        self.binary_transport = binary_transport
+        self.multiplexed = multiplexed
+        self.scatter_gather = scatter_gather and binary_transport
+
+        # state of the multiplexed mode: the futures of the requests in flight
+        # and the errors raised by the server for fire-and-forget requests
+        self._request_ids = itertools.count()
+        self._pending_requests = {}
+        self._fire_and_forget_requests = set()
+        self._deferred_errors = []
+        self._requests_lock = threading.Lock()
+        self._send_lock = threading.Lock()
 
         super().__init__(
             hook=hook,
@@ -76,6 +156,7 @@ class WebsocketClientWorker(BaseWorker):
             args_["sslopt"] = {"cert_reqs": ssl.CERT_NONE}
 
         self.ws = websocket.create_connection(**args_)
+        self._start_reader()
         self._log_msgs_remote(self.log_msgs)
 
     def close(self):
@@ -92,13 +173,287 @@ class WebsocketClientWorker(BaseWorker):
     def _send_msg(self, message: bin, location=None) -> bin:
         return self._recv_msg(message)
 
+    def is_fire_and_forget(self, message: Message) -> bool:
+        if not self.multiplexed:
+            return False
+        if isinstance(message, (ObjectMessage, ForceObjectDeleteMessage)):
+            return True
+        return (
+            isinstance(message, TensorCommandMessage)
+            and not message.return_value
+            and message.name in FIRE_AND_FORGET_COMMANDS
+        )
+
+    def _send_msg_nowait(self, message: bin) -> None:
+        self._send_framed(message, fire_and_forget=True)
+
+    def _recv_msg_async(self, message: bin) -> Union[Future, None]:
+        if not self.multiplexed:
+            return None
+        self._raise_deferred_errors()
+        return self._send_framed(message)
+
+    def _start_reader(self):
+        """Starts the thread reading the responses of the multiplexed requests."""
+        if self.multiplexed:
+            reader = threading.Thread(target=self._read_responses, args=(self.ws,), daemon=True)
+            reader.start()
+
+    def _read_responses(self, ws: websocket.WebSocket):
+        """Resolves the futures of the requests in flight as their responses arrive,
+        in any order.
+
+        Args:
+            ws: the connection to read from, the thread stops when it is closed.
+        """
+        while True:
+            try:
+                response = self._decode_response(self._recv_message(ws))
+            except websocket.WebSocketTimeoutException:
+                if ws.connected:
+                    # no response yet
+                    continue
+                self._fail_pending_requests("Websocket connection timed out")
+                return
+            except Exception as e:
+                self._fail_pending_requests(f"Websocket connection closed: {e}")
+                return
+
+            error = framing.is_error(response)
+            request_id, response = framing.unframe(response)
+            with self._requests_lock:
+                future = self._pending_requests.pop(request_id, None)
+                fire_and_forget = request_id in self._fire_and_forget_requests
+                self._fire_and_forget_requests.discard(request_id)
+
+            if error:
+                # the server failed to process the request
+                try:
+                    exception = pickle.loads(response)
+                except Exception as e:
+                    exception = RuntimeError(f"Unreadable error sent by the server: {e}")
+                if fire_and_forget:
+                    self._deferred_errors.append(exception)
+                elif future is not None:
+                    future.set_exception(exception)
+            elif fire_and_forget:
+                # nobody waits for this response, keep it only if it carries an
+                # error so that the error is raised on the next request
+                try:
+                    sy.serde.deserialize(response, worker=self)
+                except Exception as e:
+                    self._deferred_errors.append(e)
+            elif future is not None:
+                future.set_result(response)
+
+    def _fail_pending_requests(self, reason: str):
+        """Fails all the requests in flight once the connection is lost."""
+        with self._requests_lock:
+            pending, self._pending_requests = self._pending_requests, {}
+            self._fire_and_forget_requests.clear()
+        for future in pending.values():
+            future.set_exception(ConnectionError(reason))
+
+    def _send_framed(self, message: bin, fire_and_forget: bool = False) -> Future:
+        """Sends a message tagged with a new request id.
+
+        Args:
+            message: the serialized message.
+            fire_and_forget: if True, the response will be dropped unless it is an error.
+
+        Returns:
+            A future resolved with the serialized response.
+        """
+        future = Future()
+        with self._requests_lock:
+            request_id = next(self._request_ids)
+            if fire_and_forget:
+                self._fire_and_forget_requests.add(request_id)
+            else:
+                self._pending_requests[request_id] = future
+
+        with self._send_lock:
+            self._send_frame(framing.frame(request_id, message))
+        return future
+
+    def submit_msg(self, message: Message) -> Future:
+        """Sends a message without blocking, several messages can be in flight.
+
+        Only available in multiplexed mode.
+
+        Args:
+            message: the message to send.
+
+        Returns:
+            A future resolved with the serialized response, use
+            sy.serde.deserialize to read it.
+        """
+        if not self.multiplexed:
+            raise RuntimeError("submit_msg is only available with multiplexed=True")
+        return self._send_framed(sy.serde.serialize(message, worker=self))
+
+    def _raise_deferred_errors(self):
+        """Raises the first error received for a fire-and-forget request."""
+        if self._deferred_errors:
+            errors, self._deferred_errors = self._deferred_errors, []
+            raise errors[0]
+
+    def _send_frame(self, message: Union[bin, List[bin]]):
+        if isinstance(message, list):
+            if self.binary_transport:
+                self._send_fragments(message)
+                return
+            message = b"".join(message)
+
+        if self.binary_transport:
+            self.ws.send_binary(message)
+        else:
+            self.ws.send(str(binascii.hexlify(message)))
+
+    def _send_fragments(self, buffers: List[bin]):
+        """Sends buffers as the fragments of one binary websocket message.
+
+        The buffers are neither concatenated nor copied: each fragment is masked, as the
+        protocol requires for client frames, and sent by chunks of MASK_CHUNK_SIZE bytes.
+        """
+        last = len(buffers) - 1
+        for i, buffer in enumerate(buffers):
+            opcode = websocket.ABNF.OPCODE_BINARY if i == 0 else websocket.ABNF.OPCODE_CONT
+            self._send_masked_frame(memoryview(buffer).cast("B"), opcode, fin=int(i == last))
+
+    def _send_masked_frame(self, payload: memoryview, opcode: int, fin: int):
+        """Writes a masked websocket frame to the socket, masking its payload chunk by chunk."""
+        mask_key = os.urandom(4)
+        length = payload.nbytes
+
+        header = bytearray([(fin << 7) | opcode])
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 2 ** 16:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", length)
+        header += mask_key
+        self.ws.sock.sendall(header)
+
+        data = numpy.frombuffer(payload, dtype=numpy.uint8)
+        mask = numpy.frombuffer(mask_key * (MASK_CHUNK_SIZE // 4), dtype=numpy.uint8)
+        chunk = numpy.empty(MASK_CHUNK_SIZE, dtype=numpy.uint8)
+        for start in range(0, length, MASK_CHUNK_SIZE):
+            size = min(MASK_CHUNK_SIZE, length - start)
+            numpy.bitwise_xor(data[start : start + size], mask[:size], out=chunk[:size])
+            self.ws.sock.sendall(memoryview(chunk)[:size])
+
+    def _recv_message(self, ws: websocket.WebSocket) -> Union[str, bytearray]:
+        """Receives a websocket message into a writable buffer, on top of which the tensors it
+        holds are built without copy, see raw_tensor_deserializer.
+
+        Args:
+            ws: the connection to read from.
+
+        Returns:
+            The message, a str for text messages.
+
+        Raises:
+            WebSocketConnectionClosedException: if the server closed the connection.
+            WebSocketTimeoutException: if the server sent nothing for the timeout of the
+                connection, see _recv_exactly.
+        """
+        fragments = []
+        opcode = None
+        while True:
+            fin, frame_opcode, payload = self._recv_frame(ws, message_start=not fragments)
+            if frame_opcode == websocket.ABNF.OPCODE_PING:
+                ws.pong(bytes(payload))
+            elif frame_opcode == websocket.ABNF.OPCODE_CLOSE:
+                ws.send_close()
+                ws.shutdown()
+                raise websocket.WebSocketConnectionClosedException(
+                    "Connection closed by the server."
+                )
+            elif frame_opcode != websocket.ABNF.OPCODE_PONG:
+                if frame_opcode != websocket.ABNF.OPCODE_CONT:
+                    opcode = frame_opcode
+                fragments.append(payload)
+                if fin:
+                    break
+
+        message = fragments[0] if len(fragments) == 1 else bytearray().join(fragments)
+        if opcode == websocket.ABNF.OPCODE_TEXT:
+            return message.decode("utf-8")
+        return message
+
+    def _recv_frame(self, ws: websocket.WebSocket, message_start: bool) -> tuple:
+        """Reads a websocket frame from the socket.
+
+        Returns:
+            A tuple (fin, opcode, payload) where payload is a bytearray.
+        """
+        header = self._recv_exactly(ws, 2, message_start=message_start)
+        fin, opcode = header[0] >> 7, header[0] & 0x0F
+        masked, length = header[1] >> 7, header[1] & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._recv_exactly(ws, 2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._recv_exactly(ws, 8))
+
+        # servers never mask their frames
+        mask_key = self._recv_exactly(ws, 4) if masked else None
+        payload = self._recv_exactly(ws, length)
+        if mask_key is not None:
+            data = numpy.frombuffer(payload, dtype=numpy.uint8)
+            mask = numpy.resize(numpy.frombuffer(mask_key, dtype=numpy.uint8), length)
+            numpy.bitwise_xor(data, mask, out=data)
+        return fin, opcode, payload
+
+    @staticmethod
+    def _recv_exactly(ws: websocket.WebSocket, n_bytes: int, message_start: bool = False):
+        """Reads n_bytes from the socket into a new bytearray.
+
+        Args:
+            message_start: True if the bytes are the first ones of a message.
+
+        Raises:
+            WebSocketTimeoutException: if the server sent nothing for the timeout of the
+                connection. When the timeout happens in the middle of a message, the
+                position in the stream is lost and the connection is closed.
+        """
+        buffer = bytearray(n_bytes)
+        view = memoryview(buffer)
+        received = 0
+        while received < n_bytes:
+            try:
+                count = ws.sock.recv_into(view[received:])
+            except socket.timeout:
+                if not message_start or received > 0:
+                    ws.shutdown()
+                raise websocket.WebSocketTimeoutException("Connection timed out")
+            if count == 0:
+                raise websocket.WebSocketConnectionClosedException("Connection is already closed.")
+            received += count
+        return buffer
+
+    def _decode_response(self, response: Union[str, bytes]) -> bin:
+        if self.binary_transport:
+            return response
+        return binascii.unhexlify(response[2:-1])
+
     def _forward_to_websocket_server_worker(self, message: bin) -> bin:
         """
         Note: Is subclassed by the node client when you use the GridNode
         """
-        self.ws.send(str(binascii.hexlify(message)))
-        response = binascii.unhexlify(self.ws.recv()[2:-1])
-        return response
+        if self.multiplexed:
+            self._raise_deferred_errors()
+            response = self._send_framed(message).result(timeout=self.timeout)
+            # the server answers the requests of a connection in order, so the
+            # errors of the fire-and-forget requests sent before are known here
+            self._raise_deferred_errors()
+            return response
+
+        self._send_frame(message)
+        return self._decode_response(self._recv_message(self.ws))
 
     def _recv_msg(self, message: bin) -> bin:
         """Forwards a message to the WebsocketServerWorker"""
@@ -109,6 +464,7 @@ class WebsocketClientWorker(BaseWorker):
             time.sleep(0.1)
             # Avoid timing out on the server-side
             self.ws = websocket.create_connection(self.url, max_size=None, timeout=self.timeout)
+            self._start_reader()
             logger.warning("Created new websocket connection")
             time.sleep(0.1)
             response = self._forward_to_websocket_server_worker(message)
@@ -254,7 +610,10 @@ class WebsocketClientWorker(BaseWorker):
 
             # Send the message and return the deserialized response.
             serialized_message = sy.serde.serialize(message)
-            await websocket.send(str(binascii.hexlify(serialized_message)))
+            if self.binary_transport:
+                await websocket.send(serialized_message)
+            else:
+                await websocket.send(str(binascii.hexlify(serialized_message)))
             await websocket.recv()  # returned value will be None, so don't care
 
         # Reopen the standard connection
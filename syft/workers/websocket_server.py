@@ -1,7 +1,11 @@
 import asyncio
 import binascii
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import logging
+import pickle
 import ssl
+import threading
 from typing import Union
 from typing import List
 
@@ -13,11 +17,24 @@ import syft as sy
 from syft.generic.abstract.tensor import AbstractTensor
 from syft.workers.virtual import VirtualWorker
 
+from syft.messaging import framing
+from syft.messaging.message import ForceObjectDeleteMessage
+from syft.messaging.message import GetShapeMessage
+from syft.messaging.message import IsNoneMessage
+from syft.messaging.message import Message
+from syft.messaging.message import ObjectMessage
+from syft.messaging.message import ObjectRequestMessage
+from syft.messaging.message import TensorCommandMessage
+
 from syft.exceptions import GetNotPermittedError
 from syft.exceptions import ResponseSignatureError
 
 tblib.pickling_support.install()
 
+# Number of locks used to serialize the messages touching the same objects
+# when messages are processed concurrently
+N_OBJECT_LOCKS = 64
+
 
 class WebsocketServerWorker(VirtualWorker):
     def __init__(
@@ -32,6 +49,8 @@ class WebsocketServerWorker(VirtualWorker):
         loop=None,
         cert_path: str = None,
         key_path: str = None,
+        execution_mode: str = "inline",
+        max_workers: int = None,
     ):
         """This is a simple extension to normal workers wherein
         all messages are passed over websockets. Note that because
@@ -53,6 +72,13 @@ class WebsocketServerWorker(VirtualWorker):
                 yourself
             cert_path: path to used secure certificate, only needed for secure connections
             key_path: path to secure key, only needed for secure connections
+            execution_mode: "inline" processes the messages one at a time on
+                the event loop. "thread" hands them to a pool of threads so that
+                a slow command doesn't block the other clients; messages of the
+                same connection, or touching the same objects, are still
+                processed in order.
+            max_workers: the size of the thread pool in "thread" mode, see
+                concurrent.futures.ThreadPoolExecutor for the default value.
         """
 
         self.port = port
@@ -63,58 +89,137 @@ class WebsocketServerWorker(VirtualWorker):
         if loop is None:
             loop = asyncio.new_event_loop()
 
-        # this queue is populated when messages are received
-        # from a client
-        self.broadcast_queue = asyncio.Queue()
-
         # this is the asyncio event loop
         self.loop = loop
 
+        # the object store lives in this process, so messages can only be handed
+        # to threads sharing it
+        if execution_mode == "inline":
+            self.executor = None
+        elif execution_mode == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(
+                f"Unknown execution mode {execution_mode}, expected 'inline' or 'thread'"
+            )
+        self.execution_mode = execution_mode
+        # reentrant, as routing a message can route nested messages on the same objects
+        self._object_locks = [threading.RLock() for _ in range(N_OBJECT_LOCKS)]
+
         # call BaseWorker constructor
         super().__init__(hook=hook, id=id, data=data, log_msgs=log_msgs, verbose=verbose)
 
-    async def _consumer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+    async def _consumer_handler(
+        self, websocket: websockets.WebSocketCommonProtocol, queue: asyncio.Queue
+    ):
         """This handler listens for messages from WebsocketClientWorker
         objects.
 
         Args:
             websocket: the connection object to receive messages from and
                 add them into the queue.
+            queue: the queue of the messages received on this connection.
 
         """
         try:
             while True:
                 msg = await websocket.recv()
-                await self.broadcast_queue.put(msg)
+                await queue.put(msg)
         except websockets.exceptions.ConnectionClosed:
-            self._consumer_handler(websocket)
+            self._consumer_handler(websocket, queue)
 
-    async def _producer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+    async def _producer_handler(
+        self, websocket: websockets.WebSocketCommonProtocol, queue: asyncio.Queue
+    ):
         """This handler listens to the queue and processes messages as they
         arrive.
 
         Args:
             websocket: the connection object we use to send responses
                 back to the client.
+            queue: the queue of the messages received on this connection.
 
         """
         while True:
 
             # get a message from the queue
-            message = await self.broadcast_queue.get()
+            message = await queue.get()
+
+            # the transport mode is negotiated by the client: binary frames
+            # are answered with binary frames, text frames with hex text
+            binary_frame = isinstance(message, bytes)
+
+            # process the message, the response is awaited before the next
+            # message of this connection is processed
+            message = self._decode_frame(message)
+
+            # multiplexing clients tag their messages with a request id which
+            # is sent back with the response
+            request_id = None
+            if framing.is_framed(message):
+                request_id, message = framing.unframe(message)
+
+            try:
+                if self.executor is None:
+                    response = self._recv_msg(message)
+                else:
+                    response = await asyncio.get_event_loop().run_in_executor(
+                        self.executor, self._recv_msg, message
+                    )
+            except Exception as e:
+                if request_id is None:
+                    raise
+                # the client may have other requests in flight, send the error
+                # back as the response of this request and keep serving
+                response = framing.frame(request_id, self._pickle_error(e), error=True)
+            else:
+                if request_id is not None:
+                    response = framing.frame(request_id, response)
+
+            # send the response using the same transport mode
+            await websocket.send(self._encode_frame(response, binary_frame))
+
+    @staticmethod
+    def _decode_frame(frame: Union[str, bytes]) -> bin:
+        """Converts a received websocket frame to the binary message it carries.
+
+        Binary frames already hold the serialized message. Text frames come
+        from legacy clients which send `str(binascii.hexlify(message))`.
+
+        Args:
+            frame: the websocket frame received from a client.
 
-            # convert that string message to the binary it represent
-            message = binascii.unhexlify(message[2:-1])
+        Returns:
+            The serialized message.
+        """
+        if isinstance(frame, bytes):
+            return frame
+        return binascii.unhexlify(frame[2:-1])
 
-            # process the message
-            response = self._recv_msg(message)
+    @staticmethod
+    def _encode_frame(message: bin, binary_frame: bool) -> Union[str, bytes]:
+        """Converts a serialized response to a websocket frame.
 
-            # convert the binary to a string representation
-            # (this is needed for the websocket library)
-            response = str(binascii.hexlify(response))
+        Args:
+            message: the serialized response.
+            binary_frame: if True the response is sent as is in a binary frame,
+                otherwise it is hex encoded in a text frame for legacy clients.
 
-            # send the response
-            await websocket.send(response)
+        Returns:
+            The frame to send back to the client.
+        """
+        if binary_frame:
+            return message
+        return str(binascii.hexlify(message))
+
+    @staticmethod
+    def _pickle_error(error: Exception) -> bin:
+        """Pickles an exception with its traceback, or a RuntimeError describing it
+        if it can't be pickled."""
+        try:
+            return pickle.dumps(error)
+        except Exception:
+            return pickle.dumps(RuntimeError(f"{type(error).__name__}: {error}"))
 
     def _recv_msg(self, message: bin) -> bin:
         try:
@@ -122,6 +227,60 @@ class WebsocketServerWorker(VirtualWorker):
         except (ResponseSignatureError, GetNotPermittedError) as e:
             return sy.serde.serialize(e)
 
+    def route_msg(self, msg: Message) -> object:
+        """Routes a message while holding the locks of the objects it touches,
+        when messages are processed concurrently."""
+        if self.executor is None:
+            return super().route_msg(msg)
+
+        with self._lock_objects(self._message_object_ids(msg)):
+            return super().route_msg(msg)
+
+    @contextmanager
+    def _lock_objects(self, obj_ids: set):
+        """Acquires the locks of the given object ids.
+
+        Ids are mapped on a fixed set of locks which are always acquired in the
+        same order, so that two messages can't wait on each other.
+        """
+        indices = sorted({hash(obj_id) % N_OBJECT_LOCKS for obj_id in obj_ids})
+        locks = [self._object_locks[index] for index in indices]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @staticmethod
+    def _message_object_ids(msg: Message) -> set:
+        """Returns the ids of the objects read or written by a message."""
+
+        def collect_ids(obj, ids):
+            if isinstance(obj, (list, tuple)):
+                for element in obj:
+                    collect_ids(element, ids)
+            elif isinstance(obj, dict):
+                for element in obj.values():
+                    collect_ids(element, ids)
+            elif isinstance(obj, (int, str)):
+                ids.add(obj)
+            elif hasattr(obj, "id"):
+                ids.add(obj.id)
+
+        ids = set()
+        if isinstance(msg, TensorCommandMessage):
+            collect_ids((msg.target, msg.args, msg.kwargs), ids)
+            ids.update(msg.return_ids)
+        elif isinstance(msg, ObjectMessage):
+            collect_ids(msg.object, ids)
+        elif isinstance(msg, (ObjectRequestMessage, IsNoneMessage, ForceObjectDeleteMessage)):
+            collect_ids(msg.object_id, ids)
+        elif isinstance(msg, GetShapeMessage):
+            collect_ids(msg.tensor_id, ids)
+        return ids
+
     async def _handler(self, websocket: websockets.WebSocketCommonProtocol, *unused_args):
         """Setup the consumer and producer response handlers with asyncio.
 
@@ -131,8 +290,11 @@ class WebsocketServerWorker(VirtualWorker):
         """
 
         asyncio.set_event_loop(self.loop)
-        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket))
-        producer_task = asyncio.ensure_future(self._producer_handler(websocket))
+        # each connection has its own queue so that responses are sent back
+        # to the client which issued the request
+        queue = asyncio.Queue()
+        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket, queue))
+        producer_task = asyncio.ensure_future(self._producer_handler(websocket, queue))
 
         done, pending = await asyncio.wait(
             [consumer_task, producer_task], return_when=asyncio.FIRST_COMPLETED
@@ -173,3 +335,6 @@ class WebsocketServerWorker(VirtualWorker):
             asyncio.get_event_loop().run_forever()
         except KeyboardInterrupt:
             logging.info("Websocket server stopped.")
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
@@ -0,0 +1,75 @@
+import hashlib
+import time
+
+import pytest
+import torch as th
+
+import syft
+from syft.frameworks.torch.mpc import fss
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def _sha3_prg(seed, n_bits):
+    """The former PRG, hashing each seed column separately."""
+    gen_list = []
+    for seed_bit in seed.t().tolist():
+        r = hashlib.sha3_256(str(seed_bit).encode()).digest()
+        binary_str = bin(int.from_bytes(r, byteorder="big"))[2 : 2 + n_bits]
+        gen_list.append(list(map(int, binary_str)))
+    return th.tensor(gen_list, dtype=th.uint8).t()
+
+
+def test_prg_speedup():
+    n_values = 10 ** 4
+    seed_bits = th.randint(2, size=(fss.λ, n_values), dtype=th.uint8)
+    seed = fss.randseed(size=(fss.W, n_values))
+
+    t0 = time.time()
+    _sha3_prg(seed_bits, 2 * (fss.λ + 1))
+    t_sha3 = time.time() - t0
+
+    t0 = time.time()
+    output = fss.G(seed)
+    t_chacha = time.time() - t0
+
+    assert output.shape == (2, fss.W, n_values)
+    assert t_chacha < t_sha3
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(f"PRG on {n_values} seeds: sha3 {t_sha3:.3f} s, chacha {t_chacha:.3f} s")
+
+
+@pytest.mark.parametrize("op", ["eq", "le"])
+@assert_time(max_time=120)
+def test_fss_op_time(workers, op):
+    me, alice, bob, crypto_provider = (
+        workers["me"],
+        workers["alice"],
+        workers["bob"],
+        workers["james"],
+    )
+    n_values = 10 ** 5
+    type_op = {"eq": "fss_eq", "le": "fss_comp"}[op]
+
+    for worker in workers.values():
+        syft.frameworks.torch.mpc.fss.initialize_crypto_plans(worker)
+
+    t0 = time.time()
+    me.crypto_store.provide_primitives(
+        [type_op, "xor_add_couple"], [alice, bob], n_instances=n_values
+    )
+    t_keygen = time.time() - t0
+
+    kwargs = {"protocol": "fss", "crypto_provider": crypto_provider}
+    x = th.randint(-100, 100, (n_values,)).share(alice, bob, **kwargs)
+    y = th.randint(-100, 100, (n_values,)).share(alice, bob, **kwargs)
+
+    t0 = time.time()
+    getattr(fss, op)(x.child, y.child)
+    t_eval = time.time() - t0
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(f"fss.{op} on {n_values} values: keygen {t_keygen:.2f} s, eval {t_eval:.2f} s")
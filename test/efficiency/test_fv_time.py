@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from syft.frameworks.torch.he.fv.context import Context
+from syft.frameworks.torch.he.fv.decryptor import Decryptor
+from syft.frameworks.torch.he.fv.encryption_params import EncryptionParams
+from syft.frameworks.torch.he.fv.encryptor import Encryptor
+from syft.frameworks.torch.he.fv.evaluator import Evaluator
+from syft.frameworks.torch.he.fv.integer_encoder import IntegerEncoder
+from syft.frameworks.torch.he.fv.key_generator import KeyGenerator
+from syft.frameworks.torch.he.fv.modulus import CoeffModulus
+from syft.frameworks.torch.he.fv.modulus import SeqLevelType
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+@pytest.mark.parametrize("poly_modulus", [4096, 8192])
+@assert_time(max_time=2)
+def test_fv_encryption_decryption_time(poly_modulus):
+    ctx = Context(
+        EncryptionParams(
+            poly_modulus, CoeffModulus().bfv_default(poly_modulus, SeqLevelType.TC128), 1024
+        )
+    )
+    assert ctx.ntt_tables is not None
+    keys = KeyGenerator(ctx).keygen()
+    encoder = IntegerEncoder(ctx)
+    encryptor = Encryptor(ctx, keys[1])  # keys[1] = public_key
+    decryptor = Decryptor(ctx, keys[0])  # keys[0] = secret_key
+    plain = encoder.encode(314159265)
+
+    t0 = time.time()
+    encrypted = encryptor.encrypt(plain)
+    t_encrypt = time.time() - t0
+
+    t0 = time.time()
+    decrypted = decryptor.decrypt(encrypted)
+    t_decrypt = time.time() - t0
+
+    assert encoder.decode(decrypted) == 314159265
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"n = {poly_modulus}: encrypt {t_encrypt * 1000:.1f} ms, "
+            f"decrypt {t_decrypt * 1000:.1f} ms"
+        )
+
+
+@pytest.mark.parametrize("poly_modulus", [4096, 8192])
+@assert_time(max_time=5)
+def test_fv_multiplication_time(poly_modulus):
+    ctx = Context(
+        EncryptionParams(
+            poly_modulus, CoeffModulus().bfv_default(poly_modulus, SeqLevelType.TC128), 1024
+        )
+    )
+    keygenerator = KeyGenerator(ctx)
+    keys = keygenerator.keygen()
+    relin_keys = keygenerator.relin_keygen()
+    encoder = IntegerEncoder(ctx)
+    encryptor = Encryptor(ctx, keys[1])  # keys[1] = public_key
+    decryptor = Decryptor(ctx, keys[0])  # keys[0] = secret_key
+    evaluator = Evaluator(ctx)
+    op1 = encryptor.encrypt(encoder.encode(-1234))
+    op2 = encryptor.encrypt(encoder.encode(5678))
+
+    t0 = time.time()
+    product = evaluator.multiply(op1, op2)
+    t_multiply = time.time() - t0
+
+    t0 = time.time()
+    product = evaluator.relinearize(product, relin_keys)
+    t_relinearize = time.time() - t0
+
+    assert encoder.decode(decryptor.decrypt(product)) == -1234 * 5678
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"n = {poly_modulus}: multiply {t_multiply * 1000:.1f} ms, "
+            f"relinearize {t_relinearize * 1000:.1f} ms"
+        )
@@ -0,0 +1,68 @@
+import time
+
+import torch as th
+
+import syft as sy
+from syft.execution.placeholder import PlaceHolder
+from syft.execution.role import Role
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def _interpret(role):
+    """The former execution, interpreting each action at every call."""
+    for action in role.actions:
+        _self = role._fetch_placeholders_from_ids(action.target)
+        args_ = role._fetch_placeholders_from_ids(action.args)
+        kwargs_ = role._fetch_placeholders_from_ids(action.kwargs)
+        return_values = role._fetch_placeholders_from_ids(action.return_ids)
+        return_placeholders = []
+        Role.nested_object_traversal(return_values, return_placeholders.append, PlaceHolder)
+        if _self is None:
+            response = role._fetch_package_method(action.name)(*args_, **kwargs_)
+        else:
+            response = getattr(_self, action.name)(*args_, **kwargs_)
+        if not isinstance(response, (tuple, list)):
+            response = (response,)
+        PlaceHolder.instantiate_placeholders(return_placeholders, response)
+    return tuple(role.placeholders[output_id].child for output_id in role.output_placeholder_ids)
+
+
+@assert_time(max_time=60)
+def test_plan_execution_time(workers):
+    n_actions, n_runs = 200, 1000
+
+    @sy.func2plan(args_shape=[(1, 10)])
+    def plan(x):
+        for _ in range(n_actions // 2):
+            x = th.add(x, 1).mul(0.5)
+        return x
+
+    assert len(plan.actions) == n_actions
+
+    # A worker serving the plan receives it serialized
+    plan = sy.serde.deserialize(sy.serde.serialize(plan))
+    x = th.ones(1, 10)
+    expected = plan(x)
+
+    t0 = time.time()
+    for _ in range(n_runs):
+        plan.role.instantiate_inputs((x,))
+        _interpret(plan.role)
+    t_interpreted = time.time() - t0
+
+    t0 = time.time()
+    for _ in range(n_runs):
+        result = plan(x)
+    t_compiled = time.time() - t0
+
+    assert (result == expected).all()
+    assert t_compiled < t_interpreted
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"{n_runs} runs of a plan of {n_actions} actions: "
+            f"interpreted {t_interpreted:.2f} s, compiled {t_compiled:.2f} s"
+        )
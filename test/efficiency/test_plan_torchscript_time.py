@@ -0,0 +1,75 @@
+import time
+
+import torch as th
+import torch.nn as nn
+import torch.nn.functional as F
+
+import syft as sy
+from syft.execution.translation.torchscript import PlanTranslatorTorchscript
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+class MLP(sy.Plan):
+    def __init__(self):
+        super().__init__()
+        self.fc1 = nn.Linear(784, 128)
+        self.fc2 = nn.Linear(128, 64)
+        self.fc3 = nn.Linear(64, 10)
+
+    def forward(self, x):
+        x = F.relu(self.fc1(x))
+        x = F.relu(self.fc2(x))
+        return self.fc3(x)
+
+
+class CNN(sy.Plan):
+    def __init__(self):
+        super().__init__()
+        self.conv1 = nn.Conv2d(1, 8, 3)
+        self.conv2 = nn.Conv2d(8, 16, 3)
+        self.fc = nn.Linear(16 * 5 * 5, 10)
+
+    def forward(self, x):
+        x = F.max_pool2d(F.relu(self.conv1(x)), 2)
+        x = F.max_pool2d(F.relu(self.conv2(x)), 2)
+        return self.fc(x.view(-1, 16 * 5 * 5))
+
+
+def _time_calls(plan, x, n_runs):
+    t0 = time.time()
+    for _ in range(n_runs):
+        result = plan(x)
+    return time.time() - t0, result
+
+
+@assert_time(max_time=60)
+def test_plan_torchscript_time(workers):
+    n_runs = 200
+
+    for plan, x in ((MLP(), th.randn(16, 784)), (CNN(), th.randn(16, 1, 28, 28))):
+        plan.build(x)
+        plan.add_translation(PlanTranslatorTorchscript)
+
+        # A worker serving the plan receives it serialized and interprets its actions
+        interpreted_plan = sy.serde.deserialize(sy.serde.serialize(plan))
+        interpreted_plan.use_torchscript = False
+        t_interpreted, interpreted = _time_calls(interpreted_plan, x, n_runs)
+
+        plan.use_torchscript = False
+        t_forward, expected = _time_calls(plan, x, n_runs)
+
+        plan.use_torchscript = True
+        t_torchscript, result = _time_calls(plan, x, n_runs)
+
+        assert th.allclose(interpreted, expected, atol=1e-6)
+        assert th.allclose(result, expected, atol=1e-6)
+        assert t_torchscript < t_interpreted
+
+        if PRINT_IN_UNITTESTS:  # pragma: no cover
+            print(
+                f"{n_runs} runs of {type(plan).__name__}: interpreted {t_interpreted:.2f} s, "
+                f"forward {t_forward:.2f} s, TorchScript {t_torchscript:.2f} s"
+            )
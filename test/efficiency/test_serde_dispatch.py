@@ -0,0 +1,72 @@
+import cProfile
+import pstats
+import time
+
+import pytest
+
+import syft
+from syft.serde.msgpack import serde
+from test.efficiency.assertions import assert_time
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def _nested_message(n_items):
+    """Builds a message made of many small nested tuples, for which the cost of
+    dispatching each object to its simplifier dominates the serialization time."""
+    return [(i, (float(i), str(i)), {"id": i, "shape": (1, 2, 3)}) for i in range(n_items)]
+
+
+@pytest.mark.parametrize("n_items", [1000, 10000])
+@assert_time(max_time=10)
+def test_serde_dispatch_time(workers, n_items):
+    me = workers["me"]
+    message = _nested_message(n_items)
+
+    t0 = time.time()
+    binary = syft.serde.serialize(message, worker=me)
+    t_serialize = time.time() - t0
+
+    t0 = time.time()
+    result = syft.serde.deserialize(binary, worker=me)
+    t_deserialize = time.time() - t0
+
+    assert len(result) == n_items
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"{n_items} items: serialize {t_serialize * 1000:.1f} ms, "
+            f"deserialize {t_deserialize * 1000:.1f} ms"
+        )
+
+
+def test_serde_dispatch_profile(workers):
+    """Measures the share of the serialization time spent in the dispatch
+    functions themselves rather than in the simplifiers and detailers."""
+    me = workers["me"]
+    message = _nested_message(5000)
+    # Make sure the dispatch tables are built before profiling
+    syft.serde.deserialize(syft.serde.serialize(message, worker=me), worker=me)
+    assert not serde.msgpack_global_state.stale_state
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    syft.serde.deserialize(syft.serde.serialize(message, worker=me), worker=me)
+    profiler.disable()
+
+    stats = pstats.Stats(profiler).stats
+    total_time = sum(tottime for _, _, tottime, _, _ in stats.values())
+    dispatch_time = sum(
+        tottime
+        for (filename, _, function), (_, _, tottime, _, _) in stats.items()
+        if filename == serde.__file__ and function in ("_simplify", "_detail")
+    )
+    # The tables should not have been rebuilt while profiling
+    assert not any(
+        filename == serde.__file__ and function == "update"
+        for (filename, _, function) in stats
+    )
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(f"dispatch share: {100 * dispatch_time / total_time:.1f}%")
@@ -0,0 +1,104 @@
+from multiprocessing import Process
+from multiprocessing import Queue
+import resource
+import time
+
+import pytest
+import torch
+
+import syft
+from syft.workers.websocket_server import WebsocketServerWorker
+from test.conftest import instantiate_websocket_client_worker
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def _peak_rss_of_serialization(scatter_gather, size_mb, queue):  # pragma: no cover
+    """Serializes a tensor in a fresh process and reports the growth of the peak RSS."""
+    tensor = torch.rand(size_mb * 2 ** 20 // 4)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if scatter_gather:
+        buffers = syft.serde.msgpack.serialize_buffers(tensor)
+        n_bytes = sum(memoryview(buffer).nbytes for buffer in buffers)
+    else:
+        binary = syft.serde.serialize(tensor)
+        n_bytes = len(binary)
+
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in kilobytes
+    queue.put(((after - before) / 1024, n_bytes))
+
+
+@pytest.mark.parametrize("size_mb", [64, 1024])
+def test_serde_peak_memory(hook, size_mb):
+    """Compares the peak memory needed to serialize a tensor with the default
+    strategy and with the zero-copy scatter-gather strategy."""
+    results = {}
+    for scatter_gather in (False, True):
+        queue = Queue()
+        process = Process(
+            target=_peak_rss_of_serialization, args=(scatter_gather, size_mb, queue)
+        )
+        process.start()
+        results[scatter_gather] = queue.get()
+        process.join()
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        for scatter_gather, (peak_mb, n_bytes) in results.items():
+            mode = "scatter-gather" if scatter_gather else "default"
+            print(f"{size_mb} MB tensor, {mode}: +{peak_mb:.0f} MB peak RSS, {n_bytes} bytes")
+
+    # the default strategy makes several full size copies of the tensor
+    default_peak, _ = results[False]
+    scatter_gather_peak, _ = results[True]
+    assert scatter_gather_peak < size_mb / 2
+    assert scatter_gather_peak < default_peak
+
+
+def _peak_rss_of_send(scatter_gather, size_mb, kwargs, queue):  # pragma: no cover
+    """Sends a tensor through a websocket client in a fresh process and reports the
+    growth of the peak RSS."""
+    remote_proxy = instantiate_websocket_client_worker(scatter_gather=scatter_gather, **kwargs)
+    tensor = torch.rand(size_mb * 2 ** 20 // 4)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    pointer = tensor.send(remote_proxy)
+
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pointer.get()
+    remote_proxy.close()
+    # ru_maxrss is given in kilobytes
+    queue.put((after - before) / 1024)
+
+
+def test_websocket_send_peak_memory(hook, start_proc):
+    """Compares the peak memory needed to send a 1 GB tensor to a websocket server with
+    the default strategy and with the zero-copy scatter-gather strategy."""
+    size_mb = 1024
+    kwargs = {"id": "fed-send-memory-bench", "host": "localhost", "port": 8792, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+    time.sleep(0.1)
+
+    results = {}
+    for scatter_gather in (False, True):
+        queue = Queue()
+        process = Process(
+            target=_peak_rss_of_send, args=(scatter_gather, size_mb, kwargs, queue)
+        )
+        process.start()
+        results[scatter_gather] = queue.get()
+        process.join()
+
+    server.terminate()
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        for scatter_gather, peak_mb in results.items():
+            mode = "scatter-gather" if scatter_gather else "default"
+            print(f"Send of a {size_mb} MB tensor, {mode}: +{peak_mb:.0f} MB peak RSS")
+
+    # the default strategy copies the tensor to serialize and then to mask the frame,
+    # the scatter-gather one only masks chunks of MASK_CHUNK_SIZE bytes
+    assert results[True] < size_mb / 2
+    assert results[True] < results[False]
@@ -0,0 +1,47 @@
+import pytest
+import torch
+
+PRINT_IN_UNITTESTS = False
+
+
+def _count_received_bytes(monkeypatch, worker, counter):
+    recv_msg = worker._recv_msg
+
+    def _recv_msg(message):
+        if isinstance(message, (list, tuple)):
+            counter[worker.id] += sum(memoryview(buffer).nbytes for buffer in message)
+        else:
+            counter[worker.id] += len(message)
+        return recv_msg(message)
+
+    monkeypatch.setattr(worker, "_recv_msg", _recv_msg)
+
+
+@pytest.mark.parametrize("size", [512])
+def test_spdz_matmul_bytes(workers, monkeypatch, size):
+    """Measures the bytes received by the parties during a private matmul.
+
+    Adding the public delta @ epsilon to the first share only used to ship a
+    tensor of ones or zeros of the size of the result to each party, that is
+    n_parties * size * size * 8 bytes (4 MiB for 512x512 with 2 parties)."""
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    x = torch.randint(-10, 10, (size, size)).share(alice, bob, crypto_provider=james)
+    y = torch.randint(-10, 10, (size, size)).share(alice, bob, crypto_provider=james)
+
+    received = {alice.id: 0, bob.id: 0}
+    for worker in (alice, bob):
+        _count_received_bytes(monkeypatch, worker, received)
+
+    _ = x @ y
+
+    tensor_bytes = size * size * 8
+    # the shares of the triple and the openings of delta and epsilon
+    expected_bytes = 3 * 2 * tensor_bytes + 2 * 2 * tensor_bytes
+    saved_bytes = 2 * tensor_bytes
+    assert sum(received.values()) < expected_bytes + saved_bytes / 2
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(
+            f"{size}x{size} matmul: {sum(received.values()) / 2 ** 20:.1f} MiB received, "
+            f"{saved_bytes / 2 ** 20:.1f} MiB saved"
+        )
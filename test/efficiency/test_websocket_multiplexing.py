@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import torch
+import websockets
+
+from syft.workers.websocket_server import WebsocketServerWorker
+from test.conftest import instantiate_websocket_client_worker
+
+
+PRINT_IN_UNITTESTS = False
+
+# one way latency injected by the stand-in server, in seconds
+LATENCY = 0.02
+
+
+class LatencyWebsocketServerWorker(WebsocketServerWorker):
+    """Local stand-in of a remote server: every received frame is delayed
+    by LATENCY before being processed, as if it crossed a slow network."""
+
+    async def _consumer_handler(self, websocket, queue):
+        async def delayed_put(msg):
+            await asyncio.sleep(LATENCY)
+            await queue.put(msg)
+
+        try:
+            while True:
+                msg = await websocket.recv()
+                asyncio.ensure_future(delayed_put(msg))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+def _run_chain(remote_proxy, n_ops):
+    x = torch.ones(10).send(remote_proxy)
+    y = x
+    t0 = time.time()
+    for _ in range(n_ops):
+        y = y + x
+    result = y.get()
+    return result, time.time() - t0
+
+
+def test_multiplexed_requests_latency(hook, start_proc):
+    """Compares a chain of remote additions with one blocking round trip per
+    command and with pipelined fire-and-forget commands."""
+    n_ops = 50
+    kwargs = {"id": "fed-multiplexing-bench", "host": "localhost", "port": 8791, "hook": hook}
+    server = start_proc(LatencyWebsocketServerWorker, **kwargs)
+    time.sleep(0.1)
+
+    durations = {}
+    for multiplexed in (False, True):
+        remote_proxy = instantiate_websocket_client_worker(multiplexed=multiplexed, **kwargs)
+
+        result, durations[multiplexed] = _run_chain(remote_proxy, n_ops)
+        assert (result == torch.ones(10) * (n_ops + 1)).all()
+
+        remote_proxy.close()
+        time.sleep(0.1)
+        remote_proxy.remove_worker_from_local_worker_registry()
+
+    server.terminate()
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        print(f"{n_ops} ops, blocking: {durations[False]:.3f} s")
+        print(f"{n_ops} ops, multiplexed: {durations[True]:.3f} s")
+
+    # each blocking command pays at least the injected latency
+    assert durations[False] > n_ops * LATENCY
+    assert durations[True] < durations[False] / 2
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+import torch
+
+from syft.workers.websocket_server import WebsocketServerWorker
+from test.conftest import instantiate_websocket_client_worker
+
+
+PRINT_IN_UNITTESTS = False
+
+
+def _count_sent_bytes(remote_proxy):
+    """Wraps the client websocket so that the size of the sent frames is recorded."""
+    counter = {"bytes": 0}
+    send = remote_proxy.ws.send
+
+    def counting_send(payload, *args, **kwargs):
+        counter["bytes"] += len(payload)
+        return send(payload, *args, **kwargs)
+
+    remote_proxy.ws.send = counting_send
+    return counter
+
+
+@pytest.mark.parametrize("size_mb", [1, 10, 100])
+def test_websocket_transport_bytes_and_latency(hook, start_proc, size_mb):
+    """Compares the bytes on the wire and the round trip latency of the binary
+    and the legacy hex transport modes."""
+    kwargs = {
+        "id": f"fed-transport-bench-{size_mb}",
+        "host": "localhost",
+        "port": 8790,
+        "hook": hook,
+    }
+    server = start_proc(WebsocketServerWorker, **kwargs)
+    time.sleep(0.1)
+
+    tensor = torch.rand(size_mb * 2 ** 20 // 4)
+    results = {}
+
+    for binary_transport in (True, False):
+        remote_proxy = instantiate_websocket_client_worker(
+            binary_transport=binary_transport, **kwargs
+        )
+        counter = _count_sent_bytes(remote_proxy)
+
+        t0 = time.time()
+        result = tensor.send(remote_proxy).get()
+        latency = time.time() - t0
+
+        assert (result == tensor).all()
+        results[binary_transport] = (counter["bytes"], latency)
+
+        remote_proxy.close()
+        time.sleep(0.1)
+        remote_proxy.remove_worker_from_local_worker_registry()
+
+    server.terminate()
+
+    if PRINT_IN_UNITTESTS:  # pragma: no cover
+        for binary_transport, (n_bytes, latency) in results.items():
+            mode = "binary" if binary_transport else "hex"
+            print(f"{size_mb} MB tensor, {mode}: {n_bytes} bytes sent, {latency:.3f} s round trip")
+
+    binary_bytes, _ = results[True]
+    hex_bytes, _ = results[False]
+    # hex encoding doubles the payload
+    assert binary_bytes * 1.9 < hex_bytes
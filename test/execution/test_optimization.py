@@ -0,0 +1,138 @@
+import torch
+
+import syft as sy
+from syft.execution.optimization.constant_folding import PlanOptimizerConstantFolding
+from syft.execution.optimization.cse import PlanOptimizerCSE
+from syft.execution.optimization.dead_code import PlanOptimizerDeadCode
+from syft.serde.serde import deserialize
+from syft.serde.serde import serialize
+
+
+def _run_actions(plan, *args):
+    """Runs the optimized actions rather than the original function."""
+    plan.role.instantiate_inputs(args)
+    result = plan.role.execute()
+    return result[0] if len(result) == 1 else result
+
+
+def test_dead_code_elimination():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        unused = x * 3  # noqa: F841
+        return x + 1
+
+    assert len(plan.actions) == 2
+    assert plan.optimize(PlanOptimizerDeadCode) == {"PlanOptimizerDeadCode": 1}
+    assert len(plan.actions) == 1
+    assert len(plan.role.placeholders) == 2
+
+    x = torch.tensor([1.0, 2.0, 3.0])
+    assert (_run_actions(plan, x) == x + 1).all()
+
+
+def test_common_subexpression_elimination():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        y = x * 2
+        z = x * 2
+        return y + z, z
+
+    assert len(plan.actions) == 3
+    assert plan.optimize(PlanOptimizerCSE) == {"PlanOptimizerCSE": 1}
+    assert len(plan.actions) == 2
+
+    x = torch.tensor([1.0, 2.0, 3.0])
+    result, double = _run_actions(plan, x)
+    assert (result == x * 4).all()
+    assert (double == x * 2).all()
+
+
+def test_constant_folding():
+    weight = torch.tensor([1.0, 2.0, 3.0])
+
+    @sy.func2plan(args_shape=[(3,)], state=(weight,))
+    def plan(x, state):
+        (w,) = state.read()
+        return x * (w * 2)
+
+    assert plan.optimize() == {
+        "PlanOptimizerConstantFolding": 1,
+        "PlanOptimizerCSE": 0,
+        "PlanOptimizerDeadCode": 0,
+    }
+    assert len(plan.actions) == 1
+
+    x = torch.tensor([1.0, 1.0, 2.0])
+    assert (_run_actions(plan, x) == x * weight * 2).all()
+
+    plan_copy = deserialize(serialize(plan))
+    assert (plan_copy(x) == x * weight * 2).all()
+
+
+def test_optimization_keeps_inplace_actions():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        y = x * 2
+        y.add_(1)
+        y * 2
+        return x + 1, y
+
+    n_actions = len(plan.actions)
+    assert plan.optimize() == {
+        "PlanOptimizerConstantFolding": 0,
+        "PlanOptimizerCSE": 0,
+        "PlanOptimizerDeadCode": 1,
+    }
+    assert len(plan.actions) == n_actions - 1
+
+    x = torch.tensor([1.0, 2.0, 3.0])
+    result, y = _run_actions(plan, x)
+    assert (result == x + 1).all()
+    assert (y == x * 2 + 1).all()
+
+
+def test_cse_keeps_results_modified_in_place():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        y = x * 2
+        z = x * 2
+        z.add_(1)
+        return y, z
+
+    assert plan.optimize(PlanOptimizerCSE) == {"PlanOptimizerCSE": 0}
+
+    x = torch.tensor([1.0, 2.0, 3.0])
+    y, z = _run_actions(plan, x)
+    assert (y == x * 2).all()
+    assert (z == x * 2 + 1).all()
+
+
+def test_constant_folding_keeps_results_modified_in_place():
+    weight = torch.tensor([1.0, 2.0, 3.0])
+
+    @sy.func2plan(args_shape=[(3,)], state=(weight,))
+    def plan(x, state):
+        (w,) = state.read()
+        v = w * 2
+        v.add_(1)
+        return x * v
+
+    assert plan.optimize(PlanOptimizerConstantFolding) == {"PlanOptimizerConstantFolding": 0}
+
+    x = torch.tensor([1.0, 1.0, 2.0])
+    for _ in range(2):
+        assert (_run_actions(plan, x) == x * (weight * 2 + 1)).all()
+
+
+def test_constant_folding_skips_state_modified_in_place():
+    @sy.func2plan(args_shape=[(3,)], state=(torch.tensor([1.0, 2.0, 3.0]),))
+    def plan(x, state):
+        (w,) = state.read()
+        w.add_(1)
+        return x * (w * 2)
+
+    assert plan.optimize(PlanOptimizerConstantFolding) == {"PlanOptimizerConstantFolding": 0}
+
+    x = torch.tensor([1.0, 1.0, 2.0])
+    first = _run_actions(plan, x)
+    assert (_run_actions(plan, x) == first + 2 * x).all()
@@ -1020,3 +1020,72 @@ def test_backward_autograd_can_be_traced(hook, workers):
     return out_1"""
     assert autograd_test.code == autograd_str
     assert torch_grads.eq(plan_grads).all()
+
+
+def test_plan_map(hook, workers):
+    weight = th.tensor([[1.0, -1.0], [2.0, 0.5], [0.0, 1.0]])
+
+    @sy.func2plan(args_shape=[(3,)], state=(weight,))
+    def plan(x, state):
+        (w,) = state.read()
+        y = F.relu(x * 2 - 1).matmul(w)
+        return y, y.sum()
+
+    inputs = [th.tensor([1.0, 2.0, 3.0]), th.tensor([-1.0, 0.5, 2.0]), th.tensor([0.0, 0.0, 1.0])]
+    results = plan.map(inputs)
+
+    assert len(results) == len(inputs)
+    for x, (y, total) in zip(inputs, results):
+        expected_y, expected_total = plan(x)
+        assert (y == expected_y).all()
+        assert total == expected_total
+
+    assert plan.map([]) == []
+
+
+def test_plan_map_with_inplace_actions(hook, workers):
+    @sy.func2plan(args_shape=[(2,)])
+    def plan(x):
+        y = x * 2
+        y.add_(1)
+        return y
+
+    inputs = [(th.tensor([1.0, 2.0]),), (th.tensor([3.0, 4.0]),)]
+    results = plan.map(inputs)
+
+    assert (results[0] == th.tensor([3.0, 5.0])).all()
+    assert (results[1] == th.tensor([7.0, 9.0])).all()
+
+
+def test_pointer_plan_map(hook, workers):
+    bob = workers["bob"]
+
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        return x.abs() + 1
+
+    plan_ptr = plan.send(bob)
+    inputs = [th.tensor([-1.0, 7.0, 3.0]), th.tensor([2.0, -2.0, 0.0])]
+    results = plan_ptr.map([x.send(bob) for x in inputs])
+
+    assert len(results) == len(inputs)
+    for x, result in zip(inputs, results):
+        assert (result.get() == x.abs() + 1).all()
+
+
+def test_pointer_plan_map_with_several_outputs(hook, workers):
+    bob = workers["bob"]
+
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        y = x.abs() + 1
+        return y, y * 2
+
+    plan_ptr = plan.send(bob)
+    inputs = [th.tensor([-1.0, 7.0, 3.0]), th.tensor([2.0, -2.0, 0.0])]
+    results = plan_ptr.map([x.send(bob) for x in inputs])
+
+    assert len(results) == len(inputs)
+    for x, (y, z) in zip(inputs, results):
+        assert (y.get() == x.abs() + 1).all()
+        assert (z.get() == (x.abs() + 1) * 2).all()
@@ -1,5 +1,6 @@
 import torch
 
+import syft as sy
 from syft.execution.role import Role
 from syft.execution.placeholder import PlaceHolder
 from syft.execution.computation import ComputationAction
@@ -72,3 +73,49 @@ def test_reset():
     assert len(role.placeholders) == 0
     assert role.input_placeholder_ids == ()
     assert role.output_placeholder_ids == ()
+
+
+def test_execute_compiled_program():
+    @sy.func2plan(args_shape=[(3,)])
+    def plan(x):
+        y = x + 1
+        return torch.mul(y, 2)
+
+    role = plan.role
+    program = role._program
+    assert program is not None
+    assert len(program) == len(role.actions) == 2
+
+    role.instantiate_inputs((torch.tensor([1.0, 2.0, 3.0]),))
+    assert (role.execute()[0] == torch.tensor([4.0, 6.0, 8.0])).all()
+    # Executions reuse the program compiled at build time
+    assert role._program is program
+
+    role.instantiate_inputs((torch.tensor([0.0, 0.0, 0.0]),))
+    assert (role.execute()[0] == torch.tensor([2.0, 2.0, 2.0])).all()
+
+    # Changing the actions compiles the program again
+    role.actions = role.actions[:1]
+    role.output_placeholder_ids = (role.actions[0].return_ids[0].value,)
+    assert (role.execute()[0] == torch.tensor([1.0, 1.0, 1.0])).all()
+    assert role._program is not program
+
+
+def test_execute_releases_intermediate_tensors():
+    @sy.func2plan(args_shape=[(3,)], state=(torch.tensor([1.0, 1.0, 1.0]),))
+    def plan(x, state):
+        (bias,) = state.read()
+        y = x + bias
+        z = y * 2
+        return z - y
+
+    role = plan.role
+    x = torch.tensor([1.0, 2.0, 3.0])
+    for _ in range(2):
+        role.instantiate_inputs((x,))
+        assert (role.execute()[0] == x + 1).all()
+
+    kept_ids = {*role.input_placeholder_ids, *role.output_placeholder_ids}
+    kept_ids.update(ph.id.value for ph in role.state.state_placeholders)
+    for id_, placeholder in role.placeholders.items():
+        assert (placeholder.child is not None) == (id_ in kept_ids)
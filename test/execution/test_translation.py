@@ -338,3 +338,31 @@ def test_fl_mnist_example_training_can_be_translated(hook, workers):
     for i, out in enumerate(res_torch):
         assert th.allclose(out, res_syft_traced[i])
         assert th.allclose(out, res_torchscript[i])
+
+
+def test_plan_called_on_torchscript(hook, workers):
+    @sy.func2plan(args_shape=[(3,)], state=(th.tensor([1.0, 2.0, 3.0]),))
+    def plan(x, state):
+        (bias,) = state.read()
+        return x * 2 + bias
+
+    plan.add_translation(PlanTranslatorTorchscript)
+    assert plan.use_torchscript
+
+    x = th.tensor([1.0, 0.0, -1.0])
+    expected = x * 2 + th.tensor([1.0, 2.0, 3.0])
+    assert plan._torchscript_enabled((x,))
+    assert (plan(x) == expected).all()
+
+    # Syft tensors are given to the original function
+    assert not plan._torchscript_enabled((x.fix_prec(),))
+
+    # Plans received by a worker are run with TorchScript if the worker opted in
+    worker = sy.VirtualWorker(hook, id="torchscript_worker")
+    fetched_plan = deserialize(serialize(plan))
+    fetched_plan.owner = worker
+    assert not fetched_plan._torchscript_enabled((x,))
+
+    worker.torchscript_plans = True
+    assert fetched_plan._torchscript_enabled((x,))
+    assert (fetched_plan(x) == expected).all()
@@ -0,0 +1,30 @@
+from syft.messaging import framing
+
+
+def test_frame_unframe():
+    message = b"\x29serialized message"
+    framed = framing.frame(42, message)
+
+    assert framing.is_framed(framed)
+    assert not framing.is_framed(message)
+    assert framing.unframe(framed) == (42, message)
+    assert not framing.is_error(framed)
+
+
+def test_frame_error():
+    framed = framing.frame(42, b"pickled exception", error=True)
+
+    assert framing.is_framed(framed)
+    assert framing.is_error(framed)
+    assert framing.unframe(framed) == (42, b"pickled exception")
+
+
+def test_unframe_writable_message_without_copy():
+    framed = bytearray(framing.frame(42, b"\x29serialized message"))
+
+    request_id, message = framing.unframe(framed)
+
+    assert request_id == 42
+    assert isinstance(message, memoryview)
+    assert message.obj is framed
+    assert bytes(message) == b"\x29serialized message"
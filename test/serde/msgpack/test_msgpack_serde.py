@@ -13,6 +13,7 @@ import syft
 from syft.frameworks.torch.tensors.interpreters.additive_shared import AdditiveSharingTensor
 from syft.generic.pointers.object_wrapper import ObjectWrapper
 from syft.generic.pointers.pointer_tensor import PointerTensor
+from syft.messaging.message import ObjectRequestMessage
 from syft.serde import compression
 from syft.serde import msgpack
 from syft.serde import serde
@@ -226,6 +227,57 @@ def test_torch_tensor_serde_generic(workers):
     assert (input == detailed).all()
 
 
+@pytest.mark.parametrize(
+    "tensor",
+    [
+        torch.randn(4, 5),
+        torch.randn(4, 5).t(),
+        torch.randint(0, 10, (3, 3, 3)),
+        torch.tensor([True, False]),
+        torch.tensor(3.5, requires_grad=True),
+    ],
+)
+def test_torch_tensor_serde_raw(workers, tensor):
+    """This tests our ability to ser-de torch.Tensor objects
+    using "raw" serialization strategy
+    """
+    me = workers["me"]
+    me.torch_tensor_serialization = syft.codes.TENSOR_SERIALIZATION.RAW
+    try:
+        output = msgpack.serde._simplify(me, tensor)
+        packed = msgpack_lib.dumps(output)
+        detailed = msgpack.serde._detail(me, msgpack_lib.loads(packed, use_list=False))
+    finally:
+        me.torch_tensor_serialization = syft.codes.TENSOR_SERIALIZATION.TORCH
+
+    assert type(output[1][1][4]) == memoryview
+    assert detailed.shape == tensor.shape
+    assert detailed.dtype == tensor.dtype
+    assert detailed.requires_grad == tensor.requires_grad
+    assert (detailed == tensor).all()
+
+
+def test_serialize_buffers(workers):
+    """Tensors serialized with serialize_buffers are kept out of the message."""
+    me = workers["me"]
+    x = torch.randn(100, 10)
+    y = torch.randint(0, 10, (50,))
+
+    buffers = msgpack.serialize_buffers((x, y), worker=me)
+
+    assert len(buffers) == 4
+    # the tensor memory is not copied
+    assert numpy.shares_memory(numpy.frombuffer(buffers[2], dtype=numpy.float32), x.numpy())
+
+    # a writable binary is not copied
+    x_back, y_back = syft.serde.deserialize(bytearray(b"".join(buffers)), worker=me)
+    assert (x_back == x).all()
+    assert (y_back == y).all()
+
+    x_back[0, 0] = 42.0
+    assert x_back[0, 0] == 42.0
+
+
 def test_tensor_gradient_serde():
     # create a tensor
     x = torch.tensor([1, 2, 3, 4.0], requires_grad=True)
@@ -435,6 +487,59 @@ def test_compress_decompress(compress_scheme):
     assert original == decompressed
 
 
+def test_compression_policy():
+    policy = compression.CompressionPolicy(min_size=512, entropy_check_size=4096)
+
+    # small binaries are not compressed
+    _, scheme = policy.compress(b"\x00" * 100)
+    assert scheme == compression.NO_COMPRESSION
+
+    # compressible binaries are compressed with LZ4
+    _, scheme = policy.compress(b"\x00" * 10000)
+    assert scheme == compression.LZ4
+
+    # random looking binaries, like additive shares, are not compressed
+    shares = torch.randint(-(2 ** 62), 2 ** 62, (10000,)).numpy().tobytes()
+    assert compression.byte_entropy(shares) > policy.max_entropy
+    stream, scheme = policy.compress(shares)
+    assert scheme == compression.NO_COMPRESSION
+    assert stream == shares
+
+    # compressions which don't reduce the size are dropped
+    random_bytes = numpy.random.bytes(1000)
+    stream, scheme = policy.compress(random_bytes)
+    assert scheme == compression.NO_COMPRESSION
+    assert stream == random_bytes
+
+    statistics = policy.statistics()
+    assert statistics[compression.NO_COMPRESSION]["hits"] == 3
+    assert statistics[compression.NO_COMPRESSION]["bytes_in"] == 100 + len(shares) + 1000
+    assert statistics[compression.LZ4]["hits"] == 1
+    assert statistics[compression.LZ4]["rejected"] == 1
+    assert statistics[compression.LZ4]["ratio"] < 0.1
+
+    policy.reset_statistics()
+    assert policy.statistics() == {}
+
+
+@pytest.mark.skipif(not syft.dependency_check.zstd_available, reason="zstandard not installed")
+def test_compression_policy_zstd_dictionary(workers):
+    me = workers["me"]
+    reason = "requested by the owner of the pointer"
+    samples = [
+        msgpack_lib.dumps(
+            msgpack.serde._simplify(me, ObjectRequestMessage(syft.ID_PROVIDER.pop(), None, reason))
+        )
+        for _ in range(1000)
+    ]
+    dictionary = compression.train_zstd_dictionary(samples, dict_size=4096)
+    policy = compression.CompressionPolicy(zstd_dictionary=dictionary)
+
+    stream, scheme = policy.compress(samples[0])
+    assert scheme == compression.ZSTD
+    assert compression._decompress(compression.scheme_to_bytes[scheme] + stream) == samples[0]
+
+
 @pytest.mark.parametrize(
     "compress_scheme", [compression.LZ4, compression.ZLIB, compression.NO_COMPRESSION]
 )
@@ -57,6 +57,8 @@ samples[syft.execution.role_assignments.RoleAssignments] = make_role_assignments
 samples[syft.execution.state.State] = make_state
 
 samples[syft.frameworks.torch.fl.dataset.BaseDataset] = make_basedataset
+samples[syft.frameworks.torch.he.fv.ciphertext.CipherText] = make_ciphertext
+samples[syft.frameworks.torch.he.fv.plaintext.PlainText] = make_plaintext
 samples[syft.frameworks.torch.tensors.decorators.logging.LoggingTensor] = make_loggingtensor
 samples[
     syft.frameworks.torch.tensors.interpreters.additive_shared.AdditiveSharingTensor
@@ -8,6 +8,8 @@ import syft
 from syft.serde import msgpack
 from syft.workers.virtual import VirtualWorker
 from syft.serde.syft_serializable import SyftSerializable
+from syft.frameworks.torch.he.fv.ciphertext import CipherText
+from syft.frameworks.torch.he.fv.plaintext import PlainText
 
 
 class SerializableDummyClass(SyftSerializable):
@@ -2035,6 +2037,66 @@ def make_paillier(**kwargs):
     ]
 
 
+# syft.frameworks.torch.he.fv.ciphertext.CipherText
+def make_ciphertext(**kwargs):
+    data = numpy.arange(2 * 3 * 4, dtype=numpy.int64).reshape(2, 3, 4)
+
+    def compare(detailed, original):
+        assert type(detailed) == type(original)
+        assert numpy.array_equal(detailed.data, original.data)
+        return True
+
+    return [
+        {
+            "value": CipherText(data),
+            "simplified": (
+                CODE[CipherText],
+                (
+                    (
+                        CODE[numpy.ndarray],
+                        (
+                            data.tobytes(),  # (bytes) serialized bin
+                            (CODE[tuple], (2, 3, 4)),  # (tuple) shape
+                            (CODE[str], (b"int64",)),  # (str) dtype.name
+                        ),
+                    ),
+                ),
+            ),
+            "cmp_detailed": compare,
+        }
+    ]
+
+
+# syft.frameworks.torch.he.fv.plaintext.PlainText
+def make_plaintext(**kwargs):
+    data = numpy.array([1, 0, 1, 1], dtype=numpy.int64)
+
+    def compare(detailed, original):
+        assert type(detailed) == type(original)
+        assert numpy.array_equal(detailed.data, original.data)
+        return True
+
+    return [
+        {
+            "value": PlainText(data),
+            "simplified": (
+                CODE[PlainText],
+                (
+                    (
+                        CODE[numpy.ndarray],
+                        (
+                            data.tobytes(),  # (bytes) serialized bin
+                            (CODE[tuple], (4,)),  # (tuple) shape
+                            (CODE[str], (b"int64",)),  # (str) dtype.name
+                        ),
+                    ),
+                ),
+            ),
+            "cmp_detailed": compare,
+        }
+    ]
+
+
 def make_serializable_dummy_class(**kwargs):
     def compare(simplified, detailed):
         assert simplified.value == detailed.value
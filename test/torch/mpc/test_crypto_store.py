@@ -1,6 +1,12 @@
+from concurrent.futures import Future
+import threading
+
 import pytest
+import torch
 
 from syft.exceptions import EmptyCryptoPrimitiveStoreError
+from syft.frameworks.torch.mpc import beaver
+from syft.frameworks.torch.mpc.primitives import PrimitiveStorage
 
 
 def test_primitives_usage(workers):
@@ -22,3 +28,145 @@ def test_primitives_usage(workers):
 
     with pytest.raises(EmptyCryptoPrimitiveStoreError):
         _ = alice.crypto_store.get_keys("fss_eq", 4, remove=True)
+
+
+def test_primitives_chunks(workers):
+    me, alice, bob = (workers["me"], workers["alice"], workers["bob"])
+    me.crypto_store.provide_primitives(["fss_eq"], [alice, bob], n_instances=10, chunk_size=4)
+
+    stack = alice.crypto_store.fss_eq
+    assert len(stack) == 10
+    assert len(stack._chunks) == 3
+
+    # Keys can span several chunks
+    keys = alice.crypto_store.get_keys("fss_eq", 6, remove=True)
+    assert len(keys[0]) == 6
+    assert len(stack) == 4
+
+    # Consumed chunks are dropped
+    assert len(stack._chunks) == 2
+    _ = alice.crypto_store.get_keys("fss_eq", 2, remove=True)
+    assert len(stack._chunks) == 1
+
+
+def test_primitives_refill(workers):
+    me, alice, bob = (workers["me"], workers["alice"], workers["bob"])
+    alice.crypto_store.set_refill_policy(
+        "xor_add_couple", me, [alice, bob], low_water_mark=4, refill_size=8, background=False
+    )
+
+    # The store is refilled as soon as the policy is set
+    assert len(alice.crypto_store.xor_add_couple) == 8
+    assert len(bob.crypto_store.xor_add_couple) == 8
+
+    _ = alice.crypto_store.get_keys("xor_add_couple", 3, remove=True)
+    _ = bob.crypto_store.get_keys("xor_add_couple", 3, remove=True)
+    assert len(alice.crypto_store.xor_add_couple) == 5
+
+    # Dropping below the low-water mark triggers a refill
+    _ = alice.crypto_store.get_keys("xor_add_couple", 2, remove=True)
+    _ = bob.crypto_store.get_keys("xor_add_couple", 2, remove=True)
+    assert len(alice.crypto_store.xor_add_couple) == 11
+    assert len(bob.crypto_store.xor_add_couple) == 11
+
+
+def test_primitives_refill_in_flight(workers, monkeypatch):
+    me, alice, bob = (workers["me"], workers["alice"], workers["bob"])
+    me.crypto_store.provide_primitives("xor_add_couple", [alice, bob], n_instances=6)
+
+    # The crypto provider pipelines requests, the refill is left in flight
+    requests = []
+
+    def recv_msg_async(message):
+        future = Future()
+        requests.append((message, future))
+        return future
+
+    monkeypatch.setattr(me, "_recv_msg_async", recv_msg_async)
+    alice.crypto_store.set_refill_policy(
+        "xor_add_couple", me, [alice, bob], low_water_mark=4, refill_size=8
+    )
+
+    _ = alice.crypto_store.get_keys("xor_add_couple", 3, remove=True)
+    _ = bob.crypto_store.get_keys("xor_add_couple", 3, remove=True)
+    assert len(requests) == 1
+
+    # bob has no refill policy but waits for the refill announced by alice
+    keys = []
+    consumer = threading.Thread(
+        target=lambda: keys.append(bob.crypto_store.get_keys("xor_add_couple", 5, remove=True))
+    )
+    consumer.start()
+    consumer.join(timeout=0.5)
+    assert consumer.is_alive()
+
+    message, future = requests.pop()
+    future.set_result(me._recv_msg(message))
+    consumer.join()
+
+    assert keys[0][0].shape[-1] == 5
+    assert len(bob.crypto_store.xor_add_couple) == 6
+    assert len(alice.crypto_store.xor_add_couple) == 11
+    assert not alice.crypto_store._pending_refills
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_offline_beaver_triples(workers, monkeypatch, tmpdir, on_disk):
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    if on_disk:
+        for worker in (alice, bob):
+            worker.crypto_store.set_triple_directory(str(tmpdir.join(worker.id)))
+
+    x = torch.tensor([[1, 2], [3, 4]]).share(alice, bob, crypto_provider=james)
+    y = torch.tensor([[5, 6], [7, 8]]).share(alice, bob, crypto_provider=james)
+
+    with beaver.triple_profile() as profile:
+        _ = x * y
+        _ = x @ y
+    assert sum(profile.values()) == 2
+
+    beaver.preprocess_triples(james, [alice, bob], profile, n_runs=2)
+
+    # The multiplications don't need the crypto provider anymore
+    def request_triple(*args, **kwargs):
+        raise AssertionError("The crypto provider was contacted")
+
+    monkeypatch.setattr(beaver, "request_triple", request_triple)
+    for _ in range(2):
+        assert ((x * y).get() == torch.tensor([[5, 12], [21, 32]])).all()
+        assert ((x @ y).get() == torch.tensor([[19, 22], [43, 50]])).all()
+
+    with pytest.raises(AssertionError):
+        _ = x * y
+
+
+def test_offline_beaver_triples_after_restart(workers, monkeypatch, tmpdir):
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    for worker in (alice, bob):
+        worker.crypto_store.set_triple_directory(str(tmpdir.join(worker.id)))
+
+    x = torch.tensor([1, 2, 3]).share(alice, bob, crypto_provider=james)
+    y = torch.tensor([4, 5, 6]).share(alice, bob, crypto_provider=james)
+    with beaver.triple_profile() as profile:
+        _ = x * y
+    beaver.preprocess_triples(james, [alice, bob], profile, n_runs=2)
+
+    # The parties restart and load the pools stored on disk
+    for worker in (alice, bob):
+        worker.crypto_store = PrimitiveStorage(owner=worker)
+        worker.crypto_store.set_triple_directory(str(tmpdir.join(worker.id)))
+
+    requested = []
+    request_triple = beaver.request_triple
+    monkeypatch.setattr(
+        beaver, "request_triple", lambda *args: requested.append(1) or request_triple(*args)
+    )
+    assert ((x * y).get() == torch.tensor([4, 10, 18])).all()
+    assert not requested
+
+    # A triple used by alice alone is not used for a multiplication with bob
+    signature = next(iter(profile))
+    alice.crypto_store.get_triple(signature)
+    assert ((x * y).get() == torch.tensor([4, 10, 18])).all()
+    assert len(requested) == 1
+    assert bob.crypto_store.count_triples(signature) == 1
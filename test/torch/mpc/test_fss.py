@@ -1,7 +1,8 @@
 import pytest
 import torch as th
 
-from syft.frameworks.torch.mpc.fss import DPF, DIF, n
+from syft.frameworks.torch.mpc import fss
+from syft.frameworks.torch.mpc.fss import DPF, DIF, n, W, seed_mask
 
 
 @pytest.mark.parametrize("op", ["eq", "le"])
@@ -61,3 +62,48 @@ def test_fss_class(op):
     y1 = class_.eval(1, x_masked, *k1[1:])
 
     assert (getattr(y0, gather_op)(y1) == th_op(x, 0)).all()
+
+
+@pytest.mark.parametrize("class_", [DPF, DIF])
+def test_fss_packed_keys(class_):
+    n_values = 5
+    alpha, s_00, s_01, CW, *CW_n = class_.keygen(n_values=n_values)
+
+    # Seeds and correction words are packed in int64 words
+    assert s_00.shape == s_01.shape == (W, n_values)
+    assert CW.shape == (n, 2, W, n_values)
+    assert CW.dtype == th.long
+    # Only the λ low bits of the seeds are used
+    assert ((s_00 & ~seed_mask) == 0).all()
+
+
+@pytest.mark.parametrize("op", ["eq", "le"])
+def test_fss_ops_batched(workers, op):
+    me, alice, bob, crypto_provider = (
+        workers["me"],
+        workers["alice"],
+        workers["bob"],
+        workers["james"],
+    )
+    type_op = {"eq": "eq", "le": "comp"}[op]
+    th_op = {"eq": th.eq, "le": th.le}[op]
+
+    for worker in workers.values():
+        fss.initialize_crypto_plans(worker)
+    me.crypto_store.provide_primitives(
+        [f"fss_{type_op}", "xor_add_couple"], [alice, bob], n_instances=10
+    )
+
+    kwargs = {"protocol": "fss", "crypto_provider": crypto_provider}
+    x1, y1 = th.tensor([[1, 2], [3, 4]]), th.tensor([[1, 3], [2, 4]])
+    x2, y2 = th.tensor([5, -2, 0]), th.tensor([5, 1, -1])
+    pairs = [
+        (x.share(alice, bob, **kwargs).child, y.share(alice, bob, **kwargs).child)
+        for x, y in ((x1, y1), (x2, y2))
+    ]
+
+    # Both comparisons are evaluated together
+    results = fss.fss_ops(pairs, type_op)
+
+    assert (results[0].get().long() == th_op(x1, y1).long()).all()
+    assert (results[1].get().long() == th_op(x2, y2).long()).all()
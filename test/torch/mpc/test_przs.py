@@ -0,0 +1,69 @@
+import pytest
+import torch as th
+
+from syft.frameworks.torch.mpc import przs
+from syft.messaging.message import ObjectMessage
+
+
+def _shares(x_sh):
+    return [
+        share.location.object_store.get_obj(share.id_at_location) for share in x_sh.child.values()
+    ]
+
+
+@pytest.mark.parametrize("dtype", ["long", "int"])
+def test_shares_of_zero(workers, dtype):
+    me, alice, bob, james = (workers["me"], workers["alice"], workers["bob"], workers["james"])
+    field = {"long": 2 ** 64, "int": 2 ** 32}[dtype]
+
+    generators = []
+    for _ in range(2):
+        zero = przs.shares_of_zero(me, (3, 2), field, dtype, None, alice, bob, james)
+        assert zero.shape == (3, 2)
+        shares = _shares(zero)
+        assert not (shares[0] == 0).all()
+        assert (zero.get() == th.zeros(3, 2)).all()
+        generators.append(alice.crypto_store.przs_generators[("alice", "bob", "james")]["own"])
+
+    # The seeds are agreed on only once
+    assert generators[0] is generators[1]
+
+
+def test_shares_of_zero_custom_field(workers):
+    me, alice, bob = (workers["me"], workers["alice"], workers["bob"])
+    field = 2 ** 32 - 1
+
+    zero = przs.shares_of_zero(me, (10,), field, "custom", None, alice, bob)
+    shares = _shares(zero)
+    assert all(((share >= -(field // 2)) & (share <= (field - 1) // 2)).all() for share in shares)
+    assert (zero.get() == th.zeros(10)).all()
+
+
+def test_share_sends_one_tensor(workers):
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    x = th.tensor([[1, -2], [3, 4]])
+    for worker in (alice, bob, james):
+        worker.log_msgs = True
+
+    x_sh = x.share(alice, bob, james)
+
+    # Only the first party received a tensor, the others generated their share
+    received_tensors = [
+        sum(isinstance(message, ObjectMessage) for message in worker.msg_history)
+        for worker in (alice, bob, james)
+    ]
+    assert received_tensors == [1, 0, 0]
+    assert (x_sh.get() == x).all()
+
+
+def test_refresh(workers):
+    alice, bob, crypto_provider = (workers["alice"], workers["bob"], workers["james"])
+    x = th.tensor([1, 2, 3]).share(alice, bob, crypto_provider=crypto_provider)
+
+    # refresh updates the shares in place, keep a copy of the old ones
+    old_shares = [share.clone() for share in _shares(x.child)]
+    x_refreshed = x.refresh()
+
+    new_shares = _shares(x_refreshed.child)
+    assert all(not (old == new).all() for old, new in zip(old_shares, new_shares))
+    assert (x_refreshed.get() == th.tensor([1, 2, 3])).all()
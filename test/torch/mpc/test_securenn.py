@@ -267,6 +267,21 @@ def test_maxpool(workers):
     assert ind.get() == torch.tensor(2)
 
 
+def test_maxpool_dim(workers):
+    alice, bob, james = workers["alice"], workers["bob"], workers["james"]
+    t = torch.tensor([[10, 0, 15, 7], [3, 8, 8, 1], [2, 2, 9, 4]])
+    x = t.share(alice, bob, crypto_provider=james, dtype="long").child
+
+    max, ind = maxpool(x, dim=0)
+    assert (max.get() == torch.tensor([10, 8, 15, 7])).all()
+    assert (ind.get() == torch.tensor([0, 1, 0, 0])).all()
+
+    # ties are resolved to the last maximum
+    max, ind = maxpool(x, dim=1)
+    assert (max.get() == torch.tensor([15, 8, 9])).all()
+    assert (ind.get() == torch.tensor([2, 2, 2])).all()
+
+
 def test_maxpool_deriv(workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
     x = (
@@ -0,0 +1,76 @@
+import torch as th
+
+from syft.frameworks.torch.mpc import spdz
+
+
+def test_reconstruct_many(workers):
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    x = th.tensor([[1, -2], [3, 4]])
+    y = th.tensor([5, 6, 7])
+
+    x_sh = x.share(alice, bob, james).child
+    y_sh = y.share(alice, bob, james).child
+    for worker in (alice, bob, james):
+        worker.log_msgs = True
+
+    x_opened, y_opened = spdz.reconstruct_many([x_sh, y_sh])
+
+    # One message to send the shares and one to receive the opened values
+    assert len(bob.msg_history) == len(james.msg_history) == 2
+    for worker in (alice, bob, james):
+        assert (x_opened.child[worker.id].get() == x).all()
+        assert (y_opened.child[worker.id].get() == y).all()
+
+
+def test_spdz_mul_many(workers):
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    kwargs = {"crypto_provider": james}
+    x = th.tensor([[1, 2], [3, 4]])
+    y = th.tensor([[5, 6], [7, 8]])
+    x_sh = x.share(alice, bob, **kwargs).child
+    y_sh = y.share(alice, bob, **kwargs).child
+
+    products = spdz.spdz_mul_many(
+        [th.mul, th.matmul], [x_sh, x_sh], [y_sh, y_sh], james, x_sh.field, x_sh.dtype
+    )
+
+    assert (products[0].get() == x * y).all()
+    assert (products[1].get() == x @ y).all()
+
+
+def test_multiplication_queue(workers):
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    kwargs = {"crypto_provider": james}
+    x = th.tensor([0.5, -1.5, 2.0])
+    y = th.tensor([2.0, 3.0, -0.25])
+
+    x_sh = x.fix_prec().share(alice, bob, **kwargs)
+    y_sh = y.fix_prec().share(alice, bob, **kwargs)
+    i_sh = th.tensor([1, 2, 3]).share(alice, bob, **kwargs)
+
+    products = spdz.MultiplicationQueue()
+    products.mul(x_sh, y_sh)
+    products.mul(i_sh, i_sh)
+    products.mul(x, y)
+    x_y, i_i, x_y_public = products.flush()
+
+    assert (x_y.get().float_prec() == x * y).all()
+    assert (i_i.get() == th.tensor([1, 4, 9])).all()
+    assert (x_y_public == x * y).all()
+
+
+def test_spdz_mul_many_mixed_dtypes(workers):
+    """Multiplications of int and long shares are opened in the same exchange,
+    like in SecureNN's msb."""
+    alice, bob, james = (workers["alice"], workers["bob"], workers["james"])
+    x = th.tensor([1, -2, 3])
+    y = th.tensor([4, 5, -6])
+    x_sh = x.share(alice, bob, crypto_provider=james, dtype="int").child
+    y_sh = y.share(alice, bob, crypto_provider=james, dtype="long").child
+
+    products = spdz.spdz_mul_many(
+        [th.mul, th.mul], [x_sh, x_sh], [x_sh, y_sh], james, x_sh.field, x_sh.dtype
+    )
+
+    assert (products[0].get() == x * x).all()
+    assert (products[1].get() == x * y).all()
@@ -2,6 +2,8 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
+from syft.frameworks.torch.nn.functional import _unfold_indices
+
 
 def test_torch_nn_functional_linear():
     tensor = nn.Parameter(torch.tensor([[1.0, 2], [3, 4]]), requires_grad=False).fix_prec()
@@ -126,6 +128,19 @@ def test_torch_nn_functional_conv2d(workers):
     assert (res1 == expected1).all()
 
 
+def test_conv2d_unfold_indices():
+    x = torch.rand(2, 3, 9, 8)
+    args = ((3, 9, 8), (3, 2), (2, 1), (0, 0), (1, 2))
+
+    indices = _unfold_indices(*args)
+    unfolded = x[(slice(None),) + indices].view(2, -1, 3 * 3 * 2)
+
+    expected = F.unfold(x, (3, 2), dilation=(1, 2), stride=(2, 1))
+    assert (unfolded == expected.transpose(1, 2)).all()
+    # The indices are cached for each geometry
+    assert _unfold_indices(*args) is indices
+
+
 def test_torch_nn_functional_maxpool(workers):
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
     enc_tensor = torch.tensor(
@@ -156,6 +171,18 @@ def test_torch_nn_functional_maxpool(workers):
     assert (r_max == exp_max).all()
 
 
+def test_torch_nn_functional_maxpool_batched(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    x = torch.randint(-8, 8, (2, 3, 5, 5)).float()
+    enc_tensor = x.fix_prec().share(bob, alice, crypto_provider=james)
+
+    r_max = F.max_pool2d(enc_tensor, kernel_size=3, stride=2)
+    r_max = r_max.get().float_prec()
+
+    exp_max = F.unfold(x.view(6, 1, 5, 5), 3, stride=2).max(dim=1)[0].view(2, 3, 2, 2)
+    assert (r_max == exp_max).all()
+
+
 def test_torch_nn_functional_avgpool(workers):
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
     enc_tensor = torch.tensor(
@@ -224,6 +224,30 @@ def test_add(workers):
     assert (y.get().float_prec() == torch.tensor([2.0, -4.0, 6.0])).all()
 
 
+def test_add_public(workers):
+    bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
+    t = torch.tensor([1, -2, 3])
+    x = t.share(bob, alice, james).child
+
+    # constant
+    y = x.add_public(4)
+    assert (y.get() == t + 4).all()
+
+    # local tensor
+    x = t.share(bob, alice, james).child
+    y = x.add_public(torch.tensor([1, 2, 3]))
+    assert (y.get() == t + torch.tensor([1, 2, 3])).all()
+
+    # value held by all the workers
+    x = t.share(bob, alice, james).child
+    value = torch.tensor([5, 6, 7])
+    mpt = syft.MultiPointerTensor(children=[value.send(w).child for w in (bob, alice, james)])
+    y = x.add_public(mpt)
+    # only the share of the first worker changed
+    assert y.child["alice"] is x.child["alice"] and y.child["james"] is x.child["james"]
+    assert (y.get() == t + value).all()
+
+
 def test_sub(workers):
     bob, alice, james = (workers["bob"], workers["alice"], workers["james"])
 
@@ -844,6 +868,41 @@ def test_argmax(workers, protocol):
     ids = x.argmax(dim=1).get().float_prec()
     assert (ids.long() == torch.argmax(t, dim=1)).all()
 
+    # ties are resolved to the last maximum
+    t = torch.tensor([2, 5.0, 5, 1, 5])
+    x = t.fix_prec().share(*args, **kwargs)
+    idx = x.argmax().get().float_prec()
+    assert idx == torch.tensor([4.0])
+
+
+@pytest.mark.parametrize("protocol", ["snn", "fss"])
+def test_max_dim(workers, protocol):
+    me, alice, bob, crypto_provider = (
+        workers["me"],
+        workers["alice"],
+        workers["bob"],
+        workers["james"],
+    )
+
+    if protocol == "fss":
+        for worker in workers.values():
+            syft.frameworks.torch.mpc.fss.initialize_crypto_plans(worker)
+        me.crypto_store.provide_primitives(
+            ["xor_add_couple", "fss_eq", "fss_comp"], [alice, bob], n_instances=64
+        )
+
+    args = (alice, bob)
+    kwargs = {"protocol": protocol, "crypto_provider": crypto_provider}
+
+    # Reduce any dimension of a N-d tensor, with an odd number of values
+    t = torch.tensor([[[1, 5.0, 2], [3, 0, 4]], [[7, 1, 1], [2, 8, 6]], [[0, 2, 9], [4, 5, 3]]])
+    x = t.fix_prec().share(*args, **kwargs)
+    for dim in (0, 1, -1):
+        max_value, ids = x.max(dim=dim)
+        expected_value, expected_ids = torch.max(t, dim=dim)
+        assert (max_value.get().float_prec() == expected_value).all()
+        assert (ids.get().float_prec().long() == expected_ids).all()
+
 
 def test_mod(workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
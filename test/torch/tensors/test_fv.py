@@ -1,5 +1,9 @@
+import random
+
+import numpy as np
 import pytest
 
+import syft as sy
 from syft.frameworks.torch.he.fv.util.numth import is_prime
 from syft.frameworks.torch.he.fv.util.operations import multiply_many_except
 from syft.frameworks.torch.he.fv.modulus import CoeffModulus
@@ -17,6 +21,7 @@ from syft.frameworks.torch.he.fv.util.rns_base import RNSBase
 from syft.frameworks.torch.he.fv.util.operations import invert_mod
 from syft.frameworks.torch.he.fv.util.operations import xgcd
 from syft.frameworks.torch.he.fv.util.operations import reverse_bit
+from syft.frameworks.torch.he.fv.util.ntt import NTTTables
 from syft.frameworks.torch.he.fv.encryptor import Encryptor
 from syft.frameworks.torch.he.fv.decryptor import Decryptor
 from syft.frameworks.torch.he.fv.evaluator import Evaluator
@@ -148,6 +153,21 @@ def test_poly_mul_mod(op1, op2, mod, result):
     assert poly_mul_mod(op1, op2, mod) == result
 
 
+@pytest.mark.parametrize(
+    "poly_modulus, coeff_bit_sizes", [(8, [20]), (64, [30, 40]), (1024, [36, 36, 37])]
+)
+def test_ntt_poly_mul(poly_modulus, coeff_bit_sizes):
+    for modulus in CoeffModulus().create(poly_modulus, coeff_bit_sizes):
+        tables = NTTTables(poly_modulus, modulus)
+        op1 = [random.randrange(modulus) for _ in range(poly_modulus)]
+        op2 = [random.randrange(modulus) for _ in range(poly_modulus)]
+        expected = poly_mul_mod(op1, op2, modulus)
+        expected += [0] * (poly_modulus - len(expected))
+
+        assert tables.inverse(tables.forward(op1)).tolist() == op1
+        assert tables.poly_mul(op1, op2).tolist() == expected
+
+
 @pytest.mark.parametrize("op1, mod, result", [([2, 3], 7, [5, 4]), ([0, 0], 7, [0, 0])])
 def test_poly_negate_mod(op1, mod, result):
     assert poly_negate_mod(op1, mod) == result
@@ -496,3 +516,93 @@ def test_fv_sub_cipher_plain(int1, int2):
         == encoder.decode(decryptor.decrypt(evaluator.sub(op1, op2)))
         == encoder.decode(decryptor.decrypt(evaluator.sub(op2, op1)))
     )
+
+
+@pytest.mark.parametrize(
+    "int1, int2", [(0, 0), (-1, 1), (100, -10), (1000, 100), (-1000, 100), (-100, -100)]
+)
+def test_fv_mul_cipher_cipher(int1, int2):
+    ctx = Context(EncryptionParams(1024, CoeffModulus().create(1024, [30, 30]), 1024))
+    keygenerator = KeyGenerator(ctx)
+    keys = keygenerator.keygen()
+    relin_keys = keygenerator.relin_keygen()
+    encoder = IntegerEncoder(ctx)
+    encryptor = Encryptor(ctx, keys[1])  # keys[1] = public_key
+    decryptor = Decryptor(ctx, keys[0])  # keys[0] = secret_key
+    evaluator = Evaluator(ctx)
+
+    op1 = encryptor.encrypt(encoder.encode(int1))
+    op2 = encryptor.encrypt(encoder.encode(int2))
+    product = evaluator.multiply(op1, op2)
+    relinearized = evaluator.relinearize(product, relin_keys)
+
+    assert len(product.data) == 3
+    assert len(relinearized.data) == 2
+    assert (
+        int1 * int2
+        == encoder.decode(decryptor.decrypt(product))
+        == encoder.decode(decryptor.decrypt(relinearized))
+        == encoder.decode(decryptor.decrypt(evaluator.multiply(op2, op1)))
+    )
+
+
+@pytest.mark.parametrize(
+    "int1, int2", [(0, 0), (-1, 1), (100, -10), (1000, 100), (-1000, 100), (-100, -100)]
+)
+def test_fv_mul_cipher_plain(int1, int2):
+    ctx = Context(EncryptionParams(1024, CoeffModulus().create(1024, [30, 30]), 1024))
+    keys = KeyGenerator(ctx).keygen()
+    encoder = IntegerEncoder(ctx)
+    encryptor = Encryptor(ctx, keys[1])  # keys[1] = public_key
+    decryptor = Decryptor(ctx, keys[0])  # keys[0] = secret_key
+    evaluator = Evaluator(ctx)
+
+    op1 = encryptor.encrypt(encoder.encode(int1))
+    op2 = encoder.encode(int2)
+
+    assert (
+        int1 * int2
+        == encoder.decode(decryptor.decrypt(evaluator._mul_cipher_plain(op1, op2)))
+        == encoder.decode(decryptor.decrypt(evaluator.multiply(op1, op2)))
+        == encoder.decode(decryptor.decrypt(evaluator.multiply(op2, op1)))
+    )
+
+
+@pytest.mark.parametrize("decomposition_bit_count", [None, 12, 40])
+def test_fv_relinearize_dot_product(decomposition_bit_count):
+    ctx = Context(EncryptionParams(4096, CoeffModulus().bfv_default(4096), 1024))
+    keygenerator = KeyGenerator(ctx)
+    keys = keygenerator.keygen()
+    relin_keys = keygenerator.relin_keygen(decomposition_bit_count)
+    encoder = IntegerEncoder(ctx)
+    encryptor = Encryptor(ctx, keys[1])  # keys[1] = public_key
+    decryptor = Decryptor(ctx, keys[0])  # keys[0] = secret_key
+    evaluator = Evaluator(ctx)
+
+    xs, ws = [3, -7, 12], [-5, 2, 9]
+    total = encryptor.encrypt(encoder.encode(0))
+    for x, w in zip(xs, ws):
+        op1 = encryptor.encrypt(encoder.encode(x))
+        op2 = encryptor.encrypt(encoder.encode(w))
+        product = evaluator.multiply(op1, op2)
+        total = evaluator.add(total, evaluator.relinearize(product, relin_keys))
+
+    assert len(total.data) == 2
+    assert sum(x * w for x, w in zip(xs, ws)) == encoder.decode(decryptor.decrypt(total))
+
+
+def test_fv_ciphertext_serde():
+    ctx = Context(EncryptionParams(1024, CoeffModulus().create(1024, [30, 30]), 1024))
+    keys = KeyGenerator(ctx).keygen()
+    encoder = IntegerEncoder(ctx)
+    encryptor = Encryptor(ctx, keys[1])  # keys[1] = public_key
+    decryptor = Decryptor(ctx, keys[0])  # keys[0] = secret_key
+
+    ct = encryptor.encrypt(encoder.encode(1234))
+    assert ct.data.shape == (2, 2, 1024)
+    assert ct.data.dtype == np.int64
+
+    ct = sy.serde.deserialize(sy.serde.serialize(ct))
+    assert 1234 == encoder.decode(decryptor.decrypt(ct))
+    # Deserialized arrays are read-only, evaluating on them must not write in place
+    assert -1234 == encoder.decode(decryptor.decrypt(Evaluator(ctx).negate(ct)))
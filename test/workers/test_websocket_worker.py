@@ -1,8 +1,19 @@
+from multiprocessing import Process
+from multiprocessing import Queue
+import socket
+import threading
 import time
 from OpenSSL import crypto
 import pytest
 import torch
+import websocket
 
+import syft as sy
+
+from syft.messaging.message import ObjectMessage
+from syft.messaging.message import ObjectRequestMessage
+from syft.messaging.message import TensorCommandMessage
+from syft.workers.websocket_client import WebsocketClientWorker
 from syft.workers.websocket_server import WebsocketServerWorker
 
 from test.conftest import instantiate_websocket_client_worker
@@ -257,3 +268,179 @@ def test_send_command_not_allow_listed(hook, start_remote_worker):
 
     remote_proxy.close()
     server.terminate()
+
+
+@pytest.mark.parametrize("binary_transport, port", [(True, 8774), (False, 8775)])
+def test_websocket_worker_transport_modes(hook, start_proc, binary_transport, port):
+    """Evaluates that the server answers both binary and legacy hex clients."""
+    kwargs = {"id": f"fed-transport-{port}", "host": "localhost", "port": port, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(binary_transport=binary_transport, **kwargs)
+
+    x = torch.tensor([1.0, 2.0, 3.0]).send(remote_proxy)
+    y = (x * 2).get()
+
+    assert (y == torch.tensor([2.0, 4.0, 6.0])).all()
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_websocket_worker_thread_execution_mode(hook, start_proc):
+    """Evaluates that several clients can use a server processing messages in a thread pool."""
+    kwargs = {"id": "fed-thread-mode", "host": "localhost", "port": 8776, "hook": hook}
+    server = start_proc(WebsocketServerWorker, execution_mode="thread", max_workers=4, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(**kwargs)
+
+    x = torch.tensor([1.0, 2.0, 3.0]).send(remote_proxy)
+    y = torch.tensor([3.0, 2.0, 1.0]).send(remote_proxy)
+    z = (x + y).get()
+
+    assert (z == torch.tensor([4.0, 4.0, 4.0])).all()
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def _add_on_server(kwargs, n_rounds, queue):  # pragma: no cover
+    """Runs additions on a websocket server from a fresh process and reports if they
+    were all right."""
+    remote_proxy = instantiate_websocket_client_worker(**kwargs)
+    x = torch.tensor([1.0, 2.0, 3.0]).send(remote_proxy)
+    results = []
+    for i in range(n_rounds):
+        y = torch.tensor([float(i)] * 3).send(remote_proxy)
+        results.append(((x + y).get() == torch.tensor([1.0, 2.0, 3.0]) + i).all().item())
+    remote_proxy.close()
+    queue.put(all(results))
+
+
+def test_websocket_worker_thread_execution_mode_concurrent_clients(hook, start_proc):
+    """Evaluates that two clients sending messages at the same time to a server processing
+    them in a thread pool get the right results."""
+    kwargs = {"id": "fed-thread-mode-clients", "host": "localhost", "port": 8793, "hook": hook}
+    server = start_proc(WebsocketServerWorker, execution_mode="thread", max_workers=4, **kwargs)
+    time.sleep(0.1)
+
+    queue = Queue()
+    clients = [Process(target=_add_on_server, args=(kwargs, 20, queue)) for _ in range(2)]
+    for client in clients:
+        client.start()
+    results = [queue.get(timeout=60) for _ in clients]
+    for client in clients:
+        client.join()
+
+    server.terminate()
+    assert results == [True, True]
+
+
+def test_websocket_worker_thread_execution_mode_nested_route_msg(hook):
+    """Evaluates that routing a message while routing another one on the same objects,
+    in the same thread, doesn't deadlock."""
+    server = WebsocketServerWorker(
+        hook=hook, id="fed-nested-route", host="localhost", port=8794, execution_mode="thread"
+    )
+    x = torch.tensor([1, 2])
+
+    def route_nested():
+        with server._lock_objects({x.id}):
+            server.route_msg(ObjectMessage(x))
+
+    thread = threading.Thread(target=route_nested, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert server.get_obj(x.id) is x
+    server.executor.shutdown()
+
+
+def test_message_object_ids():
+    x = torch.tensor([1, 2])
+    msg = TensorCommandMessage.computation("__add__", x, (x,), {}, (123,))
+    assert WebsocketServerWorker._message_object_ids(msg) == {x.id, 123}
+
+    msg = ObjectRequestMessage(456, None, "")
+    assert WebsocketServerWorker._message_object_ids(msg) == {456}
+
+
+def test_websocket_worker_multiplexed(hook, start_proc):
+    """Evaluates that pipelined requests are matched with their responses."""
+    kwargs = {"id": "fed-multiplexed", "host": "localhost", "port": 8780, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(multiplexed=True, **kwargs)
+
+    x = torch.tensor([1.0, 2.0, 3.0]).send(remote_proxy)
+    y = x + x
+    z = y * x
+
+    futures = [
+        remote_proxy.submit_msg(ObjectRequestMessage(ptr.id_at_location, None, ""))
+        for ptr in (y, z)
+    ]
+    y_value, z_value = [sy.serde.deserialize(future.result()) for future in futures]
+
+    assert (y_value == torch.tensor([2.0, 4.0, 6.0])).all()
+    assert (z_value == torch.tensor([2.0, 8.0, 18.0])).all()
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_websocket_worker_multiplexed_fire_and_forget_error(hook, start_proc):
+    """Evaluates that the failure of a fire-and-forget command is raised by the
+    next request, and that the server keeps serving the connection."""
+    kwargs = {"id": "fed-multiplexed-error", "host": "localhost", "port": 8781, "hook": hook}
+    server = start_proc(WebsocketServerWorker, **kwargs)
+
+    time.sleep(0.1)
+    remote_proxy = instantiate_websocket_client_worker(multiplexed=True, **kwargs)
+
+    x = torch.tensor([1.0, 2.0, 3.0]).send(remote_proxy)
+    y = torch.tensor([1.0, 2.0]).send(remote_proxy)
+
+    # the shapes don't match, the command fails on the server without being waited for
+    x += y
+
+    with pytest.raises(RuntimeError):
+        y.get()
+
+    assert (x.get() == torch.tensor([1.0, 2.0, 3.0])).all()
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_websocket_client_recv_stalled_frame():
+    client_sock, server_sock = socket.socketpair()
+    client_sock.settimeout(0.1)
+    ws = websocket.WebSocket()
+    ws.sock, ws.connected = client_sock, True
+
+    # nothing was sent yet, the connection can be read again later
+    with pytest.raises(websocket.WebSocketTimeoutException):
+        WebsocketClientWorker._recv_exactly(ws, 2, message_start=True)
+    assert ws.connected
+
+    # the server stalls in the middle of a frame announcing 10 bytes
+    server_sock.sendall(bytes([0x82, 10]) + b"abcd")
+    assert WebsocketClientWorker._recv_exactly(ws, 2, message_start=True) == bytes([0x82, 10])
+    with pytest.raises(websocket.WebSocketTimeoutException):
+        WebsocketClientWorker._recv_exactly(ws, 10)
+    assert not ws.connected
+
+    server_sock.close()